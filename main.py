@@ -10,6 +10,7 @@ from tkinter import ttk, messagebox, filedialog
 import json
 import os
 import sys
+import threading
 from datetime import datetime
 
 # O'z modullarimizni import qilamiz
@@ -18,14 +19,24 @@ from managers.virtualbox_manager import VirtualBoxManager
 from managers.hyperv_manager import HyperVManager
 from ui.main_window import MainWindow
 from utils.config_manager import ConfigManager
+from utils.discovery_cache import DiscoveryCache
 
 class VMContainerBucket:
     def __init__(self):
         self.root = tk.Tk()
         self.config_manager = ConfigManager()
-        self.docker_manager = DockerManager()
-        self.vbox_manager = VirtualBoxManager()
-        self.hyperv_manager = HyperVManager()
+        # Docker daemoniga ulanish fon threadida, uzilsa qayta ulanadi;
+        # docker.endpoints dagi qo'shimcha hostlar ham shu jadvalda ko'rsatiladi
+        self.docker_manager = DockerManager(
+            lazy=True,
+            endpoints=self.config_manager.get("docker.endpoints", []),
+            local_name=self.config_manager.get("docker.local_name", "local")
+        )
+        # VBoxManage/PowerShell tekshiruvi keshlanadi, kesh eskirgan bo'lsa
+        # oyna ochilgandan keyin fon threadida bajariladi
+        self.discovery_cache = DiscoveryCache()
+        self.vbox_manager = VirtualBoxManager(self.discovery_cache, background=True)
+        self.hyperv_manager = HyperVManager(discovery_cache=self.discovery_cache, background=True)
         
         # Asosiy oynani sozlash
         self.setup_main_window()
@@ -49,8 +60,8 @@ class VMContainerBucket:
     def run(self):
         """Dasturni ishga tushirish"""
         try:
-            # Barcha managerlarni tekshirish
-            self.check_managers()
+            # Barcha managerlarni tekshirish (fon tekshiruvlari tugashini kutadi)
+            threading.Thread(target=self.check_managers, daemon=True).start()
             
             # Asosiy oynani ko'rsatish
             main_window = MainWindow(
@@ -76,6 +87,8 @@ class VMContainerBucket:
         
         for name, manager in managers:
             try:
+                if hasattr(manager, 'wait_ready'):
+                    manager.wait_ready()
                 if not manager.is_available():
                     print(f"Ogohlantirish: {name} mavjud emas yoki sozlanmagan")
             except Exception as e:
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docker Endpoints - Qo'shimcha (masofaviy) Docker daemonlari
+
+Har bir nomlangan endpoint (unix socket, tcp:// yoki docker context) o'z
+ulanishlar pooliga ega bitta clientni qayta ishlatadi. Ro'yxatlar barcha
+endpointlardan parallel so'raladi - har biri o'z timeouti ichida javob
+bermasa oxirgi natijasi ishlatiladi, sekin host boshqalarini ushlab turmaydi.
+Client yaratish tarmoqqa chiqmaydi - API versiyasi ham shu parallel so'rov
+ichida aniqlanadi, shuning uchun o'lik host amallarni bloklamaydi.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Callable, Dict, List, Optional
+
+import docker
+
+# Endpoint javobi shundan uzoq kutilmaydi (soniya)
+ENDPOINT_TIMEOUT = 5
+# Har bir endpoint clientidagi HTTP ulanishlar soni
+ENDPOINT_POOL_SIZE = 4
+
+# Endpoint holatlari
+ENDPOINT_UNKNOWN = "unknown"
+ENDPOINT_OK = "ok"
+ENDPOINT_TIMEOUT_STATE = "timeout"
+ENDPOINT_ERROR = "error"
+
+class DockerEndpoint:
+    def __init__(self, name: str, base_url: str = None, context: str = None,
+                 timeout: float = ENDPOINT_TIMEOUT, tls=False, version: str = None,
+                 pool_size: int = ENDPOINT_POOL_SIZE):
+        """base_url yoki context dan biri beriladi
+        
+        version berilmasa client DEFAULT_DOCKER_API_VERSION bilan yaratiladi
+        va daemon versiyasi birinchi gather() so'rovida aniqlanadi.
+        """
+        self.name = name
+        self.base_url = base_url
+        self.context = context
+        self.timeout = timeout
+        self.tls = tls
+        self.version = version
+        self.pool_size = pool_size
+        # version berilmagan va hali daemondan so'ralmagan
+        self.negotiate = version is None
+        
+        self.lock = threading.Lock()
+        self.client = None
+        self.state = ENDPOINT_UNKNOWN
+        self.last_error = ""
+        # tur ("containers"/"images") -> bajarilayotgan so'rov va oxirgi natija
+        self.pending: Dict[str, Future] = {}
+        self.results: Dict[str, List[Dict]] = {}
+        
+    @classmethod
+    def from_config(cls, config: Dict) -> "DockerEndpoint":
+        """settings.json dagi docker.endpoints yozuvidan"""
+        tls = config.get('tls', False)
+        if isinstance(tls, dict):
+            client_cert = tls.get('client_cert')
+            tls = docker.tls.TLSConfig(
+                client_cert=tuple(client_cert) if client_cert else None,
+                ca_cert=tls.get('ca_cert'),
+                verify=tls.get('verify', True)
+            )
+        return cls(
+            config['name'],
+            base_url=config.get('base_url'),
+            context=config.get('context'),
+            timeout=config.get('timeout', ENDPOINT_TIMEOUT),
+            tls=tls,
+            version=config.get('version'),
+            pool_size=config.get('pool_size', ENDPOINT_POOL_SIZE)
+        )
+        
+    def get_client(self) -> docker.DockerClient:
+        """Endpoint clienti - birinchi chaqiruvda yaratiladi va qayta ishlatiladi"""
+        with self.lock:
+            if self.client is None:
+                base_url, tls = self.base_url, self.tls
+                if self.context:
+                    context = docker.ContextAPI.get_context(self.context)
+                    if context is None:
+                        raise docker.errors.ContextNotFound(self.context)
+                    base_url, tls = context.Host, context.TLSConfig or False
+                # Socket timeouti lokal client bilan bir xil - log/stats oqimlari jim
+                # turganda uzilmaydi. Ro'yxatlar uchun self.timeout gather() da qo'llanadi.
+                # Versiya doim beriladi - aks holda docker-py konstruktorda daemondan
+                # so'raydi va lock ostida timeoutgacha (60 s) kutib qoladi
+                self.client = docker.DockerClient(base_url=base_url, tls=tls,
+                                                  timeout=docker.constants.DEFAULT_TIMEOUT_SECONDS,
+                                                  version=self.version or docker.constants.DEFAULT_DOCKER_API_VERSION,
+                                                  max_pool_size=self.pool_size)
+            return self.client
+            
+    def negotiate_version(self) -> docker.DockerClient:
+        """Daemon API versiyasini aniqlash (gather() threadida, timeout ichida)
+        
+        Daemon DEFAULT_DOCKER_API_VERSION dan eski bo'lsa client uning
+        versiyasi bilan qayta yaratiladi. Eski client yopilmaydi - undagi
+        ochiq log/stats oqimlari uzilmaydi.
+        """
+        client = self.get_client()
+        if not self.negotiate:
+            return client
+            
+        server_version = client.api.version(api_version=False)['ApiVersion']
+        with self.lock:
+            if self.negotiate:
+                self.negotiate = False
+                if docker.utils.version_lt(server_version, docker.constants.DEFAULT_DOCKER_API_VERSION):
+                    self.version = server_version
+                    self.client = None
+        return self.get_client()
+            
+    def close(self):
+        with self.lock:
+            if self.client is not None:
+                try:
+                    self.client.close()
+                except Exception:
+                    pass
+                self.client = None
+
+
+class EndpointPool:
+    def __init__(self, endpoints: List[DockerEndpoint]):
+        self.endpoints: Dict[str, DockerEndpoint] = {endpoint.name: endpoint for endpoint in endpoints}
+        # Har bir endpointda har bir turdan ko'pi bilan bitta so'rov - osilib qolgan
+        # host ham boshqa endpointlar uchun thread band qilmaydi
+        self.executor = ThreadPoolExecutor(max_workers=max(1, 2 * len(endpoints)),
+                                           thread_name_prefix="docker-endpoint")
+                                           
+    def get(self, name: str) -> Optional[DockerEndpoint]:
+        return self.endpoints.get(name)
+        
+    def gather(self, kind: str, fetch: Callable[[docker.DockerClient], List[Dict]],
+               local: Optional[Callable[[], List[Dict]]] = None) -> List[Dict]:
+        """Barcha endpointlardan parallel so'rash va natijalarni birlashtirish
+        
+        Har bir yozuvga 'host' qo'shiladi, 'id' esa "host/id" ko'rinishiga
+        keltiriladi. Timeoutga tushgan endpointning oxirgi natijasi
+        'stale': True bilan qaytadi, so'rovi esa fonda tugaydi. Xatolik
+        bo'lgan endpoint ham oxirgi natijasini shunday qaytaradi. local()
+        berilsa endpoint so'rovlari yuborilgandan keyin shu threadda
+        bajariladi va uning natijasi birinchi turadi.
+        """
+        started = time.time()
+        futures = {}
+        for endpoint in self.endpoints.values():
+            future = endpoint.pending.get(kind)
+            # Oldingi so'rov hali tugamagan bo'lsa yangisi yuborilmaydi
+            if future is None or future.done():
+                future = endpoint.pending[kind] = self.executor.submit(self._fetch, endpoint, kind, fetch)
+            futures[endpoint.name] = future
+            
+        merged = local() if local is not None else []
+        for name, future in futures.items():
+            endpoint = self.endpoints[name]
+            try:
+                merged.extend(future.result(timeout=max(0.0, endpoint.timeout - (time.time() - started))))
+            except TimeoutError:
+                endpoint.state = ENDPOINT_TIMEOUT_STATE
+                merged.extend(dict(item, stale=True) for item in endpoint.results.get(kind, []))
+        return merged
+        
+    def _fetch(self, endpoint: DockerEndpoint, kind: str,
+               fetch: Callable[[docker.DockerClient], List[Dict]]) -> List[Dict]:
+        """Bitta endpointni so'rash (pool threadida)"""
+        try:
+            items = fetch(endpoint.negotiate_version())
+        except Exception as e:
+            print(f"Docker endpoint so'rovida xatolik ({endpoint.name}): {str(e)}")
+            endpoint.state = ENDPOINT_ERROR
+            endpoint.last_error = str(e)
+            return [dict(item, stale=True) for item in endpoint.results.get(kind, [])]
+            
+        for item in items:
+            item['host'] = endpoint.name
+            item['id'] = f"{endpoint.name}/{item['id']}"
+        endpoint.results[kind] = items
+        endpoint.state = ENDPOINT_OK
+        endpoint.last_error = ""
+        return items
+        
+    def cached(self, kind: str) -> List[Dict]:
+        """Endpointlarning oxirgi natijalari (so'rov yuborilmaydi)"""
+        merged = []
+        for endpoint in self.endpoints.values():
+            if endpoint.state == ENDPOINT_OK:
+                merged.extend(endpoint.results.get(kind, []))
+            else:
+                merged.extend(dict(item, stale=True) for item in endpoint.results.get(kind, []))
+        return merged
+        
+    def get_states(self) -> Dict[str, str]:
+        """Endpoint nomi -> oxirgi so'rov holati"""
+        return {name: endpoint.state for name, endpoint in self.endpoints.items()}
+        
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+        for endpoint in self.endpoints.values():
+            endpoint.close()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docker Events - Docker events oqimi orqali konteyner/image jadvalini yuritish
+
+Jadval bir marta to'liq ro'yxat bilan to'ldiriladi, keyin /events oqimidagi
+create/start/die/destroy/pull/delete va boshqa hodisalar bilan qisman
+yangilanadi. Oqim uzilsa watcher qayta ulanadi va jadvalni qayta to'ldiradi.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+# Konteyner hodisasi -> container.status qiymati
+CONTAINER_EVENT_STATUS = {
+    "create": "created",
+    "start": "running",
+    "restart": "running",
+    "unpause": "running",
+    "pause": "paused",
+    "die": "exited",
+    "stop": "exited",
+}
+
+# Image ro'yxatini qayta o'qishni talab qiladigan hodisalar
+IMAGE_EVENTS = {"pull", "push", "tag", "untag", "delete", "import", "load", "prune"}
+
+MAX_RECONNECT_DELAY = 30
+
+
+class DockerEventWatcher:
+    def __init__(self, client, list_containers: Callable[[], List[Dict]],
+                 list_images: Callable[[], List[Dict]],
+                 on_change: Optional[Callable[[str], None]] = None):
+        self.client = client
+        self.list_containers = list_containers
+        self.list_images = list_images
+        self.on_change = on_change
+        
+        self.lock = threading.Lock()
+        self.containers: Dict[str, Dict] = {}
+        self.images: List[Dict] = []
+        # Jadval events oqimi bilan sinxron bo'lsa True
+        self.synced = False
+        
+        self.stream = None
+        self.stop_event = threading.Event()
+        self.thread = None
+        
+    def start(self):
+        """Fon threadini ishga tushirish"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        
+    def stop(self):
+        """Oqimni yopish va threadni to'xtatish"""
+        self.stop_event.set()
+        self.synced = False
+        stream = self.stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+                
+    def get_containers(self) -> List[Dict]:
+        """Jadvaldagi konteynerlar nusxasi"""
+        with self.lock:
+            return [dict(container) for container in self.containers.values()]
+            
+    def get_images(self) -> List[Dict]:
+        """Jadvaldagi imagelar nusxasi"""
+        with self.lock:
+            return [dict(image) for image in self.images]
+            
+    def _run(self):
+        """Ulanish - to'ldirish - hodisalarni qo'llash tsikli"""
+        delay = 1
+        while not self.stop_event.is_set():
+            try:
+                # Ro'yxat olinayotgan paytdagi hodisalar yo'qolmasligi uchun
+                # oqim ro'yxatdan oldingi vaqtdan boshlab o'qiladi
+                since = int(time.time()) - 1
+                self.resync()
+                self.stream = self.client.events(decode=True, since=since)
+                self.synced = True
+                self._notify("containers")
+                self._notify("images")
+                delay = 1
+                
+                for event in self.stream:
+                    if self.stop_event.is_set():
+                        break
+                    self.apply_event(event)
+                    
+            except Exception as e:
+                if not self.stop_event.is_set():
+                    print(f"Docker events oqimida xatolik: {str(e)}")
+                    
+            self.synced = False
+            self.stream = None
+            self.stop_event.wait(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+            
+    def resync(self):
+        """Jadvalni to'liq ro'yxat bilan qayta to'ldirish"""
+        containers = self.list_containers()
+        images = self.list_images()
+        with self.lock:
+            self.containers = {container['id']: container for container in containers}
+            self.images = images
+            
+    def apply_event(self, event: Dict):
+        """Bitta hodisani jadvalga qo'llash"""
+        event_type = event.get('Type')
+        # "exec_start: sh", "health_status: healthy" -> "exec_start", "health_status"
+        action = (event.get('Action') or event.get('status') or '').split(':')[0]
+        actor = event.get('Actor') or {}
+        attributes = actor.get('Attributes') or {}
+        event_id = actor.get('ID') or event.get('id') or ''
+        
+        if event_type == 'container' and event_id:
+            if self._apply_container_event(event_id[:12], action, attributes, event.get('time')):
+                self._notify("containers")
+        elif event_type == 'image' and action in IMAGE_EVENTS:
+            images = self.list_images()
+            with self.lock:
+                self.images = images
+            self._notify("images")
+            
+    def _apply_container_event(self, short_id: str, action: str, attributes: Dict,
+                               event_time) -> bool:
+        """Konteyner hodisasini qo'llash; jadval o'zgargan bo'lsa True"""
+        with self.lock:
+            if action == 'destroy':
+                return self.containers.pop(short_id, None) is not None
+                
+            container = self.containers.get(short_id)
+            status = CONTAINER_EVENT_STATUS.get(action)
+            
+            if container is None:
+                if status is None:
+                    return False
+                created = ''
+                if event_time:
+                    created = datetime.fromtimestamp(event_time, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+                self.containers[short_id] = {
+                    'id': short_id,
+                    'name': attributes.get('name', ''),
+                    'image': attributes.get('image', ''),
+                    'status': status,
+                    'created': created,
+                    'ports': {}
+                }
+                return True
+                
+            if action == 'rename' and attributes.get('name'):
+                container['name'] = attributes['name']
+                return True
+                
+            if status is not None and container.get('status') != status:
+                container['status'] = status
+                return True
+                
+            return False
+            
+    def _notify(self, kind: str):
+        """O'zgarish haqida xabar berish"""
+        if self.on_change:
+            try:
+                self.on_change(kind)
+            except Exception as e:
+                print(f"Docker events callback xatoligi: {str(e)}")
@@ -7,78 +7,494 @@ Docker Manager - Docker konteynerlarini boshqarish
 import docker
 import json
 import os
-from typing import List, Dict, Optional
+import threading
+from datetime import datetime, timezone
+from typing import Callable, List, Dict, Optional
+from managers.docker_events import DockerEventWatcher
+from managers.docker_endpoints import DockerEndpoint, EndpointPool
+
+# Ulanish holatlari
+STATUS_DISCONNECTED = "disconnected"
+STATUS_CONNECTING = "connecting"
+STATUS_CONNECTED = "connected"
+STATUS_RETRYING = "retrying"
+
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 60
+# Ulangan holatda daemon shu oraliqda ping qilinadi (soniya)
+HEALTH_CHECK_INTERVAL = 15
+# Lokal daemon (docker.from_env) jadvallardagi host nomi
+LOCAL_ENDPOINT = "local"
 
 class DockerManager:
-    def __init__(self):
+    def __init__(self, lazy: bool = False, endpoints: List[Dict] = None,
+                 local_name: str = LOCAL_ENDPOINT):
+        """endpoints - qo'shimcha daemonlar (settings.json dagi docker.endpoints)
+        
+        Lokal daemon avvalgidek events oqimi va qayta ulanish bilan
+        yuritiladi, qo'shimcha endpointlar esa har ro'yxatda parallel so'raladi.
+        """
         self.client = None
+        self.local_name = local_name
+        self.endpoint_pool = EndpointPool([DockerEndpoint.from_config(endpoint)
+                                           for endpoint in endpoints or []])
         self.is_connected = False
-        self.connect()
+        self.event_watcher = None
+        self.event_on_change = None
+        self.lock = threading.RLock()
+        
+        self.status = STATUS_DISCONNECTED
+        self.status_listeners: List[Callable[[str], None]] = []
+        # Birinchi ulanish urinishi tugaganda o'rnatiladi
+        self.ready = threading.Event()
+        self.wake_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.connect_thread = None
+        
+        if lazy:
+            # Ulanish fon threadida - oyna daemonni kutmasdan ochiladi
+            self.start_connect_loop()
+        else:
+            self.connect()
+            self.ready.set()
+            
+    def connect(self, retrying: bool = False) -> bool:
+        """Docker clientga ulanish
         
-    def connect(self):
-        """Docker clientga ulanish"""
+        retrying=True bo'lsa (fon tsikli) muvaffaqiyatsiz urinish holatni
+        o'zgartirmaydi - tsikl "retrying" holatida qoladi, kuzatuvchilar
+        har bir backoff urinishida qayta xabar olmaydi.
+        """
+        if self.status != STATUS_RETRYING:
+            self.set_status(STATUS_CONNECTING)
         try:
-            self.client = docker.from_env()
+            client = docker.from_env()
             # Ulanishni tekshirish
-            self.client.ping()
-            self.is_connected = True
-            print("Docker ga muvaffaqiyatli ulandi")
+            client.ping()
         except Exception as e:
             print(f"Docker ga ulanishda xatolik: {str(e)}")
             self.is_connected = False
+            if not retrying:
+                self.set_status(STATUS_DISCONNECTED)
+            return False
+            
+        with self.lock:
+            old_client, self.client = self.client, client
+            self.is_connected = True
+            # Events oqimi yangi client bilan qayta ochiladi
+            if self.event_on_change is not None:
+                self._start_event_watcher()
+                
+        if old_client is not None:
+            try:
+                old_client.close()
+            except Exception:
+                pass
+                
+        print("Docker ga muvaffaqiyatli ulandi")
+        self.set_status(STATUS_CONNECTED)
+        return True
+        
+    def start_connect_loop(self):
+        """Ulanish/qayta ulanish fon threadini ishga tushirish"""
+        if self.connect_thread and self.connect_thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.connect_thread = threading.Thread(target=self._connect_loop, daemon=True)
+        self.connect_thread.start()
+        
+    def stop_connect_loop(self):
+        """Fon threadini to'xtatish"""
+        self.stop_event.set()
+        self.wake_event.set()
+        
+    def _connect_loop(self):
+        """Holat mashinasi: ulanish -> tekshirish -> uzilsa backoff bilan qayta ulanish"""
+        delay = RECONNECT_MIN_DELAY
+        while not self.stop_event.is_set():
+            if self.is_connected:
+                self.wake_event.wait(HEALTH_CHECK_INTERVAL)
+                self.wake_event.clear()
+                if self.stop_event.is_set() or self.check_connection():
+                    continue
+                    
+                # "disconnected" faqat ulangan holatdan haqiqiy uzilishda yuboriladi
+                print("Docker bilan aloqa uzildi")
+                self.is_connected = False
+                self.set_status(STATUS_DISCONNECTED)
+                delay = RECONNECT_MIN_DELAY
+                
+            if self.connect(retrying=True):
+                delay = RECONNECT_MIN_DELAY
+                self.ready.set()
+                continue
+                
+            self.ready.set()
+            self.set_status(STATUS_RETRYING)
+            self.wake_event.wait(delay)
+            self.wake_event.clear()
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+            
+    def check_connection(self) -> bool:
+        """Daemon javob berayotganini tekshirish"""
+        try:
+            return bool(self.client.ping())
+        except Exception:
+            return False
+            
+    def reconnect(self):
+        """Ulanishni darhol qayta tekshirish (backoff kutilmaydi)"""
+        if self.connect_thread and self.connect_thread.is_alive():
+            self.wake_event.set()
+            
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Birinchi ulanish urinishi tugashini kutish"""
+        return self.ready.wait(timeout)
+        
+    def set_status(self, status: str):
+        """Ulanish holatini o'zgartirish va kuzatuvchilarga xabar berish"""
+        if status == self.status:
+            return
+        self.status = status
+        for listener in list(self.status_listeners):
+            try:
+                listener(status)
+            except Exception as e:
+                print(f"Docker holat callback xatoligi: {str(e)}")
+                
+    def get_status(self) -> str:
+        """Joriy ulanish holati"""
+        return self.status
+        
+    def add_status_listener(self, listener: Callable[[str], None]):
+        """Holat o'zgarishini kuzatish (callback fon threadidan chaqiriladi)"""
+        self.status_listeners.append(listener)
             
     def is_available(self) -> bool:
-        """Docker mavjudligini tekshirish"""
-        return self.is_connected
+        """Docker mavjudligini tekshirish (lokal yoki qo'shimcha endpointlar)"""
+        return self.is_connected or bool(self.endpoint_pool.endpoints)
+        
+    def get_endpoint_states(self) -> Dict[str, str]:
+        """Qo'shimcha endpointlar holati: nomi -> ok, timeout, error yoki unknown"""
+        return self.endpoint_pool.get_states()
+        
+    def resolve(self, ref: str):
+        """Konteyner ID sidan (client, id) - "host/id" mos endpointga yo'naltiriladi
+        
+        Client mavjud bo'lmasa (lokal daemon ulanmagan) None qaytadi.
+        """
+        host, _, object_id = ref.partition('/')
+        endpoint = self.endpoint_pool.get(host) if object_id else None
+        if endpoint is not None:
+            try:
+                return endpoint.get_client(), object_id
+            except Exception as e:
+                print(f"Docker endpointga ulanishda xatolik ({host}): {str(e)}")
+                return None, object_id
+        return (self.client if self.is_connected else None), ref
+        
+    def start_event_watch(self, on_change=None) -> bool:
+        """Docker events oqimi orqali konteyner/image jadvalini yuritishni boshlash
+        
+        on_change(kind) - jadval o'zgarganda fon threadidan chaqiriladi,
+        kind "containers" yoki "images" bo'ladi. Hali ulanmagan bo'lsa
+        oqim ulanish o'rnatilgach ochiladi.
+        """
+        with self.lock:
+            self.event_on_change = on_change
+            if not self.is_connected:
+                return False
+            self._start_event_watcher()
+        return True
+            
+    def _start_event_watcher(self):
+        """Joriy client bilan events watcherni (qayta) ishga tushirish"""
+        if self.event_watcher is not None:
+            self.event_watcher.stop()
+        self.event_watcher = DockerEventWatcher(
+            self.client, self.list_containers, self.list_images, self.event_on_change
+        )
+        self.event_watcher.start()
         
-    def get_containers(self, all_containers: bool = True) -> List[Dict]:
-        """Barcha konteynerlarni olish"""
+    def stop_event_watch(self):
+        """Events oqimini to'xtatish"""
+        with self.lock:
+            self.event_on_change = None
+            if self.event_watcher is not None:
+                self.event_watcher.stop()
+                self.event_watcher = None
+            
+    def is_event_synced(self) -> bool:
+        """Jadval events oqimi bilan sinxronmi"""
+        return self.event_watcher is not None and self.event_watcher.synced
+        
+    def get_containers(self, all_containers: bool = True, cached_only: bool = False) -> List[Dict]:
+        """Barcha hostlardagi konteynerlar ('host' ustuni bilan)
+        
+        Qo'shimcha endpointlar parallel so'raladi, lokal daemon shu
+        vaqtda so'raladi. cached_only=True bo'lsa endpointlarga so'rov
+        yuborilmaydi - oxirgi natijalar ishlatiladi (Tk threadi uchun).
+        """
+        local = lambda: self.get_local_containers(all_containers)
+        if cached_only or not self.endpoint_pool.endpoints:
+            return local() + self.endpoint_pool.cached("containers")
+        return self.endpoint_pool.gather(
+            "containers", lambda client: self.list_containers_sparse(all_containers, client), local=local
+        )
+        
+    def get_local_containers(self, all_containers: bool = True) -> List[Dict]:
+        """Lokal daemondagi konteynerlar"""
         if not self.is_connected:
             return []
             
-        try:
-            containers = self.client.containers.list(all=all_containers)
-            result = []
+        # Events jadvali sinxron bo'lsa API ga so'rov yuborilmaydi
+        if all_containers and self.is_event_synced():
+            return [dict(container, host=self.local_name) for container in self.event_watcher.get_containers()]
             
-            for container in containers:
-                result.append({
-                    'id': container.short_id,
-                    'name': container.name,
-                    'image': container.image.tags[0] if container.image.tags else container.image.id,
-                    'status': container.status,
-                    'created': container.attrs['Created'],
-                    'ports': container.ports
-                })
-                
-            return result
+        try:
+            return [dict(container, host=self.local_name) for container in self.list_containers(all_containers)]
             
         except Exception as e:
             print(f"Konteynerlarni olishda xatolik: {str(e)}")
+            self.reconnect()
             return []
             
-    def get_images(self) -> List[Dict]:
-        """Barcha imagelarni olish"""
-        if not self.is_connected:
-            return []
+    def list_containers(self, all_containers: bool = True, sparse: bool = True) -> List[Dict]:
+        """Konteynerlarni to'g'ridan-to'g'ri API dan olish (xatolik tashqariga chiqadi)
+        
+        sparse=True bo'lsa faqat GET /containers/json natijasi ishlatiladi,
+        har bir konteyner uchun to'liq inspect qilinmaydi. To'liq ma'lumot
+        kerak bo'lganda get_container_details() chaqiriladi.
+        """
+        if sparse:
+            return self.list_containers_sparse(all_containers)
             
-        try:
-            images = self.client.images.list()
-            result = []
+        containers = self.client.containers.list(all=all_containers)
+        # container.image har bir konteyner uchun alohida GET /images/{id}/json
+        # yuboradi, shuning uchun taglar bitta images.list() bilan olinadi
+        image_tags = self.get_image_tags_map()
+        result = []
+        
+        for container in containers:
+            image_id = container.attrs.get('Image', '')
+            tags = image_tags.get(image_id)
+            result.append({
+                'id': container.short_id,
+                'name': container.name,
+                'image': tags[0] if tags else image_id,
+                'status': container.status,
+                'created': container.attrs['Created'],
+                'ports': container.ports
+            })
             
-            for image in images:
-                result.append({
-                    'id': image.short_id,
-                    'tags': image.tags,
-                    'size': image.attrs['Size'],
-                    'created': image.attrs['Created']
+        return result
+        
+    def list_containers_sparse(self, all_containers: bool = True, client=None) -> List[Dict]:
+        """Konteynerlar ro'yxati - bitta /containers/json va bitta /images/json so'rovi
+        
+        client berilmasa lokal daemon so'raladi.
+        """
+        client = client or self.client
+        containers = client.api.containers(all=all_containers)
+        image_tags = self.get_image_tags_map(client)
+        result = []
+        
+        for container in containers:
+            tags = image_tags.get(container.get('ImageID', ''))
+            names = container.get('Names') or ['']
+            created = container.get('Created')
+            result.append({
+                'id': container['Id'][:12],
+                'name': names[0].lstrip('/'),
+                'image': tags[0] if tags else container.get('Image', ''),
+                'status': container.get('State', ''),
+                'created': datetime.fromtimestamp(created, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S") if created else '',
+                'ports': self.parse_port_list(container.get('Ports') or [])
+            })
+            
+        return result
+        
+    def parse_port_list(self, ports: List[Dict]) -> Dict:
+        """/containers/json "Ports" ro'yxatini container.ports formatiga keltirish"""
+        result = {}
+        for port in ports:
+            key = f"{port.get('PrivatePort')}/{port.get('Type', 'tcp')}"
+            if port.get('PublicPort'):
+                result.setdefault(key, []).append({
+                    'HostIp': port.get('IP', ''),
+                    'HostPort': str(port['PublicPort'])
                 })
+            else:
+                result.setdefault(key, None)
+        return result
+        
+    def get_container_details(self, container_id: str) -> Dict:
+        """Konteynerning to'liq inspect ma'lumoti (faqat kerak bo'lganda)"""
+        client, object_id = self.resolve(container_id)
+        if client is None:
+            return {}
+            
+        try:
+            return client.api.inspect_container(object_id)
+            
+        except Exception as e:
+            print(f"Konteyner ma'lumotlarini olishda xatolik: {str(e)}")
+            return {}
+        
+    def stream_container_stats(self, container_id: str, on_sample: Callable[[Dict], None],
+                               stop_event: threading.Event) -> bool:
+        """Konteyner statistikasini bitta oqimli ulanish orqali o'qish
+        
+        Daemon har soniyada bitta yozuv yuboradi, har biri parse qilinib
+        on_sample(sample) ga beriladi. stop_event o'rnatilsa keyingi
+        yozuvda to'xtaydi. Konteyner to'xtasa oqim o'zi tugaydi.
+        """
+        client, object_id = self.resolve(container_id)
+        if client is None:
+            return False
+            
+        try:
+            for stats in client.api.stats(object_id, decode=True, stream=True):
+                if stop_event.is_set():
+                    break
+                sample = self.parse_container_stats(stats)
+                if sample is not None:
+                    on_sample(sample)
+            return True
+            
+        except Exception as e:
+            print(f"Konteyner statistikasini o'qishda xatolik ({container_id}): {str(e)}")
+            return False
+            
+    def stream_container_logs(self, container_id: str, on_data: Callable[[bytes], None],
+                              stop_event: threading.Event, tail: int = 500) -> bool:
+        """Konteyner loglarini oxirgi tail qatordan boshlab kuzatish (follow)
+        
+        Har bir kelgan bo'lak (stdout va stderr) on_data(bytes) ga beriladi.
+        stop_event o'rnatilsa oqim yopiladi - konteyner jim tursa ham.
+        Konteyner to'xtasa oqim o'zi tugaydi.
+        """
+        client, object_id = self.resolve(container_id)
+        if client is None:
+            return False
+            
+        try:
+            stream = client.api.logs(object_id, stream=True, follow=True, tail=tail)
+        except Exception as e:
+            print(f"Konteyner loglarini olishda xatolik ({container_id}): {str(e)}")
+            return False
+            
+        finished = threading.Event()
+        
+        def close_on_stop():
+            # Yangi log kelmasa o'qish bloklanib turadi - to'xtatilganda oqim yopiladi
+            while not stop_event.wait(0.5):
+                if finished.is_set():
+                    return
+            stream.close()
+            
+        threading.Thread(target=close_on_stop, daemon=True).start()
+        try:
+            for data in stream:
+                if stop_event.is_set():
+                    break
+                on_data(data)
+            return True
+            
+        except Exception as e:
+            # Oqim stop_event bilan yopilgan bo'lsa xatolik emas
+            if not stop_event.is_set():
+                print(f"Konteyner loglarini o'qishda xatolik ({container_id}): {str(e)}")
+                return False
+            return True
+        finally:
+            finished.set()
+            
+    def parse_container_stats(self, stats: Dict) -> Optional[Dict]:
+        """/containers/{id}/stats yozuvini metrika namunasiga aylantirish
+        
+        CPU foizi "docker stats" dagi kabi hisoblanadi. Tarmoq va disk
+        qiymatlari konteyner ishga tushgandan beri jami baytlar.
+        """
+        cpu_stats = stats.get('cpu_stats') or {}
+        precpu_stats = stats.get('precpu_stats') or {}
+        if not cpu_stats:
+            return None
+            
+        cpu_usage = cpu_stats.get('cpu_usage') or {}
+        cpu_delta = cpu_usage.get('total_usage', 0) - (precpu_stats.get('cpu_usage') or {}).get('total_usage', 0)
+        system_delta = cpu_stats.get('system_cpu_usage', 0) - precpu_stats.get('system_cpu_usage', 0)
+        online_cpus = cpu_stats.get('online_cpus') or len(cpu_usage.get('percpu_usage') or []) or 1
+        cpu = cpu_delta / system_delta * online_cpus * 100 if system_delta > 0 and cpu_delta >= 0 else 0.0
+        
+        memory_stats = stats.get('memory_stats') or {}
+        details = memory_stats.get('stats') or {}
+        # Sahifa keshi ishlatilgan xotiraga kiritilmaydi (cgroup v1: cache, v2: inactive_file)
+        cache = details.get('total_inactive_file', details.get('inactive_file', details.get('cache', 0)))
+        memory = max(memory_stats.get('usage', 0) - cache, 0)
+        
+        networks = stats.get('networks') or {}
+        block_read = block_write = 0
+        for entry in (stats.get('blkio_stats') or {}).get('io_service_bytes_recursive') or []:
+            op = entry.get('op', '').lower()
+            if op == 'read':
+                block_read += entry.get('value', 0)
+            elif op == 'write':
+                block_write += entry.get('value', 0)
                 
-            return result
+        return {
+            'cpu': cpu,
+            'memory': memory,
+            'memory_limit': memory_stats.get('limit'),
+            'net_rx_total': sum(net.get('rx_bytes', 0) for net in networks.values()),
+            'net_tx_total': sum(net.get('tx_bytes', 0) for net in networks.values()),
+            'block_read_total': block_read,
+            'block_write_total': block_write
+        }
+        
+    def get_image_tags_map(self, client=None) -> Dict[str, List[str]]:
+        """Image ID -> taglar lug'ati (bitta API chaqiruvi)"""
+        return {image['Id']: image.get('RepoTags') or []
+                for image in (client or self.client).api.images()}
+            
+    def get_images(self, cached_only: bool = False) -> List[Dict]:
+        """Barcha hostlardagi imagelar ('host' ustuni bilan)"""
+        local = self.get_local_images
+        if cached_only or not self.endpoint_pool.endpoints:
+            return local() + self.endpoint_pool.cached("images")
+        return self.endpoint_pool.gather("images", self.list_images, local=local)
+        
+    def get_local_images(self) -> List[Dict]:
+        """Lokal daemondagi imagelar"""
+        if not self.is_connected:
+            return []
+            
+        if self.is_event_synced():
+            return [dict(image, host=self.local_name) for image in self.event_watcher.get_images()]
+            
+        try:
+            return [dict(image, host=self.local_name) for image in self.list_images()]
             
         except Exception as e:
             print(f"Imagelarni olishda xatolik: {str(e)}")
+            self.reconnect()
             return []
             
+    def list_images(self, client=None) -> List[Dict]:
+        """Imagelarni to'g'ridan-to'g'ri API dan olish (xatolik tashqariga chiqadi)"""
+        images = (client or self.client).images.list()
+        result = []
+        
+        for image in images:
+            result.append({
+                'id': image.short_id,
+                'tags': image.tags,
+                'size': image.attrs['Size'],
+                'created': image.attrs['Created']
+            })
+            
+        return result
+            
     def run_container(self, image_name: str, name: str = None, 
                      ports: Dict = None, environment: Dict = None,
                      volumes: Dict = None) -> bool:
@@ -102,13 +518,70 @@ class DockerManager:
             print(f"Konteyner ishga tushirishda xatolik: {str(e)}")
             return False
             
+    def start_container(self, container_id: str) -> bool:
+        """Konteynerni ishga tushirish"""
+        client, object_id = self.resolve(container_id)
+        if client is None:
+            return False
+            
+        try:
+            client.api.start(object_id)
+            return True
+            
+        except Exception as e:
+            print(f"Konteyner ishga tushirishda xatolik: {str(e)}")
+            return False
+            
+    def pause_container(self, container_id: str) -> bool:
+        """Konteynerni pauza qilish"""
+        client, object_id = self.resolve(container_id)
+        if client is None:
+            return False
+            
+        try:
+            client.api.pause(object_id)
+            return True
+            
+        except Exception as e:
+            print(f"Konteyner pauza qilishda xatolik: {str(e)}")
+            return False
+            
+    def resume_container(self, container_id: str) -> bool:
+        """Pauzadagi konteynerni davom ettirish"""
+        client, object_id = self.resolve(container_id)
+        if client is None:
+            return False
+            
+        try:
+            client.api.unpause(object_id)
+            return True
+            
+        except Exception as e:
+            print(f"Konteyner davom ettirishda xatolik: {str(e)}")
+            return False
+            
+    def restart_container(self, container_id: str) -> bool:
+        """Konteynerni qayta ishga tushirish"""
+        client, object_id = self.resolve(container_id)
+        if client is None:
+            return False
+            
+        try:
+            client.api.restart(object_id)
+            return True
+            
+        except Exception as e:
+            print(f"Konteyner qayta ishga tushirishda xatolik: {str(e)}")
+            return False
+            
     def stop_container(self, container_id: str) -> bool:
         """Konteynerni to'xtatish"""
-        if not self.is_connected:
+        client, object_id = self.resolve(container_id)
+        if client is None:
             return False
             
         try:
-            container = self.client.containers.get(container_id)
+            container = client.containers.get(object_id)
             container.stop()
             print(f"Konteyner to'xtatildi: {container.name}")
             return True
@@ -119,11 +592,12 @@ class DockerManager:
             
     def remove_container(self, container_id: str) -> bool:
         """Konteynerni o'chirish"""
-        if not self.is_connected:
+        client, object_id = self.resolve(container_id)
+        if client is None:
             return False
             
         try:
-            container = self.client.containers.get(container_id)
+            container = client.containers.get(object_id)
             container.remove()
             print(f"Konteyner o'chirildi: {container.name}")
             return True
@@ -132,13 +606,143 @@ class DockerManager:
             print(f"Konteyner o'chirishda xatolik: {str(e)}")
             return False
             
-    def pull_image(self, image_name: str) -> bool:
-        """Image yuklab olish"""
+    def get_disk_usage(self) -> Dict:
+        """Docker disk sarfi (/system/df) - imagelar, konteynerlar, volumelar, build kesh"""
+        if not self.is_connected:
+            return {}
+            
+        try:
+            return self.client.api.df()
+        except Exception as e:
+            print(f"Disk sarfini olishda xatolik: {str(e)}")
+            return {}
+            
+    def prune(self, kind: str, all_images: bool = False) -> Optional[Dict]:
+        """Ishlatilmayotgan obyektlarni o'chirish
+        
+        kind: "containers", "images", "volumes" yoki "build_cache".
+        all_images=False bo'lsa faqat osilib qolgan (tegsiz) imagelar
+        o'chiriladi. Natija: {'deleted': [...], 'reclaimed': bayt}.
+        """
+        if not self.is_connected:
+            return None
+            
+        try:
+            if kind == "containers":
+                result = self.client.api.prune_containers()
+                deleted = result.get('ContainersDeleted')
+            elif kind == "images":
+                result = self.client.api.prune_images(filters={'dangling': not all_images})
+                deleted = [entry.get('Deleted') or entry.get('Untagged')
+                           for entry in result.get('ImagesDeleted') or []]
+            elif kind == "volumes":
+                result = self.client.api.prune_volumes()
+                deleted = result.get('VolumesDeleted')
+            elif kind == "build_cache":
+                result = self.client.api.prune_builds()
+                deleted = result.get('CachesDeleted')
+            else:
+                raise ValueError(f"Noma'lum tur: {kind}")
+                
+            print(f"Docker tozalandi ({kind}): {result.get('SpaceReclaimed') or 0} bayt")
+            return {'deleted': deleted or [], 'reclaimed': result.get('SpaceReclaimed') or 0}
+            
+        except Exception as e:
+            print(f"Docker tozalashda xatolik ({kind}): {str(e)}")
+            return None
+            
+    def has_image(self, image_name: str) -> bool:
+        """Image lokal mavjudligini tekshirish"""
         if not self.is_connected:
             return False
             
         try:
-            self.client.images.pull(image_name)
+            self.client.images.get(image_name)
+            return True
+        except docker.errors.ImageNotFound:
+            return False
+        except Exception as e:
+            print(f"Imageni tekshirishda xatolik: {str(e)}")
+            return False
+            
+    def get_image_digests(self, image_name: str) -> Optional[List[str]]:
+        """Lokal imagening registry digestlari ("sha256:...")
+        
+        Image lokal bo'lmasa None, lokal qurilgan bo'lsa bo'sh ro'yxat.
+        """
+        if not self.is_connected:
+            return None
+            
+        try:
+            repo_digests = self.client.api.inspect_image(image_name).get('RepoDigests') or []
+            return [digest.split('@', 1)[1] for digest in repo_digests if '@' in digest]
+        except docker.errors.ImageNotFound:
+            return None
+        except Exception as e:
+            print(f"Image digestini olishda xatolik: {str(e)}")
+            return None
+            
+    def get_registry_digest(self, image_name: str) -> Optional[str]:
+        """Registrydagi manifest digesti - qatlamlar yuklanmaydi, faqat manifest so'raladi"""
+        if not self.is_connected:
+            return None
+            
+        try:
+            return self.client.api.inspect_distribution(image_name)['Descriptor']['digest']
+        except Exception as e:
+            print(f"Registry digestini olishda xatolik: {str(e)}")
+            return None
+            
+    def pull_image(self, image_name: str, progress_callback=None, cancel_event=None,
+                   layer_callback=None) -> bool:
+        """Image yuklab olish (oqimli /images/create API)
+        
+        progress_callback(progress, message) - qatlamlar bo'yicha yuklangan
+        baytlar ulushi (0..1, noma'lum bo'lsa None). layer_callback(layer_id,
+        layer) - har bir qatlam hodisasida {'status', 'current', 'total'}.
+        cancel_event o'rnatilsa yuklash to'xtatiladi.
+        """
+        if not self.is_connected:
+            return False
+            
+        repository, tag = docker.utils.parse_repository_tag(image_name)
+        try:
+            stream = self.client.api.pull(repository, tag=tag or 'latest', stream=True, decode=True)
+            # qatlam ID -> {'status', 'current', 'total'} (faqat yuklash baytlari)
+            layers = {}
+            try:
+                for event in stream:
+                    if cancel_event is not None and cancel_event.is_set():
+                        print(f"Image yuklab olish bekor qilindi: {image_name}")
+                        return False
+                        
+                    if 'error' in event:
+                        print(f"Image yuklab olishda xatolik: {event['error']}")
+                        return False
+                        
+                    layer_id = event.get('id')
+                    status = event.get('status', '')
+                    if layer_id and status and not status.startswith(('Pulling from', 'Digest', 'Status')):
+                        layer = layers.setdefault(layer_id, {'status': status, 'current': 0, 'total': None})
+                        layer['status'] = status
+                        detail = event.get('progressDetail') or {}
+                        # Extracting hodisalari ham progressDetail yuboradi - ular baytlarga qo'shilmaydi
+                        if status == 'Downloading' and detail.get('total'):
+                            layer['current'] = detail.get('current', 0)
+                            layer['total'] = detail['total']
+                        elif status in ('Download complete', 'Pull complete') and layer['total']:
+                            layer['current'] = layer['total']
+                        if layer_callback is not None:
+                            layer_callback(layer_id, dict(layer))
+                        
+                    if progress_callback is not None:
+                        total = sum(layer['total'] or 0 for layer in layers.values())
+                        current = sum(layer['current'] for layer in layers.values() if layer['total'])
+                        progress_callback(current / total if total else None,
+                                          f"{layer_id or ''} {status}".strip())
+            finally:
+                stream.close()
+                
             print(f"Image yuklab olindi: {image_name}")
             return True
             
@@ -8,20 +8,87 @@ import subprocess
 import json
 import os
 import re
+import threading
+import time
 from typing import List, Dict, Optional
+from managers.powershell_session import PowerShellPool
+from utils.discovery_cache import DiscoveryCache, NEGATIVE_RESULT_TTL, resolve_binary
 
 class HyperVManager:
-    def __init__(self):
-        self.is_available_flag = self.check_availability()
+    CACHE_KEY = "hyperv"
+    
+    # Ommaviy amal -> (cmdlet, qo'shimcha parametrlar, kutilgan holat)
+    BULK_ACTIONS = {
+        "start": ("Start-VM", "", "Running"),
+        "stop": ("Stop-VM", "-Force", "Off"),
+        "pause": ("Suspend-VM", "", "Paused"),
+        "resume": ("Resume-VM", "", "Running"),
+        "reset": ("Restart-VM", "-Force", "Running"),
+        "remove": ("Remove-VM", "-Force", None),
+    }
+    
+    def __init__(self, pool_size: int = 2, discovery_cache: Optional[DiscoveryCache] = None,
+                 background: bool = False):
+        # Doimiy PowerShell sessiyalari - har chaqiruvda powershell.exe ishga tushmaydi
+        self.ps_pool = PowerShellPool(size=pool_size)
+        self.discovery_cache = discovery_cache or DiscoveryCache()
+        self.is_available_flag = False
+        self.ready = threading.Event()
+        # "mavjud emas" natijasi shu vaqtdan keyin fonda qayta tekshiriladi
+        self.recheck_at = time.time() + NEGATIVE_RESULT_TTL
+        
+        # powershell.exe o'zgarmagan bo'lsa oldingi natija ishlatiladi
+        entry = self.discovery_cache.get(self.CACHE_KEY)
+        if entry is not None:
+            self.is_available_flag = bool(entry.get('available'))
+            self.recheck_at = entry.get('expires_at') or self.recheck_at
+            self.ready.set()
+        elif background:
+            threading.Thread(target=self.probe, daemon=True).start()
+        else:
+            self.probe()
+            
+    def probe(self):
+        """Hyper-V modulini tekshirish va natijani keshga yozish"""
+        try:
+            path = resolve_binary("powershell")
+            # PowerShell yo'q bo'lsa sessiya ochishga urinilmaydi
+            available = self.check_availability() if path else False
+            # powershell.exe Hyper-V yoqilganda o'zgarmaydi - "mavjud emas" muddatli saqlanadi
+            self.discovery_cache.set(self.CACHE_KEY, path, ttl=None if available else NEGATIVE_RESULT_TTL,
+                                     available=available, candidates=["powershell"])
+            self.is_available_flag = available
+            self.recheck_at = time.time() + NEGATIVE_RESULT_TTL
+        finally:
+            self.ready.set()
+            
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Fon tekshiruvi tugashini kutish"""
+        return self.ready.wait(timeout)
+        
+    def run_powershell(self, ps_command: str, timeout: int = 30):
+        """PowerShell buyrug'ini puldagi sessiyada bajarish
+        
+        Sessiya ochib bo'lmasa (masalan, powershell topilmasa) oddiy
+        subprocess chaqiruviga qaytadi.
+        """
+        if self.ps_pool is not None:
+            try:
+                return self.ps_pool.run(ps_command, timeout=timeout)
+            except OSError as e:
+                print(f"PowerShell sessiyasini ochishda xatolik: {str(e)}")
+                self.ps_pool.close()
+                self.ps_pool = None
+                
+        return subprocess.run([
+            "powershell", "-Command", ps_command
+        ], capture_output=True, text=True, timeout=timeout)
         
     def check_availability(self) -> bool:
         """Hyper-V mavjudligini tekshirish"""
         try:
             # PowerShell orqali Hyper-V modulini tekshirish
-            result = subprocess.run([
-                "powershell", "-Command", 
-                "Get-Module -ListAvailable -Name Hyper-V"
-            ], capture_output=True, text=True, timeout=10)
+            result = self.run_powershell("Get-Module -ListAvailable -Name Hyper-V", timeout=10)
             
             return "Hyper-V" in result.stdout
             
@@ -30,6 +97,10 @@ class HyperVManager:
             
     def is_available(self) -> bool:
         """Hyper-V mavjudligini tekshirish"""
+        # Dastur uzoq ochiq tursa ham yoqilgan Hyper-V keyingi tekshiruvda ko'rinadi
+        if not self.is_available_flag and self.ready.is_set() and time.time() >= self.recheck_at:
+            self.recheck_at = time.time() + NEGATIVE_RESULT_TTL
+            threading.Thread(target=self.probe, daemon=True).start()
         return self.is_available_flag
         
     def get_vms(self) -> List[Dict]:
@@ -38,15 +109,13 @@ class HyperVManager:
             return []
             
         try:
-            # PowerShell orqali VMlarni olish
+            # PowerShell orqali VMlarni olish (State enum son emas, nomi bilan)
             ps_command = """
-            Get-VM | Select-Object Name, State, MemoryStartup, ProcessorCount, 
-            CreationTime, Id | ConvertTo-Json
+            Get-VM | Select-Object Name, @{Name='State'; Expression={$_.State.ToString()}},
+            MemoryStartup, ProcessorCount, CreationTime, Id | ConvertTo-Json
             """
             
-            result = subprocess.run([
-                "powershell", "-Command", ps_command
-            ], capture_output=True, text=True, timeout=30)
+            result = self.run_powershell(ps_command, timeout=30)
             
             if result.returncode != 0:
                 return []
@@ -82,9 +151,7 @@ class HyperVManager:
             return False
             
         try:
-            result = subprocess.run([
-                "powershell", "-Command", f"Start-VM -Name '{vm_name}'"
-            ], capture_output=True, text=True, timeout=30)
+            result = self.run_powershell(f"Start-VM -Name '{vm_name}'", timeout=30)
             
             return result.returncode == 0
             
@@ -98,9 +165,7 @@ class HyperVManager:
             return False
             
         try:
-            result = subprocess.run([
-                "powershell", "-Command", f"Stop-VM -Name '{vm_name}' -Force"
-            ], capture_output=True, text=True, timeout=30)
+            result = self.run_powershell(f"Stop-VM -Name '{vm_name}' -Force", timeout=30)
             
             return result.returncode == 0
             
@@ -126,9 +191,7 @@ class HyperVManager:
             Set-VM -Name '{name}' -ProcessorCount {cpus}
             """
             
-            result = subprocess.run([
-                "powershell", "-Command", ps_command
-            ], capture_output=True, text=True, timeout=60)
+            result = self.run_powershell(ps_command, timeout=60)
             
             if result.returncode != 0:
                 print(f"VM yaratishda xatolik: {result.stderr}")
@@ -144,9 +207,7 @@ class HyperVManager:
                 Add-VMHardDiskDrive -VMName '{name}' -Path $vhdPath
                 """
                 
-                subprocess.run([
-                    "powershell", "-Command", ps_command
-                ], capture_output=True, text=True, timeout=30)
+                self.run_powershell(ps_command, timeout=30)
             else:
                 # Yangi hard disk yaratish va ulash
                 ps_command = f"""
@@ -154,9 +215,7 @@ class HyperVManager:
                 Add-VMHardDiskDrive -VMName '{name}' -Path '{hard_disk_path}'
                 """
                 
-                subprocess.run([
-                    "powershell", "-Command", ps_command
-                ], capture_output=True, text=True, timeout=30)
+                self.run_powershell(ps_command, timeout=30)
             
             # ISO ulash (agar berilgan bo'lsa)
             if iso_path and os.path.exists(iso_path):
@@ -179,9 +238,7 @@ class HyperVManager:
             Add-VMDvdDrive -VMName '{vm_name}' -Path '{iso_path}'
             """
             
-            result = subprocess.run([
-                "powershell", "-Command", ps_command
-            ], capture_output=True, text=True, timeout=30)
+            result = self.run_powershell(ps_command, timeout=30)
             
             return result.returncode == 0
             
@@ -202,9 +259,7 @@ class HyperVManager:
             }}
             """
             
-            result = subprocess.run([
-                "powershell", "-Command", ps_command
-            ], capture_output=True, text=True, timeout=30)
+            result = self.run_powershell(ps_command, timeout=30)
             
             return result.returncode == 0
             
@@ -218,9 +273,7 @@ class HyperVManager:
             return False
             
         try:
-            result = subprocess.run([
-                "powershell", "-Command", f"Suspend-VM -Name '{vm_name}'"
-            ], capture_output=True, text=True, timeout=30)
+            result = self.run_powershell(f"Suspend-VM -Name '{vm_name}'", timeout=30)
             
             return result.returncode == 0
             
@@ -234,9 +287,7 @@ class HyperVManager:
             return False
             
         try:
-            result = subprocess.run([
-                "powershell", "-Command", f"Resume-VM -Name '{vm_name}'"
-            ], capture_output=True, text=True, timeout=30)
+            result = self.run_powershell(f"Resume-VM -Name '{vm_name}'", timeout=30)
             
             return result.returncode == 0
             
@@ -250,9 +301,7 @@ class HyperVManager:
             return False
             
         try:
-            result = subprocess.run([
-                "powershell", "-Command", f"Restart-VM -Name '{vm_name}' -Force"
-            ], capture_output=True, text=True, timeout=30)
+            result = self.run_powershell(f"Restart-VM -Name '{vm_name}' -Force", timeout=30)
             
             return result.returncode == 0
             
@@ -260,15 +309,120 @@ class HyperVManager:
             print(f"VM qayta ishga tushirishda xatolik: {str(e)}")
             return False
             
+    def remove_vm(self, vm_name: str) -> bool:
+        """VMni o'chirish (VHD fayllari saqlanib qoladi)"""
+        if not self.is_available():
+            return False
+            
+        try:
+            result = self.run_powershell(f"Remove-VM -Name '{vm_name}' -Force", timeout=30)
+            
+            return result.returncode == 0
+            
+        except Exception as e:
+            print(f"VMni o'chirishda xatolik: {str(e)}")
+            return False
+            
+    def bulk_vm_action(self, action: str, vm_names: List[str]) -> Dict[str, bool]:
+        """Bir nechta VM ustida bitta PowerShell chaqiruvida amal bajarish
+        
+        Masalan: Start-VM -Name 'a','b','c'. Har bir VM natijasi amaldan
+        keyingi holati bo'yicha aniqlanadi (remove uchun - VM qolmaganligi).
+        """
+        if not self.is_available() or not vm_names:
+            return {name: False for name in vm_names}
+            
+        cmdlet, extra, expected_state = self.BULK_ACTIONS[action]
+        names = ",".join("'" + name.replace("'", "''") + "'" for name in vm_names)
+        ps_command = f"""
+        $names = @({names})
+        {cmdlet} -Name $names {extra} -ErrorAction SilentlyContinue
+        $vms = @(Get-VM -Name $names -ErrorAction SilentlyContinue |
+            Select-Object Name, @{{Name='State'; Expression={{$_.State.ToString()}}}})
+        ConvertTo-Json -InputObject $vms -Compress
+        """
+        
+        try:
+            result = self.run_powershell(ps_command, timeout=30 + 10 * len(vm_names))
+            states = {}
+            if result.stdout.strip():
+                data = json.loads(result.stdout)
+                if isinstance(data, dict):
+                    data = [data]
+                states = {vm.get('Name'): vm.get('State') for vm in data}
+                
+            if expected_state is None:
+                return {name: name not in states for name in vm_names}
+            return {name: states.get(name) == expected_state for name in vm_names}
+            
+        except Exception as e:
+            print(f"Ommaviy VM amalida xatolik: {str(e)}")
+            return {name: False for name in vm_names}
+            
+    def measure_vms(self) -> Dict[str, Dict]:
+        """Ishlayotgan VMlar metrikalari bitta PowerShell chaqiruvida
+        
+        CPU foizi va ajratilgan xotira Get-VM dan olinadi. Resurs hisobi
+        (Enable-VMResourceMetering) yoqilgan VMlar uchun Measure-VM dan
+        tarmoq trafigi ham qo'shiladi - hisob avtomatik yoqilmaydi.
+        Natija: VM nomi -> {'cpu', 'memory', 'net_rx_total', 'net_tx_total'}
+        """
+        if not self.is_available():
+            return {}
+            
+        ps_command = """
+        $vms = @(Get-VM | Where-Object { $_.State -eq 'Running' } | ForEach-Object {
+            $report = $null
+            if ($_.ResourceMeteringEnabled) {
+                $report = (Measure-VM -VM $_ -ErrorAction SilentlyContinue).NetworkMeteredTrafficReport
+            }
+            [pscustomobject]@{
+                Name = $_.Name
+                CPU = $_.CPUUsage
+                Memory = $_.MemoryAssigned
+                NetIn = ($report | Where-Object { $_.Direction.ToString() -eq 'Inbound' } |
+                    Measure-Object -Property TotalTraffic -Sum).Sum
+                NetOut = ($report | Where-Object { $_.Direction.ToString() -eq 'Outbound' } |
+                    Measure-Object -Property TotalTraffic -Sum).Sum
+            }
+        })
+        ConvertTo-Json -InputObject $vms -Compress
+        """
+        
+        try:
+            result = self.run_powershell(ps_command, timeout=30)
+            if result.returncode != 0 or not result.stdout.strip():
+                return {}
+                
+            data = json.loads(result.stdout)
+            if isinstance(data, dict):
+                data = [data]
+                
+            metrics = {}
+            for vm in data:
+                sample = {
+                    'cpu': float(vm.get('CPU') or 0),
+                    'memory': vm.get('Memory') or 0
+                }
+                # Measure-VM trafigi megabaytlarda, hisob yoqilgandan beri jami
+                if vm.get('NetIn') is not None:
+                    sample['net_rx_total'] = vm['NetIn'] * 1024 * 1024
+                if vm.get('NetOut') is not None:
+                    sample['net_tx_total'] = vm['NetOut'] * 1024 * 1024
+                metrics[vm.get('Name', '')] = sample
+            return metrics
+            
+        except Exception as e:
+            print(f"VM metrikalarini olishda xatolik: {str(e)}")
+            return {}
+            
     def get_vm_status(self, vm_name: str) -> str:
         """VM holatini olish"""
         if not self.is_available():
             return "Unknown"
             
         try:
-            result = subprocess.run([
-                "powershell", "-Command", f"Get-VM -Name '{vm_name}' | Select-Object -ExpandProperty State"
-            ], capture_output=True, text=True, timeout=10)
+            result = self.run_powershell(f"Get-VM -Name '{vm_name}' | Select-Object -ExpandProperty State", timeout=10)
             
             if result.returncode == 0:
                 return result.stdout.strip()
@@ -290,9 +444,7 @@ class HyperVManager:
             ControllerLocation, Path, Size | ConvertTo-Json
             """
             
-            result = subprocess.run([
-                "powershell", "-Command", ps_command
-            ], capture_output=True, text=True, timeout=30)
+            result = self.run_powershell(ps_command, timeout=30)
             
             if result.returncode != 0:
                 return []
@@ -333,9 +485,7 @@ class HyperVManager:
             Resize-VHD -Path '{disk_path}' -SizeBytes {new_size_gb}GB
             """
             
-            result = subprocess.run([
-                "powershell", "-Command", ps_command
-            ], capture_output=True, text=True, timeout=120)
+            result = self.run_powershell(ps_command, timeout=120)
             
             return result.returncode == 0
             
@@ -355,9 +505,7 @@ class HyperVManager:
             Add-VMHardDiskDrive -VMName '{vm_name}' -Path '{disk_path}'
             """
             
-            result = subprocess.run([
-                "powershell", "-Command", ps_command
-            ], capture_output=True, text=True, timeout=60)
+            result = self.run_powershell(ps_command, timeout=60)
             
             return result.returncode == 0
             
@@ -375,9 +523,7 @@ class HyperVManager:
             Remove-VMHardDiskDrive -VMName '{vm_name}' -ControllerNumber {controller_number} -ControllerLocation {controller_location}
             """
             
-            result = subprocess.run([
-                "powershell", "-Command", ps_command
-            ], capture_output=True, text=True, timeout=30)
+            result = self.run_powershell(ps_command, timeout=30)
             
             return result.returncode == 0
             
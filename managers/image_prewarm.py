@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Image Prewarm - docker_templates.json dagi imagelarni oldindan yuklab qo'yish
+
+Dastur bo'sh turganda shablon imagelari tekshiriladi: lokal yo'q yoki lokal
+digesti registrydagidan farq qiladigan imagelar fonda ImagePullEngine orqali
+yuklanadi. Foydalanuvchi shu imageni so'rasa u mavjud yuklashga qo'shiladi.
+Parallel yuklashlar soni va o'rtacha yuklash tezligi cheklangan.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Shablonlar qayta tekshiriladigan oraliq (soniya)
+PREWARM_INTERVAL = 6 * 3600
+# Bir vaqtda oldindan yuklanadigan imagelar soni
+PREWARM_MAX_CONCURRENT = 1
+# O'rtacha yuklash tezligi chegarasi (bayt/s, 0 - cheklanmagan)
+PREWARM_MAX_BANDWIDTH = 10 * 1024 * 1024
+
+# Image holatlari
+IMAGE_MISSING = "missing"
+IMAGE_STALE = "stale"
+IMAGE_FRESH = "fresh"
+IMAGE_PULLING = "pulling"
+IMAGE_FAILED = "failed"
+
+
+def load_docker_templates(templates_file: str = "templates/docker_templates.json") -> List[Dict]:
+    """Docker konteyner shablonlarini yuklash"""
+    if os.path.exists(templates_file):
+        try:
+            with open(templates_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get("templates", [])
+        except Exception as e:
+            print(f"Docker shablonlarini yuklashda xatolik: {str(e)}")
+            
+    return []
+
+
+class ImagePrewarmer:
+    def __init__(self, docker_manager, pull_engine,
+                 templates_file: str = "templates/docker_templates.json",
+                 is_idle: Optional[Callable[[], bool]] = None,
+                 interval: float = PREWARM_INTERVAL,
+                 max_concurrent: int = PREWARM_MAX_CONCURRENT,
+                 max_bandwidth: float = PREWARM_MAX_BANDWIDTH,
+                 on_pulled: Optional[Callable[[str], None]] = None):
+        """is_idle() False bo'lsa keyingi yuklash boshlanmaydi (fon threadidan chaqiriladi)"""
+        self.docker_manager = docker_manager
+        self.pull_engine = pull_engine
+        self.templates_file = templates_file
+        self.is_idle = is_idle
+        self.interval = interval
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_bandwidth = max_bandwidth
+        self.on_pulled = on_pulled
+        
+        self.lock = threading.Lock()
+        # image:tag -> IMAGE_* holati
+        self.status: Dict[str, str] = {}
+        self.last_run = 0.0
+        self.running = False
+        self.cancel_event = threading.Event()
+        # Tezlik chegarasi: keyingi yuklash shu vaqtdan oldin boshlanmaydi
+        self.not_before = 0.0
+        
+    def template_images(self) -> List[str]:
+        """Shablonlardagi imagelar (takrorlanmasdan, image:tag ko'rinishida)"""
+        images = []
+        for template in load_docker_templates(self.templates_file):
+            if template.get('image'):
+                image = self.pull_engine.normalize(template['image'])
+                if image not in images:
+                    images.append(image)
+        return images
+        
+    def check_image(self, image: str) -> str:
+        """Lokal image yo'q (missing), eskirgan (stale) yoki yangi (fresh)"""
+        local_digests = self.docker_manager.get_image_digests(image)
+        if local_digests is None:
+            return IMAGE_MISSING
+            
+        remote_digest = self.docker_manager.get_registry_digest(image)
+        # Registry javob bermasa yoki image lokal qurilgan bo'lsa lokal nusxa ishlatiladi
+        if remote_digest is None or not local_digests or remote_digest in local_digests:
+            return IMAGE_FRESH
+        return IMAGE_STALE
+        
+    def get_status(self) -> Dict[str, str]:
+        with self.lock:
+            return dict(self.status)
+            
+    def set_status(self, image: str, state: str):
+        with self.lock:
+            self.status[image] = state
+            
+    def start(self) -> bool:
+        """Tekshirish vaqti kelgan bo'lsa fonda boshlash (har tickda chaqirilsa ham arzon)"""
+        with self.lock:
+            if self.running or time.time() - self.last_run < self.interval:
+                return False
+            self.running = True
+            self.cancel_event = cancel_event = threading.Event()
+            
+        threading.Thread(target=self._run, args=(cancel_event,), daemon=True).start()
+        return True
+        
+    def stop(self):
+        """Oldindan yuklashni bekor qilish - foydalanuvchi ham kutayotgan yuklash davom etadi"""
+        self.cancel_event.set()
+        
+    def _run(self, cancel_event: threading.Event):
+        """Shablon imagelarini tekshirib, kerakligini yuklash"""
+        try:
+            pending = []
+            for image in self.template_images():
+                if cancel_event.is_set():
+                    return
+                state = self.check_image(image)
+                self.set_status(image, state)
+                if state != IMAGE_FRESH:
+                    pending.append(image)
+                    
+            workers = [
+                threading.Thread(target=self._worker, args=(pending, cancel_event), daemon=True)
+                for _ in range(min(self.max_concurrent, len(pending)))
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+                
+        except Exception as e:
+            print(f"Imagelarni oldindan yuklashda xatolik: {str(e)}")
+        finally:
+            with self.lock:
+                self.running = False
+                # Bekor qilingan tekshiruv keyingi bo'sh vaqtda qaytadan boshlanadi
+                if not cancel_event.is_set():
+                    self.last_run = time.time()
+                    
+    def _worker(self, pending: List[str], cancel_event: threading.Event):
+        """Navbatdagi imagelarni birma-bir yuklash"""
+        while True:
+            with self.lock:
+                if not pending:
+                    return
+                image = pending.pop(0)
+                previous = self.status.get(image, IMAGE_MISSING)
+                
+            if not self._wait_turn(cancel_event):
+                return
+                
+            self.set_status(image, IMAGE_PULLING)
+            started = time.time()
+            if self.pull_engine.pull(image, cancel_event=cancel_event):
+                self.set_status(image, IMAGE_FRESH)
+                if self.on_pulled is not None:
+                    self.on_pulled(image)
+            else:
+                self.set_status(image, previous if cancel_event.is_set() else IMAGE_FAILED)
+            self._charge(self.downloaded_bytes(image), started)
+            
+    def _wait_turn(self, cancel_event: threading.Event) -> bool:
+        """Dastur bo'sh bo'lguncha va tezlik chegarasi ruxsat berguncha kutish"""
+        while not cancel_event.is_set():
+            with self.lock:
+                delay = self.not_before - time.time()
+            if delay <= 0 and (self.is_idle is None or self.is_idle()):
+                return True
+            cancel_event.wait(min(max(delay, 1.0), 5.0))
+        return False
+        
+    def downloaded_bytes(self, image: str) -> int:
+        """Imagening oxirgi yuklashida yuklangan baytlar (engine tarixidan)"""
+        for entry in reversed(self.pull_engine.get_history()):
+            if entry['image'] == image:
+                return entry['downloaded_bytes']
+        return 0
+        
+    def _charge(self, downloaded: int, started: float):
+        """Yuklangan baytlarni tezlik chegarasiga hisoblash
+        
+        Qatlamlarni daemonning o'zi yuklaydi, klient oqimni sekinlashtira
+        olmaydi - shuning uchun o'rtacha tezlik yuklashlar orasidagi
+        tanaffus bilan ushlab turiladi.
+        """
+        if self.max_bandwidth <= 0:
+            return
+        with self.lock:
+            self.not_before = max(self.not_before, started) + downloaded / self.max_bandwidth
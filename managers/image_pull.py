@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Image Pull - Docker imagelarini parallel va takrorlanmasdan yuklab olish
+
+Bir vaqtda ko'pi bilan max_concurrent ta image yuklanadi. Bir xil
+image:tag uchun ikkinchi so'rov yangi yuklash boshlamaydi - mavjud
+yuklashga obuna bo'ladi va uning jarayonini oladi. Har bir yuklashning
+qatlamlari, jami va yuklangan baytlari, tezligi kuzatiladi.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+import docker
+
+# Parallel yuklashlar soni
+MAX_CONCURRENT_PULLS = 2
+# Tugagan yuklashlar statistikasi shuncha saqlanadi
+PULL_HISTORY_SIZE = 50
+# Docker Hub nomlari - image kalitidan olib tashlanadi ("docker.io/nginx" = "nginx")
+DOCKER_HUB_PREFIXES = ("docker.io/", "index.docker.io/", "registry-1.docker.io/")
+# Docker Hub rasmiy imagelari nomlar fazosi ("library/nginx" = "nginx")
+OFFICIAL_NAMESPACE = "library/"
+
+class PullTask:
+    def __init__(self, image: str):
+        self.image = image
+        # qatlam ID -> {'status', 'current', 'total'}
+        self.layers: Dict[str, Dict] = {}
+        self.queued = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.result: Optional[bool] = None
+        self.done = threading.Event()
+        self.message = "Navbatda"
+        # Obunachilar: (progress_callback, cancel_event)
+        self.subscribers: List[tuple] = []
+        
+    @property
+    def total_bytes(self) -> int:
+        """Hajmi ma'lum qatlamlarning jami (siqilgan) baytlari"""
+        return sum(layer['total'] or 0 for layer in list(self.layers.values()))
+        
+    @property
+    def downloaded_bytes(self) -> int:
+        return sum(layer['current'] for layer in list(self.layers.values()) if layer['total'])
+        
+    @property
+    def progress(self) -> Optional[float]:
+        total = self.total_bytes
+        return self.downloaded_bytes / total if total else None
+        
+    def throughput(self) -> float:
+        """O'rtacha yuklash tezligi (bayt/s)"""
+        if self.started is None:
+            return 0.0
+        elapsed = (self.finished or time.time()) - self.started
+        return self.downloaded_bytes / elapsed if elapsed > 0 else 0.0
+        
+    def is_set(self) -> bool:
+        """Umumiy bekor qilish (cancel_event o'rnida) - barcha obunachilar
+        bekor qilgan yoki kutishni to'xtatgan bo'lsa True"""
+        return all(
+            cancel_event is not None and cancel_event.is_set() for _, cancel_event in list(self.subscribers)
+        )
+        
+    def summary(self) -> str:
+        """"3/7 qatlam, 120.5/300.0 MB, 10.2 MB/s" ko'rinishidagi holat"""
+        layers = list(self.layers.values())
+        finished = sum(1 for layer in layers if layer['status'] in ('Pull complete', 'Already exists'))
+        mb = 1024 * 1024
+        return (f"{finished}/{len(layers)} qatlam, {self.downloaded_bytes / mb:.1f}/"
+                f"{self.total_bytes / mb:.1f} MB, {self.throughput() / mb:.1f} MB/s")
+
+
+class ImagePullEngine:
+    def __init__(self, docker_manager, max_concurrent: int = MAX_CONCURRENT_PULLS):
+        self.docker_manager = docker_manager
+        self.slots = threading.BoundedSemaphore(max(1, max_concurrent))
+        self.lock = threading.Lock()
+        # image:tag -> bajarilayotgan yoki navbatdagi yuklash
+        self.in_flight: Dict[str, PullTask] = {}
+        self.history: deque = deque(maxlen=PULL_HISTORY_SIZE)
+        
+    def normalize(self, image_name: str) -> str:
+        """Bitta imagening turli yozilishlari bitta kalitga keltiriladi
+        
+        "nginx", "nginx:latest", "library/nginx" va "docker.io/library/nginx"
+        - barchasi "nginx:latest". Boshqa registrylar o'zgarishsiz qoladi.
+        """
+        repository, tag = docker.utils.parse_repository_tag(image_name.strip())
+        for prefix in DOCKER_HUB_PREFIXES:
+            if repository.startswith(prefix):
+                repository = repository[len(prefix):]
+                break
+        if repository.startswith(OFFICIAL_NAMESPACE) and repository.count('/') == 1:
+            repository = repository[len(OFFICIAL_NAMESPACE):]
+        # Digest bilan berilgan image ("nginx@sha256:...") tag emas
+        separator = '@' if tag and ':' in tag else ':'
+        return f"{repository}{separator}{tag or 'latest'}"
+        
+    def pull(self, image_name: str, progress_callback: Optional[Callable] = None,
+             cancel_event: Optional[threading.Event] = None) -> bool:
+        """Imageni yuklab olish (bloklovchi, fon threadidan chaqiriladi)
+        
+        Shu image allaqachon yuklanayotgan bo'lsa o'sha yuklash kutiladi.
+        progress_callback(progress, message) job.set_progress bilan mos.
+        Obunachi bekor qilsa darhol False qaytadi, yuklash esa boshqa
+        obunachilar uchun davom etadi.
+        """
+        key = self.normalize(image_name)
+        subscriber = (progress_callback, cancel_event)
+        with self.lock:
+            task = self.in_flight.get(key)
+            owner = task is None
+            if owner:
+                task = self.in_flight[key] = PullTask(key)
+            task.subscribers.append(subscriber)
+            
+        if owner:
+            threading.Thread(target=self._run, args=(task,), daemon=True).start()
+        elif progress_callback is not None:
+            progress_callback(task.progress, f"Boshqa so'rov bilan birga yuklanmoqda: {task.summary()}")
+            
+        try:
+            while not task.done.wait(0.2):
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+            return bool(task.result)
+        finally:
+            with self.lock:
+                if subscriber in task.subscribers:
+                    task.subscribers.remove(subscriber)
+                    
+    def _run(self, task: PullTask):
+        """Slot bo'shashini kutib yuklashni bajarish"""
+        try:
+            while not self.slots.acquire(timeout=0.2):
+                if task.is_set():
+                    task.result = False
+                    return
+                    
+            def on_layer(layer_id, layer):
+                task.layers[layer_id] = layer
+                
+            try:
+                task.started = time.time()
+                task.result = self.docker_manager.pull_image(
+                    task.image,
+                    progress_callback=lambda progress, message: self._notify(task, message),
+                    cancel_event=task,
+                    layer_callback=on_layer
+                )
+            finally:
+                self.slots.release()
+        except Exception as e:
+            print(f"Image yuklab olishda xatolik ({task.image}): {str(e)}")
+            task.result = False
+        finally:
+            task.finished = time.time()
+            with self.lock:
+                if self.in_flight.get(task.image) is task:
+                    del self.in_flight[task.image]
+                if task.started is not None:
+                    self.history.append({
+                        'image': task.image,
+                        'result': task.result,
+                        'total_bytes': task.total_bytes,
+                        'downloaded_bytes': task.downloaded_bytes,
+                        'duration': task.finished - task.started,
+                        'throughput': task.throughput(),
+                    })
+            task.done.set()
+            
+    def _notify(self, task: PullTask, message: str):
+        """Barcha obunachilarga umumiy jarayonni yuborish"""
+        task.message = message
+        progress = task.progress
+        text = f"{task.summary()} - {message}" if message else task.summary()
+        for callback, _ in list(task.subscribers):
+            if callback is not None:
+                callback(progress, text)
+                
+    def get_active(self) -> List[PullTask]:
+        """Navbatdagi va bajarilayotgan yuklashlar"""
+        with self.lock:
+            return list(self.in_flight.values())
+            
+    def get_history(self) -> List[Dict]:
+        """Tugagan yuklashlar: image, natija, baytlar, davomiylik, tezlik"""
+        with self.lock:
+            return list(self.history)
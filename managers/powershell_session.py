@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PowerShell Session - Doimiy PowerShell jarayonlari puli
+
+Har bir buyruq uchun yangi powershell.exe ishga tushirish o'rniga bir nechta
+uzoq yashovchi jarayon stdin orqali buyruq qabul qiladi va natijani bitta
+JSON qatori (frame) ko'rinishida qaytaradi.
+
+Protokol (har biri bitta qator):
+    so'rov:  {"id": 1, "script": "<base64 UTF-8 skript>"}
+    javob:   <<PSFRAME>>{"id": 1, "ok": true, "stdout": "...", "stderr": "..."}
+"""
+
+import base64
+import json
+import queue
+import subprocess
+import threading
+from typing import List, Optional
+
+FRAME_MARKER = "<<PSFRAME>>"
+
+# Jarayon ichida ishlaydigan xizmat tsikli
+HOST_SCRIPT = r"""
+$ErrorActionPreference = 'Continue'
+$ProgressPreference = 'SilentlyContinue'
+[Console]::OutputEncoding = [System.Text.Encoding]::UTF8
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($line -eq $null) { break }
+    if ($line.Trim() -eq '') { continue }
+    $request = $line | ConvertFrom-Json
+    $script = [System.Text.Encoding]::UTF8.GetString([System.Convert]::FromBase64String($request.script))
+    $ok = $true
+    $errors = ''
+    $output = ''
+    try {
+        # Har bir so'rov yangi child scope da - o'zgaruvchilar, funksiyalar va
+        # $ErrorActionPreference keyingi so'rovlarga o'tmaydi
+        $output = & ([scriptblock]::Create($script)) 2>&1 | ForEach-Object {
+            if ($_ -is [System.Management.Automation.ErrorRecord]) {
+                $ok = $false
+                $errors += $_.ToString() + "`n"
+            } else {
+                $_
+            }
+        } | Out-String
+    } catch {
+        $ok = $false
+        $errors += $_.ToString()
+    }
+    $response = @{ id = $request.id; ok = $ok; stdout = $output; stderr = $errors } | ConvertTo-Json -Compress
+    [Console]::Out.WriteLine('<<PSFRAME>>' + $response)
+    [Console]::Out.Flush()
+}
+"""
+
+
+def default_host_command() -> List[str]:
+    """Standart PowerShell xizmat jarayoni buyrug'i"""
+    encoded = base64.b64encode(HOST_SCRIPT.encode("utf-16-le")).decode("ascii")
+    return ["powershell", "-NoLogo", "-NoProfile", "-NonInteractive",
+            "-EncodedCommand", encoded]
+
+
+class PowerShellResult:
+    """subprocess.CompletedProcess ga o'xshash natija"""
+    
+    def __init__(self, returncode: int, stdout: str = "", stderr: str = ""):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+class PowerShellSession:
+    """Bitta uzoq yashovchi PowerShell jarayoni"""
+    
+    def __init__(self, command: Optional[List[str]] = None):
+        self.command = command or default_host_command()
+        self.process = None
+        self.responses = queue.Queue()
+        self.next_id = 0
+        self.lock = threading.Lock()
+        
+    def start(self):
+        """Jarayonni ishga tushirish"""
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1
+        )
+        self.responses = queue.Queue()
+        threading.Thread(target=self._read_loop, args=(self.process, self.responses),
+                         daemon=True).start()
+                         
+    def _read_loop(self, process, responses):
+        """stdout dan frame qatorlarini o'qish"""
+        try:
+            for line in process.stdout:
+                if line.startswith(FRAME_MARKER):
+                    try:
+                        responses.put(json.loads(line[len(FRAME_MARKER):]))
+                    except json.JSONDecodeError:
+                        continue
+        except Exception:
+            pass
+        # Jarayon tugadi - kutayotgan chaqiruvchini uyg'otish
+        responses.put(None)
+        
+    def is_alive(self) -> bool:
+        """Jarayon ishlayotganini tekshirish"""
+        return self.process is not None and self.process.poll() is None
+        
+    def stop(self):
+        """Jarayonni to'xtatish"""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+        except Exception:
+            pass
+        try:
+            self.process.kill()
+            self.process.wait(timeout=5)
+        except Exception:
+            pass
+        self.process = None
+        
+    def run(self, script: str, timeout: float = 30) -> PowerShellResult:
+        """Skriptni bajarish; timeout yoki crash bo'lsa jarayon qayta yaratiladi"""
+        with self.lock:
+            if not self.is_alive():
+                self.stop()
+                self.start()
+                
+            self.next_id += 1
+            request_id = self.next_id
+            payload = base64.b64encode(script.encode("utf-8")).decode("ascii")
+            
+            try:
+                self.process.stdin.write(json.dumps({"id": request_id, "script": payload}) + "\n")
+                self.process.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                self.stop()
+                return PowerShellResult(1, "", f"PowerShell jarayoni yopildi: {str(e)}")
+                
+            while True:
+                try:
+                    response = self.responses.get(timeout=timeout)
+                except queue.Empty:
+                    # Osilib qolgan jarayonni o'ldirish, keyingi chaqiruvda qayta ishga tushadi
+                    self.stop()
+                    return PowerShellResult(1, "", f"PowerShell buyrug'i {timeout} soniyada tugamadi")
+                    
+                if response is None:
+                    self.stop()
+                    return PowerShellResult(1, "", "PowerShell jarayoni kutilmaganda tugadi")
+                    
+                # Oldingi (timeout bo'lgan) so'rovlarning kechikkan javoblarini tashlab yuborish
+                if response.get("id") != request_id:
+                    continue
+                    
+                return PowerShellResult(
+                    0 if response.get("ok") else 1,
+                    response.get("stdout") or "",
+                    response.get("stderr") or ""
+                )
+
+
+class PowerShellPool:
+    """PowerShell sessiyalari puli - so'rovlar bo'sh sessiya kelguncha navbatda kutadi"""
+    
+    def __init__(self, size: int = 2, command: Optional[List[str]] = None):
+        self.size = max(1, size)
+        self.command = command
+        self.idle = queue.Queue()
+        self.created = 0
+        self.lock = threading.Lock()
+        self.closed = False
+        
+    def _acquire(self, timeout: float) -> Optional[PowerShellSession]:
+        """Bo'sh sessiyani olish yoki yangisini yaratish"""
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+            
+        with self.lock:
+            if self.created < self.size:
+                self.created += 1
+                return PowerShellSession(self.command)
+                
+        try:
+            return self.idle.get(timeout=timeout)
+        except queue.Empty:
+            return None
+            
+    def run(self, script: str, timeout: float = 30) -> PowerShellResult:
+        """Skriptni puldagi sessiyada bajarish"""
+        if self.closed:
+            return PowerShellResult(1, "", "PowerShell puli yopilgan")
+            
+        session = self._acquire(timeout)
+        if session is None:
+            return PowerShellResult(1, "", "Bo'sh PowerShell sessiyasi topilmadi")
+            
+        try:
+            return session.run(script, timeout)
+        finally:
+            if self.closed:
+                session.stop()
+            else:
+                self.idle.put(session)
+                
+    def close(self):
+        """Barcha sessiyalarni yopish"""
+        self.closed = True
+        while True:
+            try:
+                self.idle.get_nowait().stop()
+            except queue.Empty:
+                break
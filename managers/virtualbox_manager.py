@@ -8,52 +8,114 @@ import subprocess
 import json
 import os
 import re
+import threading
 from typing import List, Dict, Optional
+from utils.discovery_cache import DiscoveryCache, NEGATIVE_RESULT_TTL, resolve_binary
 
 class VirtualBoxManager:
-    def __init__(self):
-        self.vboxmanage_path = self.find_vboxmanage()
-        self.is_available_flag = self.check_availability()
+    # "list -l vms" holatlari -> showvminfo --machinereadable VMState qiymatlari
+    LONG_STATE_MAP = {
+        "powered off": "poweroff",
+        "stuck": "gurumeditation",
+        "deleting snapshot online": "deletingsnapshotlive",
+        "deleting snapshot paused": "deletingsnapshotlivepaused",
+    }
+    
+    POSSIBLE_PATHS = [
+        "VBoxManage",
+        r"C:\Program Files\Oracle\VirtualBox\VBoxManage.exe",
+        r"C:\Program Files (x86)\Oracle\VirtualBox\VBoxManage.exe",
+        "/usr/bin/VBoxManage",
+        "/usr/local/bin/VBoxManage"
+    ]
+    
+    CACHE_KEY = "virtualbox"
+    
+    # "metrics setup" bazaviy metrikalari va "metrics query" da o'qiladiganlari
+    METRICS_SETUP = "CPU/Load,RAM/Usage,Net/Rate"
+    METRICS_QUERY = "CPU/Load/User,CPU/Load/Kernel,RAM/Usage/Used,Net/Rate/Rx,Net/Rate/Tx"
+    # Qiymat birliklari -> baytga ko'paytiruvchi
+    METRIC_UNITS = {"B": 1, "kB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3,
+                    "B/s": 1, "kB/s": 1024, "MB/s": 1024 ** 2}
+    
+    def __init__(self, discovery_cache: Optional[DiscoveryCache] = None, background: bool = False):
+        self.discovery_cache = discovery_cache or DiscoveryCache()
+        self.vboxmanage_path = None
+        self.version = None
+        self.is_available_flag = False
+        self.ready = threading.Event()
+        # VM nomi -> UUID, har bir get_vms() chaqiruvida yangilanadi
+        self.uuid_index: Dict[str, str] = {}
+        
+        # Kesh binar fayl o'zgarmagan bo'lsa subprocesssiz ishlatiladi
+        entry = self.discovery_cache.get(self.CACHE_KEY)
+        if entry is not None:
+            self.apply_discovery(entry.get('path'), entry.get('version'))
+        elif background:
+            threading.Thread(target=self.probe, daemon=True).start()
+        else:
+            self.probe()
+            
+    def probe(self):
+        """VBoxManage ni qidirish, versiyasini tekshirish va keshga yozish"""
+        try:
+            path = self.find_vboxmanage()
+            version = self.get_version(path) if path else None
+            if version is None:
+                path = None
+            self.discovery_cache.set(self.CACHE_KEY, path, ttl=None if path else NEGATIVE_RESULT_TTL,
+                                     version=version, candidates=self.POSSIBLE_PATHS)
+            self.apply_discovery(path, version)
+        finally:
+            self.ready.set()
+            
+    def apply_discovery(self, path: Optional[str], version: Optional[str]):
+        """Aniqlash natijasini qo'llash"""
+        self.vboxmanage_path = path
+        self.version = version
+        self.is_available_flag = bool(path)
+        self.ready.set()
+        
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Fon tekshiruvi tugashini kutish"""
+        return self.ready.wait(timeout)
         
     def find_vboxmanage(self) -> str:
-        """VBoxManage yo'lini topish"""
-        possible_paths = [
-            "VBoxManage",
-            r"C:\Program Files\Oracle\VirtualBox\VBoxManage.exe",
-            r"C:\Program Files (x86)\Oracle\VirtualBox\VBoxManage.exe",
-            "/usr/bin/VBoxManage",
-            "/usr/local/bin/VBoxManage"
-        ]
+        """VBoxManage yo'lini topish (faqat mavjud fayllar, subprocesssiz)"""
+        for path in self.POSSIBLE_PATHS:
+            resolved = resolve_binary(path)
+            if resolved:
+                return resolved
         
-        for path in possible_paths:
-            try:
-                result = subprocess.run([path, "--version"], 
-                                      capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    return path
-            except:
-                continue
-                
         return None
         
-    def check_availability(self) -> bool:
-        """VirtualBox mavjudligini tekshirish"""
-        if not self.vboxmanage_path:
-            return False
-            
+    def get_version(self, path: str) -> Optional[str]:
+        """VBoxManage --version natijasi (ishlamasa None)"""
         try:
-            result = subprocess.run([self.vboxmanage_path, "--version"], 
+            result = subprocess.run([path, "--version"],
                                   capture_output=True, text=True, timeout=5)
-            return result.returncode == 0
+            if result.returncode == 0:
+                return result.stdout.strip()
         except:
-            return False
+            pass
+                
+        return None
+        
+    def check_availability(self) -> bool:
+        """VirtualBox mavjudligini qayta tekshirish (keshni yangilaydi)"""
+        self.probe()
+        return self.is_available_flag
             
     def is_available(self) -> bool:
         """VirtualBox mavjudligini tekshirish"""
         return self.is_available_flag
         
-    def get_vms(self) -> List[Dict]:
-        """Barcha virtual mashinalarni olish"""
+    def get_vms(self, bulk: bool = True) -> List[Dict]:
+        """Barcha virtual mashinalarni olish
+        
+        bulk=True bo'lsa barcha VMlar holati bitta "list -l vms" chaqiruvi
+        bilan olinadi, aks holda har bir VM uchun alohida showvminfo ishlaydi.
+        """
         if not self.is_available():
             return []
             
@@ -66,6 +128,7 @@ class VirtualBoxManager:
                 
             vms = []
             lines = result.stdout.strip().split('\n')
+            bulk_info = self.get_all_vm_info() if bulk else {}
             
             for line in lines:
                 if line.strip():
@@ -73,7 +136,9 @@ class VirtualBoxManager:
                     match = re.match(r'^"([^"]+)"\s+{([^}]+)}$', line.strip())
                     if match:
                         name, uuid = match.groups()
-                        vm_info = self.get_vm_info(uuid)
+                        vm_info = bulk_info.get(uuid)
+                        if vm_info is None:
+                            vm_info = self.get_vm_info(uuid)
                         vms.append({
                             'name': name,
                             'uuid': uuid,
@@ -82,12 +147,37 @@ class VirtualBoxManager:
                             'cpus': vm_info.get('cpus', 'Unknown')
                         })
                         
+            self.uuid_index = {vm['name']: vm['uuid'] for vm in vms}
             return vms
             
         except Exception as e:
             print(f"VMlarni olishda xatolik: {str(e)}")
             return []
             
+    def get_vm_uuid(self, vm_name: str) -> Optional[str]:
+        """VM nomidan UUID olish - indeksda bo'lmasa bitta showvminfo chaqiriladi"""
+        vm_uuid = self.uuid_index.get(vm_name)
+        if vm_uuid or not self.is_available():
+            return vm_uuid
+            
+        try:
+            result = subprocess.run([self.vboxmanage_path, "showvminfo", vm_name, "--machinereadable"],
+                                  capture_output=True, text=True, timeout=10)
+                                  
+            if result.returncode != 0:
+                return None
+                
+            for line in result.stdout.split('\n'):
+                if line.startswith('UUID='):
+                    vm_uuid = line.split('=', 1)[1].strip().strip('"')
+                    self.uuid_index[vm_name] = vm_uuid
+                    return vm_uuid
+                    
+        except Exception as e:
+            print(f"VM UUID ni olishda xatolik: {str(e)}")
+            
+        return None
+            
     def get_vm_info(self, uuid: str) -> Dict:
         """VM haqida batafsil ma'lumot olish"""
         if not self.is_available():
@@ -120,6 +210,133 @@ class VirtualBoxManager:
             print(f"VM ma'lumotlarini olishda xatolik: {str(e)}")
             return {}
             
+    def get_all_vm_info(self) -> Dict[str, Dict]:
+        """Barcha VMlar ma'lumotini bitta "list -l vms" chaqiruvi bilan olish
+        
+        Natija UUID bo'yicha kalitlangan, qiymatlari get_vm_info() bilan bir xil
+        formatda. Xatolik bo'lsa bo'sh lug'at qaytariladi.
+        """
+        if not self.is_available():
+            return {}
+            
+        try:
+            result = subprocess.run([self.vboxmanage_path, "list", "-l", "vms"],
+                                  capture_output=True, text=True, timeout=60)
+                                  
+            if result.returncode != 0:
+                return {}
+                
+            return self.parse_long_vm_list(result.stdout)
+            
+        except Exception as e:
+            print(f"VMlar ma'lumotlarini olishda xatolik: {str(e)}")
+            return {}
+            
+    def parse_long_vm_list(self, output: str) -> Dict[str, Dict]:
+        """"list -l vms" chiqishini UUID -> ma'lumot ko'rinishiga keltirish"""
+        vms_info = {}
+        info = None
+        
+        for line in output.split('\n'):
+            if ':' not in line:
+                continue
+                
+            key, value = line.split(':', 1)
+            value = value.strip()
+            
+            # Har bir VM bloki "UUID:" qatori bilan aniqlanadi
+            # ("Hardware UUID:" va boshqalar qator boshida emas)
+            if key == 'UUID':
+                info = vms_info.setdefault(value, {})
+            elif info is None:
+                continue
+            elif key == 'Memory size' and 'memory' not in info:
+                info['memory'] = f"{value.upper().replace('MB', '').strip()} MB"
+            elif key == 'Number of CPUs' and 'cpus' not in info:
+                info['cpus'] = value
+            elif key == 'State' and 'state' not in info:
+                # "powered off (since 2024-01-01T00:00:00.000000000)" -> "poweroff"
+                state = value.split('(')[0].strip().lower()
+                info['state'] = self.LONG_STATE_MAP.get(state, state.replace(' ', ''))
+                
+        return vms_info
+        
+    def setup_metrics(self, period: int = 1) -> bool:
+        """Barcha ishlayotgan VMlar uchun metrika yig'ishni yoqish
+        
+        Sozlama faqat shu paytda mavjud obyektlarga qo'llanadi - yangi VM
+        ishga tushganda qayta chaqirilishi kerak.
+        """
+        if not self.is_available():
+            return False
+            
+        try:
+            result = subprocess.run([self.vboxmanage_path, "metrics", "setup", "--period", str(period),
+                                   "--samples", "1", "*", self.METRICS_SETUP],
+                                  capture_output=True, text=True, timeout=10)
+            return result.returncode == 0
+            
+        except Exception as e:
+            print(f"Metrikalarni sozlashda xatolik: {str(e)}")
+            return False
+            
+    def query_metrics(self) -> Dict[str, Dict]:
+        """Barcha VMlar metrikalari bitta "metrics query" chaqiruvida
+        
+        Natija: VM nomi -> {'cpu': %, 'memory': bayt, 'net_rx': bayt/s, 'net_tx': bayt/s}
+        """
+        if not self.is_available():
+            return {}
+            
+        try:
+            result = subprocess.run([self.vboxmanage_path, "metrics", "query", "*", self.METRICS_QUERY],
+                                  capture_output=True, text=True, timeout=10)
+            if result.returncode != 0:
+                return {}
+            return self.parse_metrics(result.stdout)
+            
+        except Exception as e:
+            print(f"Metrikalarni olishda xatolik: {str(e)}")
+            return {}
+            
+    def parse_metrics(self, output: str) -> Dict[str, Dict]:
+        """"metrics query" jadvalini parse qilish
+        
+        Qator: <obyekt> <metrika> <qiymat[, qiymat...]>. Obyekt nomida
+        bo'sh joy bo'lishi mumkin, metrika nomida esa "/" bor.
+        """
+        fields = {
+            "CPU/Load/User": "cpu",
+            "CPU/Load/Kernel": "cpu",
+            "RAM/Usage/Used": "memory",
+            "Net/Rate/Rx": "net_rx",
+            "Net/Rate/Tx": "net_tx",
+        }
+        metrics: Dict[str, Dict] = {}
+        
+        for line in output.split('\n'):
+            match = re.match(r'^(.+?)\s+(\S+/\S+)\s+(.+)$', line.strip())
+            if not match or match.group(2) not in fields:
+                continue
+            name, metric, values = match.groups()
+            # --samples 1 bo'lsa bitta qiymat, aks holda oxirgisi olinadi
+            value = values.split(',')[-1].strip()
+            number = re.match(r'^([\d.]+)\s*(\S*)$', value)
+            if not number:
+                continue
+            amount = float(number.group(1))
+            unit = number.group(2)
+            if unit != '%':
+                amount *= self.METRIC_UNITS.get(unit, 1)
+                
+            field = fields[metric]
+            sample = metrics.setdefault(name, {})
+            sample[field] = sample.get(field, 0) + amount
+            
+        # "host" obyekti VM emas
+        metrics.pop("host", None)
+        return metrics
+            
     def start_vm(self, uuid: str) -> bool:
         """VMni ishga tushirish"""
         if not self.is_available():
@@ -296,6 +513,20 @@ class VirtualBoxManager:
             print(f"VM qayta ishga tushirishda xatolik: {str(e)}")
             return False
             
+    def remove_vm(self, uuid: str) -> bool:
+        """VMni VirtualBox ro'yxatidan o'chirish (disk fayllari saqlanib qoladi)"""
+        if not self.is_available():
+            return False
+            
+        try:
+            result = subprocess.run([self.vboxmanage_path, "unregistervm", uuid],
+                                  capture_output=True, text=True, timeout=30)
+            return result.returncode == 0
+            
+        except Exception as e:
+            print(f"VMni o'chirishda xatolik: {str(e)}")
+            return False
+            
     def get_vm_hard_disks(self, uuid: str) -> List[Dict]:
         """VM hard disk ma'lumotlarini olish"""
         if not self.is_available():
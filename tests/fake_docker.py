@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fake Docker - Unix socketda ishlaydigan soxta Docker Engine API
+
+Testlar uchun docker-py ishlatadigan endpointlarning kichik qismi:
+/_ping, /version, /containers/json, /containers/{id}/json, /images/json,
+/events (oqim), /containers/{id}/logs (oqim), /images/create (pull oqimi),
+*/prune va konteyner amallari. Har bir
+so'rov state.requests ga yoziladi, state.delay barcha javoblarni sekinlashtiradi.
+"""
+
+import json
+import os
+import queue
+import re
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import docker
+
+API_VERSION = "1.41"
+
+# Oqim tugashini bildiruvchi belgi (state.events / state.logs navbatiga qo'yiladi)
+END_OF_STREAM = None
+
+
+def socket_path(name: str = "docker.sock") -> str:
+    """Qisqa socket yo'li - AF_UNIX yo'li 108 belgidan oshmasligi kerak"""
+    return os.path.join(tempfile.mkdtemp(prefix="fd"), name)
+
+
+class FakeDockerState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.containers: Dict[str, Dict] = {}
+        self.images: Dict[str, Dict] = {}
+        # (method, yo'l, query) - versiya prefiksisiz
+        self.requests: List[tuple] = []
+        # Har bir javobdan oldin kutish (soniya)
+        self.delay = 0.0
+        # /version javobidagi API versiyasi
+        self.api_version = API_VERSION
+        self.events = queue.Queue()
+        # Logs so'rovida darhol yuboriladigan qatorlar, follow rejimidagilari navbatdan
+        self.log_lines: List[str] = []
+        self.logs = queue.Queue()
+        # Pull oqimi qatlam yuklanayotganda shu event o'rnatilguncha to'xtab turadi
+        self.pull_gate = threading.Event()
+        self.pull_gate.set()
+        
+    def add_image(self, tag: str, size: int = 100 * 1024 * 1024) -> str:
+        image_id = "sha256:" + f"{len(self.images) + 1:064x}"
+        self.images[image_id] = {
+            "Id": image_id, "RepoTags": [tag], "RepoDigests": [], "Size": size,
+            "SharedSize": -1, "VirtualSize": size, "Created": 1700000000,
+            "Containers": -1, "Labels": {}, "ParentId": ""
+        }
+        return image_id
+        
+    def add_container(self, name: str, image_id: str, state: str = "running") -> str:
+        container_id = f"{len(self.containers) + 1:012x}" + "c" * 52
+        self.containers[container_id] = {
+            "Id": container_id, "Names": ["/" + name], "ImageID": image_id,
+            "Image": (self.images.get(image_id) or {}).get("RepoTags", [image_id])[0],
+            "State": state, "Status": state, "Created": 1700000000 + len(self.containers),
+            "Ports": [], "Labels": {}
+        }
+        return container_id
+        
+    def find_container(self, ref: str) -> Optional[Dict]:
+        for container_id, container in self.containers.items():
+            if container_id.startswith(ref) or container["Names"][0] == "/" + ref:
+                return container
+        return None
+        
+    def emit(self, event_type: str, action: str, actor_id: str, **attributes):
+        """/events oqimiga hodisa yuborish"""
+        self.events.put({
+            "Type": event_type, "Action": action, "time": int(time.time()),
+            "Actor": {"ID": actor_id, "Attributes": attributes}
+        })
+        
+    def count(self, method: str, path: str) -> int:
+        """Shu yo'lga yuborilgan so'rovlar soni"""
+        return sum(1 for request in self.requests if request[0] == method and request[1] == path)
+
+
+def make_handler(state: FakeDockerState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        
+        def log_message(self, *args):
+            pass
+            
+        def address_string(self):
+            return "fake-docker"
+            
+        def parse(self, method):
+            url = urlparse(self.path)
+            path = re.sub(r"^/v[0-9.]+", "", url.path)
+            state.requests.append((method, path, url.query))
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+            if state.delay:
+                time.sleep(state.delay)
+            return path, parse_qs(url.query)
+            
+        def send_json(self, data, code=200):
+            body = json.dumps(data).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            
+        def send_empty(self, code=204):
+            self.send_response(code)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            
+        def start_chunked(self, content_type):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            
+        def chunk(self, data: bytes):
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+            
+        def stream_queue(self, source: queue.Queue, encode):
+            """Navbatdagi yozuvlarni END_OF_STREAM kelguncha yoki mijoz uzilguncha yuborish"""
+            try:
+                while True:
+                    try:
+                        item = source.get(timeout=0.2)
+                    except queue.Empty:
+                        # Mijoz ulanishni yopgan bo'lsa yozish xatolik beradi
+                        self.wfile.flush()
+                        continue
+                    if item is END_OF_STREAM:
+                        self.chunk(b"")
+                        return
+                    self.chunk(encode(item))
+            except (BrokenPipeError, ConnectionResetError, OSError):
+                self.close_connection = True
+                
+        def do_GET(self):
+            path, query = self.parse("GET")
+            if path == "/_ping":
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"OK")
+                return
+            if path == "/version":
+                return self.send_json({"ApiVersion": state.api_version, "Version": "24.0.0"})
+            if path == "/containers/json":
+                show_all = query.get("all", ["0"])[0] in ("1", "true", "True")
+                return self.send_json([container for container in state.containers.values()
+                                       if show_all or container["State"] == "running"])
+            if path == "/images/json":
+                return self.send_json(list(state.images.values()))
+            match = re.match(r"^/images/(.+)/json$", path)
+            if match:
+                image = next((image for image in state.images.values()
+                              if match.group(1) in (image["Id"], image["Id"][7:]) or match.group(1) in image["RepoTags"]), None)
+                if image is None:
+                    return self.send_json({"message": f"No such image: {match.group(1)}"}, 404)
+                return self.send_json(image)
+            if path == "/events":
+                self.start_chunked("application/json")
+                return self.stream_queue(state.events, lambda event: json.dumps(event).encode() + b"\n")
+                
+            match = re.match(r"^/containers/([^/]+)/(json|logs)$", path)
+            container = state.find_container(match.group(1)) if match else None
+            if match and container is None:
+                return self.send_json({"message": f"No such container: {match.group(1)}"}, 404)
+            if match and match.group(2) == "json":
+                return self.send_json({
+                    "Id": container["Id"], "Name": container["Names"][0], "Image": container["ImageID"],
+                    "Created": "2023-11-14T22:13:20.000000000Z",
+                    "Config": {"Image": container["Image"], "Labels": {}, "Tty": False},
+                    "State": {"Status": container["State"], "Running": container["State"] == "running"},
+                    "HostConfig": {"Memory": 0, "NanoCpus": 0}, "NetworkSettings": {"Ports": {}}
+                })
+            if match:
+                # Multiplexed oqim: [stream, 0, 0, 0, uzunlik (4 bayt)] + ma'lumot
+                frame = lambda text: bytes([1, 0, 0, 0]) + len(text.encode()).to_bytes(4, "big") + text.encode()
+                self.start_chunked("application/vnd.docker.raw-stream")
+                for line in state.log_lines:
+                    self.chunk(frame(line))
+                if query.get("follow", ["0"])[0] in ("1", "true", "True"):
+                    return self.stream_queue(state.logs, frame)
+                self.chunk(b"")
+                return
+            self.send_json({"message": f"page not found: {path}"}, 404)
+            
+        def do_POST(self):
+            path, query = self.parse("POST")
+            if path == "/images/create":
+                return self.pull_image(query["fromImage"][0] + ":" + query.get("tag", ["latest"])[0])
+            match = re.match(r"^/(containers|images|volumes|build)/prune$", path)
+            if match:
+                return self.send_json(self.prune(match.group(1), query))
+            match = re.match(r"^/containers/([^/]+)/(start|stop|restart|pause|unpause)$", path)
+            container = state.find_container(match.group(1)) if match else None
+            if container is None:
+                return self.send_json({"message": f"page not found: {path}"}, 404)
+            container["State"] = {"start": "running", "restart": "running", "unpause": "running",
+                                  "stop": "exited", "pause": "paused"}[match.group(2)]
+            self.send_empty()
+            
+        def pull_image(self, image: str):
+            """Bitta qatlamli pull oqimi - tugagach image ro'yxatga qo'shiladi"""
+            send = lambda event: self.chunk(json.dumps(event).encode() + b"\r\n")
+            self.start_chunked("application/json")
+            try:
+                send({"status": f"Pulling from {image}", "id": image.split(":")[-1]})
+                send({"status": "Downloading", "id": "layer1",
+                      "progressDetail": {"current": 500, "total": 1000}})
+                while not state.pull_gate.wait(0.1):
+                    self.wfile.flush()
+                send({"status": "Download complete", "id": "layer1"})
+                send({"status": "Pull complete", "id": "layer1"})
+                send({"status": f"Status: Downloaded newer image for {image}"})
+                if not any(image in known["RepoTags"] for known in state.images.values()):
+                    state.add_image(image)
+                self.chunk(b"")
+            except (BrokenPipeError, ConnectionResetError, OSError):
+                self.close_connection = True
+                
+        def prune(self, kind: str, query) -> Dict:
+            """To'xtagan konteynerlar va ishlatilmayotgan imagelarni o'chirish"""
+            if kind == "containers":
+                deleted = [container_id for container_id, container in state.containers.items()
+                           if container["State"] not in ("running", "paused", "restarting")]
+                for container_id in deleted:
+                    del state.containers[container_id]
+                return {"ContainersDeleted": deleted, "SpaceReclaimed": 0}
+            if kind == "images":
+                filters = json.loads(query.get("filters", ["{}"])[0])
+                dangling_only = filters.get("dangling") == ["true"]
+                used = {container["ImageID"] for container in state.containers.values()}
+                deleted = [image for image_id, image in state.images.items()
+                           if image_id not in used and (not dangling_only or not image["RepoTags"])]
+                for image in deleted:
+                    del state.images[image["Id"]]
+                return {"ImagesDeleted": [{"Deleted": image["Id"]} for image in deleted],
+                        "SpaceReclaimed": sum(image["Size"] for image in deleted)}
+            if kind == "volumes":
+                return {"VolumesDeleted": [], "SpaceReclaimed": 0}
+            return {"CachesDeleted": [], "SpaceReclaimed": 0}
+            
+        def do_DELETE(self):
+            path, query = self.parse("DELETE")
+            match = re.match(r"^/containers/([^/]+)$", path)
+            container = state.find_container(match.group(1)) if match else None
+            if container is None:
+                return self.send_json({"message": f"page not found: {path}"}, 404)
+            del state.containers[container["Id"]]
+            self.send_empty()
+            
+    return Handler
+
+
+class FakeDockerDaemon:
+    def __init__(self, path: str = None, state: FakeDockerState = None):
+        self.path = path or socket_path()
+        self.state = state or FakeDockerState()
+        self.server = None
+        
+    @property
+    def base_url(self) -> str:
+        return "unix://" + self.path
+        
+    def start(self) -> "FakeDockerDaemon":
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.server = ThreadingUnixServer(self.path, make_handler(self.state))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+        
+    def stop(self):
+        """Serverni yopish - ochiq oqimlar END_OF_STREAM bilan tugatiladi"""
+        self.state.events.put(END_OF_STREAM)
+        self.state.logs.put(END_OF_STREAM)
+        self.state.pull_gate.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server.close_connections()
+            self.server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+            
+    def client(self) -> docker.DockerClient:
+        return docker.DockerClient(base_url=self.base_url, version=API_VERSION, timeout=10)
+
+
+class ThreadingUnixServer(socketserver.ThreadingMixIn, getattr(socketserver, "UnixStreamServer", object)):
+    daemon_threads = True
+    
+    def get_request(self):
+        # Ochiq (keep-alive) ulanishlar to'xtatishda yopiladi - daemon o'chgani kabi
+        request = super().get_request()
+        self.connections = getattr(self, "connections", [])
+        self.connections.append(request[0])
+        return request
+        
+    def close_connections(self):
+        for connection in getattr(self, "connections", []):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+# Windows da socketserver.UnixStreamServer yo'q - Unix socket testlari o'tkazib yuboriladi
+UNIX_SOCKETS = hasattr(socketserver, "UnixStreamServer")
+
+
+def wait_until(predicate, timeout: float = 5.0, interval: float = 0.02) -> bool:
+    """predicate() True bo'lguncha kutish"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return predicate()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Discovery Cache testlari - salbiy natija muddati va parallel saqlash
+"""
+
+import json
+import sys
+import threading
+
+from utils import discovery_cache
+from utils.discovery_cache import DiscoveryCache, NEGATIVE_RESULT_TTL
+
+
+def test_negative_result_expires_although_binary_is_unchanged(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(discovery_cache.time, "time", lambda: now[0])
+    cache = DiscoveryCache(str(tmp_path / "cache.json"))
+    
+    cache.set("hyperv", sys.executable, ttl=NEGATIVE_RESULT_TTL, available=False)
+    cache.set("virtualbox", sys.executable, version="7.0")
+    assert cache.get("hyperv")['available'] is False
+    
+    now[0] += NEGATIVE_RESULT_TTL
+    assert cache.get("hyperv") is None
+    # Ijobiy natija faqat binar fayl o'zgarganda eskiradi
+    assert cache.get("virtualbox")['version'] == "7.0"
+
+
+def test_concurrent_sets_are_all_persisted(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = DiscoveryCache(str(path))
+    
+    def probe(key):
+        for index in range(50):
+            cache.set(key, None, value=index)
+            
+    threads = [threading.Thread(target=probe, args=(key,)) for key in ("virtualbox", "hyperv")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+        
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved["virtualbox"]["value"] == 49
+    assert saved["hyperv"]["value"] == 49
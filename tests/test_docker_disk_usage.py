@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docker Disk Usage testlari - tayyor /system/df javobi bo'yicha hisob-kitob
+
+Umumiy/alohida qatlamlar, dry-run qoidalari va tozalash tartibi
+(soxta Docker API bilan) tekshiriladi.
+"""
+
+import pytest
+
+from managers.docker_manager import DockerManager
+from tests.fake_docker import UNIX_SOCKETS, FakeDockerDaemon
+from utils.docker_disk_usage import DiskUsageAnalyzer, prune_selected
+from utils.job_manager import Job, JobCancelled
+
+NGINX = "sha256:" + "a" * 64
+REDIS = "sha256:" + "b" * 64
+DANGLING = "sha256:" + "c" * 64
+OLD = "sha256:" + "d" * 64
+ANONYMOUS_USED = "1" * 64
+ANONYMOUS_LABELLED = "cache"
+ANONYMOUS_UNKNOWN_SIZE = "2" * 64
+
+DF = {
+    "LayersSize": 220,
+    "Images": [
+        {"Id": NGINX, "RepoTags": ["nginx:latest"], "Size": 100, "SharedSize": 40},
+        {"Id": REDIS, "RepoTags": ["redis:7"], "Size": 80, "SharedSize": 40},
+        {"Id": DANGLING, "RepoTags": ["<none>:<none>"], "Size": 30, "SharedSize": -1},
+        {"Id": OLD, "RepoTags": ["old:1"], "Size": 50, "SharedSize": 0},
+    ],
+    "Containers": [
+        {"Id": "1" * 64, "Names": ["/web"], "ImageID": NGINX, "State": "running", "SizeRw": 10,
+         "Mounts": [{"Type": "volume", "Name": "data"}]},
+        {"Id": "2" * 64, "Names": ["/cache"], "ImageID": REDIS, "State": "exited", "SizeRw": 5,
+         "Mounts": [{"Type": "volume", "Name": ANONYMOUS_USED}]},
+        {"Id": "3" * 64, "Names": ["/worker"], "ImageID": NGINX, "State": "paused", "SizeRw": 1},
+    ],
+    "Volumes": [
+        {"Name": "data", "UsageData": {"Size": 100, "RefCount": 1}},
+        {"Name": ANONYMOUS_USED, "UsageData": {"Size": 20, "RefCount": 1}},
+        {"Name": ANONYMOUS_LABELLED, "Labels": {"com.docker.volume.anonymous": ""},
+         "UsageData": {"Size": 7, "RefCount": 0}},
+        {"Name": "backups", "UsageData": {"Size": 9, "RefCount": 0}},
+        {"Name": ANONYMOUS_UNKNOWN_SIZE, "UsageData": {"Size": -1, "RefCount": 0}},
+    ],
+    "BuildCache": [
+        {"ID": "build-private", "Size": 11, "InUse": False, "Shared": False},
+        {"ID": "build-shared", "Size": 13, "InUse": False, "Shared": True},
+        {"ID": "build-in-use", "Size": 17, "InUse": True, "Shared": False},
+    ],
+}
+
+
+def test_summary_splits_shared_and_unique_layers():
+    summary = DiskUsageAnalyzer(DF).summary()
+    assert summary["images"] == {"count": 4, "active": 2, "size": 220, "dangling": 1, "dangling_size": 30}
+    assert summary["layers"] == {"naive_total": 260, "on_disk": 220, "unique": 180, "shared": 40}
+    assert summary["containers"] == {"count": 3, "stopped": 1, "size": 16, "stopped_size": 5}
+    assert summary["volumes"] == {"count": 5, "size": 136, "unused": 3, "unused_size": 16, "named_unused": 1}
+    assert summary["build_cache"] == {"count": 3, "size": 28, "reclaimable": 11}
+
+
+def test_summary_without_layers_size_falls_back_to_image_sizes():
+    summary = DiskUsageAnalyzer(dict(DF, LayersSize=None)).summary()
+    assert summary["layers"] == {"naive_total": 260, "on_disk": 260, "unique": 180, "shared": 80}
+
+
+@pytest.mark.parametrize("categories, all_images, expected", [
+    # Faqat tegsiz va ishlatilmayotgan image
+    (["images"], False, {"images": (1, 30, ["cccccccccccc"])}),
+    # redis:7 to'xtagan konteynerda - konteynerlar tanlanmasa o'chmaydi
+    (["images"], True, {"images": (2, 80, ["cccccccccccc", "old:1"])}),
+    (["containers", "images"], True, {"containers": (1, 5, ["cache"]),
+                                      "images": (3, 120, ["redis:7", "cccccccccccc", "old:1"])}),
+    # Nomli volume (backups) API 1.42+ volume prune da o'chmaydi
+    (["volumes"], False, {"volumes": (2, 7, [ANONYMOUS_LABELLED, ANONYMOUS_UNKNOWN_SIZE[:12]])}),
+    (["containers", "volumes"], False, {
+        "containers": (1, 5, ["cache"]),
+        "volumes": (3, 27, [ANONYMOUS_USED[:12], ANONYMOUS_LABELLED, ANONYMOUS_UNKNOWN_SIZE[:12]])}),
+    # Umumiy build kesh yozuvi o'chsa ham joy bo'shamaydi, ishlatilayotgani o'chmaydi
+    (["build_cache"], False, {"build_cache": (2, 11, ["build-privat", "build-shared"])}),
+])
+def test_estimate_dry_run_rules(categories, all_images, expected):
+    estimate = DiskUsageAnalyzer(DF).estimate(categories, all_images=all_images)
+    assert {kind: (entry["count"], entry["size"], entry["items"]) for kind, entry in estimate.items()} == expected
+
+
+class RecordingJob(Job):
+    """Bekor qilish berilgan qadamdan keyin so'raladigan vazifa"""
+    def __init__(self, cancel_after: int = None):
+        super().__init__("prune", None)
+        self.cancel_after = cancel_after
+        self.messages = []
+        
+    def set_progress(self, progress=None, message=None):
+        super().set_progress(progress, message)
+        self.messages.append((progress, message))
+        if self.cancel_after is not None and len(self.messages) >= self.cancel_after:
+            self.cancel_event.set()
+
+
+@pytest.fixture
+def daemon():
+    daemon = FakeDockerDaemon()
+    nginx = daemon.state.add_image("nginx:latest")
+    redis = daemon.state.add_image("redis:7")
+    daemon.state.add_container("web", nginx, "running")
+    daemon.state.add_container("cache", redis, "exited")
+    daemon.start()
+    yield daemon
+    daemon.stop()
+
+
+@pytest.mark.skipif(not UNIX_SOCKETS, reason="Unix socket kerak")
+def test_prune_selected_runs_in_prune_order(daemon, monkeypatch):
+    monkeypatch.setenv("DOCKER_HOST", daemon.base_url)
+    job = RecordingJob()
+    results = prune_selected(DockerManager(), ["build_cache", "volumes", "images", "containers"],
+                             all_images=True, job=job)
+                             
+    prunes = [path for method, path, query in daemon.state.requests if path.endswith("/prune")]
+    assert prunes == ["/containers/prune", "/images/prune", "/volumes/prune", "/build/prune"]
+    assert list(results) == ["containers", "images", "volumes", "build_cache"]
+    # Konteyner avval o'chirilgani uchun uning imagesi ham bo'shadi
+    assert len(results["containers"]["deleted"]) == 1
+    assert len(results["images"]["deleted"]) == 1
+    assert [progress for progress, message in job.messages] == [0.0, 0.25, 0.5, 0.75]
+
+
+@pytest.mark.skipif(not UNIX_SOCKETS, reason="Unix socket kerak")
+def test_prune_selected_stops_when_cancelled(daemon, monkeypatch):
+    monkeypatch.setenv("DOCKER_HOST", daemon.base_url)
+    with pytest.raises(JobCancelled):
+        prune_selected(DockerManager(), ["containers", "images"], job=RecordingJob(cancel_after=1))
+    prunes = [path for method, path, query in daemon.state.requests if path.endswith("/prune")]
+    assert prunes == ["/containers/prune"]
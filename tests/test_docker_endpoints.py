@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docker Endpoints testlari - bir nechta soxta Docker daemoni bilan
+
+Ro'yxatlarni "host/id" bilan birlashtirish, amallarni mos endpointga
+yo'naltirish, sekin endpointning eski natijasi va o'lik host amallarni
+bloklamasligi tekshiriladi.
+"""
+
+import time
+
+import pytest
+
+from managers.docker_endpoints import ENDPOINT_ERROR, ENDPOINT_OK, ENDPOINT_TIMEOUT_STATE
+from managers.docker_manager import LOCAL_ENDPOINT, DockerManager
+from tests.fake_docker import UNIX_SOCKETS, FakeDockerDaemon, socket_path
+
+pytestmark = pytest.mark.skipif(not UNIX_SOCKETS, reason="Unix socket kerak")
+
+
+def make_daemon(name: str) -> FakeDockerDaemon:
+    daemon = FakeDockerDaemon()
+    image_id = daemon.state.add_image(f"{name}:latest")
+    daemon.container_id = daemon.state.add_container(f"{name}-web", image_id, "running")
+    return daemon.start()
+
+
+@pytest.fixture
+def daemons(monkeypatch):
+    daemons = {name: make_daemon(name) for name in (LOCAL_ENDPOINT, "alpha", "beta")}
+    monkeypatch.setenv("DOCKER_HOST", daemons[LOCAL_ENDPOINT].base_url)
+    yield daemons
+    for daemon in daemons.values():
+        daemon.stop()
+
+
+def make_manager(daemons, timeout: float = 2, extra=()) -> DockerManager:
+    endpoints = [{"name": name, "base_url": daemon.base_url, "timeout": timeout}
+                 for name, daemon in daemons.items() if name != LOCAL_ENDPOINT]
+    return DockerManager(endpoints=endpoints + list(extra))
+
+
+def test_listing_merges_hosts_and_routes_actions(daemons):
+    manager = make_manager(daemons)
+    containers = {container['name']: container for container in manager.get_containers()}
+    
+    assert {name: container['host'] for name, container in containers.items()} == {
+        "local-web": LOCAL_ENDPOINT, "alpha-web": "alpha", "beta-web": "beta"}
+    alpha_id = daemons["alpha"].container_id
+    assert containers["alpha-web"]['id'] == f"alpha/{alpha_id[:12]}"
+    assert manager.get_endpoint_states() == {"alpha": ENDPOINT_OK, "beta": ENDPOINT_OK}
+    
+    assert manager.stop_container(containers["alpha-web"]['id'])
+    assert daemons["alpha"].state.count("POST", f"/containers/{alpha_id}/stop") == 1
+    assert not any(request[0] == "POST" for name in (LOCAL_ENDPOINT, "beta")
+                   for request in daemons[name].state.requests)
+
+
+def test_slow_endpoint_returns_stale_result(daemons):
+    manager = make_manager(daemons, timeout=0.3)
+    manager.get_containers()
+    
+    daemons["beta"].state.delay = 1.0
+    started = time.time()
+    containers = {container['name']: container for container in manager.get_containers()}
+    assert time.time() - started < 0.9
+    assert containers["beta-web"]['stale'] is True
+    assert 'stale' not in containers["alpha-web"]
+    assert manager.get_endpoint_states()["beta"] == ENDPOINT_TIMEOUT_STATE
+
+
+def test_dead_hosts_do_not_block_resolve_or_listing(daemons):
+    slow = make_daemon("slow")
+    slow.state.delay = 3.0
+    try:
+        manager = make_manager(daemons, timeout=0.3, extra=[
+            {"name": "slow", "base_url": slow.base_url, "timeout": 0.3},
+            {"name": "missing", "base_url": "unix://" + socket_path(), "timeout": 0.3}])
+            
+        # Client yaratish daemondan versiya so'ramaydi
+        started = time.time()
+        client, object_id = manager.resolve("slow/abc")
+        assert client is not None and object_id == "abc"
+        assert time.time() - started < 0.5
+        
+        started = time.time()
+        names = {container['name'] for container in manager.get_containers()}
+        assert time.time() - started < 0.9
+        assert names == {"local-web", "alpha-web", "beta-web"}
+        states = manager.get_endpoint_states()
+        assert states["slow"] == ENDPOINT_TIMEOUT_STATE and states["missing"] == ENDPOINT_ERROR
+    finally:
+        slow.stop()
+
+
+def test_older_daemon_version_is_negotiated_in_fan_out(daemons):
+    daemons["beta"].state.api_version = "1.40"
+    manager = make_manager(daemons)
+    endpoint = manager.endpoint_pool.get("beta")
+    assert endpoint.get_client().api.api_version == "1.41"
+    
+    assert "beta-web" in {container['name'] for container in manager.get_containers()}
+    assert endpoint.get_client().api.api_version == "1.40"
+    assert manager.endpoint_pool.get("alpha").get_client().api.api_version == "1.41"
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docker Events testlari - Unix socketdagi soxta Docker API bilan
+
+Boshlang'ich to'ldirish, create/start/die/destroy hodisalari va oqim
+uzilganda qayta ulanib jadvalni qayta to'ldirish tekshiriladi.
+"""
+
+import pytest
+
+from managers.docker_manager import DockerManager
+from tests.fake_docker import END_OF_STREAM, UNIX_SOCKETS, FakeDockerDaemon, wait_until
+
+pytestmark = pytest.mark.skipif(not UNIX_SOCKETS, reason="Unix socket kerak")
+
+
+@pytest.fixture
+def daemon():
+    daemon = FakeDockerDaemon()
+    image_id = daemon.state.add_image("nginx:latest")
+    daemon.state.add_container("web", image_id, "running")
+    daemon.state.add_container("job", image_id, "exited")
+    daemon.start()
+    yield daemon
+    daemon.stop()
+
+
+@pytest.fixture
+def manager(daemon, monkeypatch):
+    monkeypatch.setenv("DOCKER_HOST", daemon.base_url)
+    manager = DockerManager()
+    changes = []
+    manager.start_event_watch(on_change=changes.append)
+    manager.changes = changes
+    assert wait_until(manager.is_event_synced)
+    yield manager
+    manager.stop_event_watch()
+
+
+def by_name(containers):
+    return {container['name']: container for container in containers}
+
+
+def test_initial_sync_serves_table_without_api_calls(daemon, manager):
+    containers = by_name(manager.get_containers())
+    assert containers['web']['status'] == 'running'
+    assert containers['job']['status'] == 'exited'
+    assert containers['web']['image'] == 'nginx:latest'
+    assert [image['tags'] for image in manager.get_images()] == [['nginx:latest']]
+    assert "containers" in manager.changes and "images" in manager.changes
+    
+    # Sinxron jadvaldan o'qish API ga so'rov yubormaydi
+    listed = daemon.state.count("GET", "/containers/json")
+    for _ in range(5):
+        manager.get_containers()
+        manager.get_images()
+    assert daemon.state.count("GET", "/containers/json") == listed
+
+
+def test_container_lifecycle_events(daemon, manager):
+    container_id = "abcdef123456" + "0" * 52
+    daemon.state.emit("container", "create", container_id, name="worker", image="redis:7")
+    assert wait_until(lambda: 'worker' in by_name(manager.get_containers()))
+    worker = by_name(manager.get_containers())['worker']
+    assert worker['id'] == container_id[:12]
+    assert worker['status'] == 'created'
+    assert worker['image'] == 'redis:7'
+    
+    daemon.state.emit("container", "start", container_id, name="worker")
+    assert wait_until(lambda: by_name(manager.get_containers())['worker']['status'] == 'running')
+    
+    daemon.state.emit("container", "die", container_id, name="worker")
+    assert wait_until(lambda: by_name(manager.get_containers())['worker']['status'] == 'exited')
+    
+    daemon.state.emit("container", "destroy", container_id, name="worker")
+    assert wait_until(lambda: 'worker' not in by_name(manager.get_containers()))
+    
+    # Ahamiyatsiz hodisa jadvalni o'zgartirmaydi
+    changes = len(manager.changes)
+    web_id = next(iter(daemon.state.containers))
+    daemon.state.emit("container", "exec_start: sh", web_id, name="web")
+    daemon.state.emit("container", "start", web_id, name="web")
+    daemon.state.emit("container", "destroy", container_id, name="worker")
+    assert wait_until(lambda: daemon.state.events.empty())
+    assert len(manager.changes) == changes
+
+
+def test_image_event_reloads_images(daemon, manager):
+    daemon.state.add_image("redis:7")
+    daemon.state.emit("image", "pull", "redis:7")
+    assert wait_until(lambda: len(manager.get_images()) == 2)
+    assert ['redis:7'] in [image['tags'] for image in manager.get_images()]
+
+
+def test_stream_end_reconnects_and_resyncs(daemon, manager):
+    listed = daemon.state.count("GET", "/containers/json")
+    
+    # Oqim uzilgan paytda o'zgarish - hodisa kelmaydi, faqat qayta to'ldirishda ko'rinadi
+    daemon.state.events.put(END_OF_STREAM)
+    assert wait_until(lambda: not manager.is_event_synced())
+    daemon.state.add_container("missed", next(iter(daemon.state.images)), "running")
+    
+    assert wait_until(manager.is_event_synced, timeout=5)
+    assert daemon.state.count("GET", "/containers/json") == listed + 1
+    assert daemon.state.count("GET", "/events") == 2
+    assert by_name(manager.get_containers())['missed']['status'] == 'running'
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docker Manager testlari - soxta Docker API bilan so'rovlar sonini o'lchash
+
+Konteynerlar ro'yxati konteynerlar sonidan qat'i nazar o'zgarmas sonli
+so'rov bilan olinishi tekshiriladi (har bir konteyner uchun inspect yo'q).
+"""
+
+import time
+
+import pytest
+
+from managers.docker_manager import DockerManager
+from tests.fake_docker import UNIX_SOCKETS, FakeDockerDaemon, wait_until
+
+pytestmark = pytest.mark.skipif(not UNIX_SOCKETS, reason="Unix socket kerak")
+
+
+@pytest.fixture
+def make_manager(monkeypatch):
+    daemons = []
+    
+    def make(container_count):
+        daemon = FakeDockerDaemon()
+        images = [daemon.state.add_image(f"app{index}:latest") for index in range(3)]
+        for index in range(container_count):
+            daemon.state.add_container(f"c{index}", images[index % len(images)],
+                                       "running" if index % 2 else "exited")
+        daemons.append(daemon.start())
+        monkeypatch.setenv("DOCKER_HOST", daemon.base_url)
+        return DockerManager(), daemon.state
+        
+    yield make
+    for daemon in daemons:
+        daemon.stop()
+
+
+def measure(state, func):
+    """func() natijasi, yuborilgan so'rovlar soni va vaqti"""
+    before = len(state.requests)
+    started = time.perf_counter()
+    result = func()
+    return result, len(state.requests) - before, time.perf_counter() - started
+
+
+def test_container_listing_costs_constant_requests(make_manager):
+    costs = {}
+    for count in (5, 100):
+        manager, state = make_manager(count)
+        containers, requests, elapsed = measure(state, manager.list_containers)
+        _, full_requests, full_elapsed = measure(state, lambda: manager.list_containers(sparse=False))
+        print(f"\n{count} konteyner: sparse {requests} so'rov ({elapsed:.3f}s), "
+              f"to'liq {full_requests} so'rov ({full_elapsed:.3f}s)")
+        costs[count] = requests
+        
+        assert len(containers) == count
+        sparse_paths = [path for _, path, _ in state.requests[-requests - full_requests:][:requests]]
+        assert sparse_paths == ["/containers/json", "/images/json"]
+        # Eski yo'l har bir konteyner uchun alohida inspect yuboradi
+        assert full_requests >= count
+        
+    assert costs[5] == costs[100] == 2
+
+
+def test_sparse_listing_resolves_image_tags(make_manager):
+    manager, state = make_manager(4)
+    containers = {container['name']: container for container in manager.list_containers()}
+    assert containers['c1']['image'] == 'app1:latest'
+    assert containers['c1']['status'] == 'running'
+    assert containers['c0']['status'] == 'exited'
+    assert containers['c0']['id'] == next(iter(state.containers))[:12]
+    assert containers['c0']['created'] == '2023-11-14T22:13:20'
+
+
+def test_status_reports_disconnect_once_while_retrying(monkeypatch):
+    import managers.docker_manager as docker_manager
+    monkeypatch.setattr(docker_manager, "RECONNECT_MIN_DELAY", 0.05)
+    monkeypatch.setattr(docker_manager, "RECONNECT_MAX_DELAY", 0.1)
+    monkeypatch.setattr(docker_manager, "HEALTH_CHECK_INTERVAL", 0.1)
+    daemon = FakeDockerDaemon()
+    monkeypatch.setenv("DOCKER_HOST", daemon.base_url)
+    
+    manager = DockerManager(lazy=True)
+    statuses = []
+    manager.add_status_listener(statuses.append)
+    try:
+        # Daemon hali yo'q - bir necha urinish, holat "retrying" da qoladi
+        time.sleep(0.5)
+        daemon.start()
+        assert wait_until(lambda: manager.is_connected)
+        
+        daemon.stop()
+        assert wait_until(lambda: not manager.is_connected)
+        time.sleep(0.5)
+    finally:
+        manager.stop_connect_loop()
+        
+    # Tinglovchi ulanishdan oldingi holatlarning bir qismini o'tkazib yuborishi mumkin
+    assert statuses[:-4] in ([], ["retrying"], ["connecting", "retrying"])
+    assert statuses[-4:] == ["connected", "disconnected", "connecting", "retrying"]
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Host Capacity testlari - soxta inventar va psutil qiymatlari bilan
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from utils import host_capacity
+from utils.host_capacity import OVERCOMMIT_RATIO, HostCapacity
+
+MB = 1024 * 1024
+HOST_MEMORY_MB = 8192
+
+
+class StubInventory:
+    def __init__(self, **lists):
+        self.lists = lists
+        
+    def get_list(self, key):
+        return self.lists.get(key, [])
+
+
+class StubDockerManager:
+    local_name = "local"
+    
+    def __init__(self, limits):
+        # konteyner ID -> HostConfig.Memory
+        self.limits = limits
+        self.requested = []
+        
+    def is_available(self):
+        return True
+        
+    def get_container_details(self, container_id):
+        self.requested.append(container_id)
+        return {"HostConfig": {"Memory": self.limits[container_id]}}
+
+
+@pytest.fixture(autouse=True)
+def host(monkeypatch):
+    psutil = host_capacity.psutil
+    monkeypatch.setattr(psutil, "virtual_memory",
+                        lambda: SimpleNamespace(total=HOST_MEMORY_MB * MB, available=2048 * MB))
+    monkeypatch.setattr(psutil, "cpu_count", lambda logical=True: 4)
+    monkeypatch.setattr(psutil, "cpu_percent", lambda interval=None: 12.5)
+    monkeypatch.setattr(psutil, "disk_usage", lambda path: SimpleNamespace(total=500 * MB, free=100 * MB))
+
+
+def make_capacity(containers=None, limits=None) -> HostCapacity:
+    inventory = StubInventory(
+        vbox_vms=[{"name": "ubuntu", "memory": "2048 MB", "cpus": 2, "state": "running"},
+                  {"name": "win", "memory": "4096 MB", "cpus": 4, "state": "poweroff"}],
+        hyperv_vms=[{"name": "dc", "memory": 2048, "cpus": "1", "state": 2},
+                    {"name": "lab", "memory": None, "cpus": None, "state": "Off"}],
+        docker_containers=containers or [])
+    return HostCapacity(inventory, StubDockerManager(limits or {}))
+
+
+def test_nothing_is_reported_before_the_first_sample():
+    capacity = make_capacity()
+    assert 'memory_total' not in capacity.summary()
+    assert capacity.check_new_vm(10 ** 6, 64) is None
+
+
+def test_summary_counts_only_running_vms_and_local_containers():
+    capacity = make_capacity(
+        containers=[{"id": "web", "status": "running", "host": "local"},
+                    {"id": "job", "status": "exited", "host": "local"},
+                    {"id": "remote/db", "status": "running", "host": "remote"},
+                    {"id": "unlimited", "status": "running"}],
+        limits={"web": 512 * MB, "unlimited": 0})
+    capacity.refresh()
+    
+    summary = capacity.summary()
+    assert capacity.docker_manager.requested == ["web", "unlimited"]
+    assert summary['container_memory'] == 512 * MB
+    assert summary['committed_memory'] == (2048 + 2048 + 512) * MB
+    assert summary['configured_memory'] == (2048 + 4096 + 2048) * MB
+    assert (summary['committed_cpus'], summary['configured_cpus']) == (3, 7)
+    assert summary['memory_commit_ratio'] == (2048 + 2048 + 512) / HOST_MEMORY_MB
+    assert summary['cpu_commit_ratio'] == 3 / 4
+    assert (summary['cpu_percent'], summary['disk_free']) == (12.5, 100 * MB)
+
+
+def test_known_container_limits_are_reused():
+    containers = [{"id": "web", "status": "running"}]
+    capacity = make_capacity(containers, limits={"web": 256 * MB, "api": 128 * MB})
+    capacity.refresh()
+    containers.append({"id": "api", "status": "running"})
+    capacity.refresh()
+    assert capacity.docker_manager.requested == ["web", "api"]
+    
+    # To'xtagan konteyner limitlardan chiqadi
+    containers[0]['status'] = 'exited'
+    capacity.refresh()
+    assert capacity.container_limits == {"api": 128 * MB}
+    assert capacity.docker_manager.requested == ["web", "api"]
+
+
+def test_overcommit_warning_fires_just_above_the_ratio():
+    capacity = make_capacity(containers=[{"id": "web", "status": "running"}], limits={"web": 1024 * MB})
+    capacity.refresh()
+    # Ishlayotgan VMlar 4096 MB, konteyner 1024 MB
+    free_mb = int(HOST_MEMORY_MB * OVERCOMMIT_RATIO) - 4096 - 1024
+    
+    assert capacity.check_new_vm(free_mb, 1) is None
+    message = capacity.check_new_vm(free_mb + 1, 1)
+    assert message is not None
+    assert f"{4096 + 1024} MB" in message and f"{HOST_MEMORY_MB} MB xotira" in message
+    assert "CPU" not in message
+    
+    # 3 ta ishlayotgan + 2 ta yangi virtual CPU 4 yadroli hostdan ko'p
+    assert "CPU: 5 ta virtual CPU, hostda 4 ta." in capacity.check_new_vm(free_mb + 1, 2)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Image Prewarm testlari - soxta docker manager va pull engine bilan
+
+Digest taqqoslash, tezlik chegarasi, bekor qilingan tekshiruv va
+yuklash natijasiga qarab holatlar tekshiriladi.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from managers.image_prewarm import (IMAGE_FAILED, IMAGE_FRESH, IMAGE_MISSING, IMAGE_PULLING,
+                                    IMAGE_STALE, ImagePrewarmer)
+from managers.image_pull import ImagePullEngine
+from tests.fake_docker import wait_until
+
+
+class StubDockerManager:
+    def __init__(self, local=None, remote=None):
+        # image -> lokal digestlar (None - image yo'q) va registry digesti
+        self.local = local or {}
+        self.remote = remote or {}
+        
+    def get_image_digests(self, image):
+        return self.local.get(image)
+        
+    def get_registry_digest(self, image):
+        return self.remote.get(image)
+
+
+class StubPullEngine(ImagePullEngine):
+    def __init__(self, results=None, block=False):
+        super().__init__(None)
+        # image -> pull() natijasi (berilmasa True)
+        self.results = results or {}
+        # True bo'lsa pull() cancel_event o'rnatilguncha kutadi
+        self.block = block
+        self.pulled = []
+        self.downloaded = 0
+        
+    def pull(self, image_name, progress_callback=None, cancel_event=None):
+        self.pulled.append(image_name)
+        if self.block:
+            cancel_event.wait(5)
+            return False
+        self.history.append({'image': image_name, 'downloaded_bytes': self.downloaded})
+        return self.results.get(image_name, True)
+
+
+def write_templates(tmp_path, images) -> str:
+    path = tmp_path / "docker_templates.json"
+    path.write_text(json.dumps({"templates": [{"name": image, "image": image} for image in images]}))
+    return str(path)
+
+
+def make_prewarmer(tmp_path, docker_manager, pull_engine, images, **options) -> ImagePrewarmer:
+    return ImagePrewarmer(docker_manager, pull_engine, write_templates(tmp_path, images),
+                          max_bandwidth=0, **options)
+
+
+@pytest.mark.parametrize("local, remote, expected", [
+    (None, "sha256:new", IMAGE_MISSING),
+    (["sha256:old"], "sha256:new", IMAGE_STALE),
+    (["sha256:old", "sha256:new"], "sha256:new", IMAGE_FRESH),
+    # Registry javob bermadi yoki image lokal qurilgan - lokal nusxa ishlatiladi
+    (["sha256:old"], None, IMAGE_FRESH),
+    ([], "sha256:new", IMAGE_FRESH),
+])
+def test_check_image_compares_digests(local, remote, expected):
+    docker_manager = StubDockerManager({"nginx:latest": local}, {"nginx:latest": remote})
+    prewarmer = ImagePrewarmer(docker_manager, StubPullEngine())
+    assert prewarmer.check_image("nginx:latest") == expected
+
+
+def test_run_pulls_only_missing_and_stale_images(tmp_path):
+    docker_manager = StubDockerManager(
+        local={"redis:7": ["sha256:a"], "postgres:16": ["sha256:old"]},
+        remote={"redis:7": "sha256:a", "postgres:16": "sha256:new", "alpine:latest": "sha256:b"})
+    engine = StubPullEngine(results={"postgres:16": False})
+    pulled = []
+    prewarmer = make_prewarmer(tmp_path, docker_manager, engine,
+                               ["redis:7", "postgres:16", "docker.io/library/alpine", "alpine"],
+                               on_pulled=pulled.append)
+                               
+    assert prewarmer.start()
+    assert wait_until(lambda: not prewarmer.running)
+    assert engine.pulled == ["postgres:16", "alpine:latest"]
+    assert pulled == ["alpine:latest"]
+    assert prewarmer.get_status() == {"redis:7": IMAGE_FRESH, "postgres:16": IMAGE_FAILED,
+                                      "alpine:latest": IMAGE_FRESH}
+    assert prewarmer.last_run > 0
+    # Interval o'tmaguncha qayta boshlanmaydi
+    assert not prewarmer.start()
+
+
+def test_stop_restores_previous_status_and_leaves_last_run_unset(tmp_path):
+    docker_manager = StubDockerManager(local={"nginx:latest": ["sha256:old"]},
+                                       remote={"nginx:latest": "sha256:new"})
+    engine = StubPullEngine(block=True)
+    prewarmer = make_prewarmer(tmp_path, docker_manager, engine, ["nginx"])
+    
+    assert prewarmer.start()
+    assert wait_until(lambda: prewarmer.get_status().get("nginx:latest") == IMAGE_PULLING)
+    prewarmer.stop()
+    assert wait_until(lambda: not prewarmer.running)
+    
+    assert prewarmer.get_status() == {"nginx:latest": IMAGE_STALE}
+    assert prewarmer.last_run == 0.0
+    # Bekor qilingan tekshiruv keyingi safar qaytadan boshlanadi
+    engine.block = False
+    assert prewarmer.start()
+    assert wait_until(lambda: not prewarmer.running)
+    assert prewarmer.get_status() == {"nginx:latest": IMAGE_FRESH}
+
+
+def test_charge_spaces_pulls_by_bandwidth():
+    prewarmer = ImagePrewarmer(StubDockerManager(), StubPullEngine(), max_bandwidth=1000)
+    prewarmer._charge(5000, started=100.0)
+    assert prewarmer.not_before == 105.0
+    # Keyingi yuklash oldingisining navbati tugamasdan boshlangan bo'lsa ham qo'shiladi
+    prewarmer._charge(2000, started=103.0)
+    assert prewarmer.not_before == 107.0
+    prewarmer._charge(1000, started=200.0)
+    assert prewarmer.not_before == 201.0
+    
+    unlimited = ImagePrewarmer(StubDockerManager(), StubPullEngine(), max_bandwidth=0)
+    unlimited._charge(10 ** 9, started=100.0)
+    assert unlimited.not_before == 0.0
+
+
+def test_pulled_bytes_are_charged_after_each_pull(tmp_path):
+    engine = StubPullEngine()
+    engine.downloaded = 4000
+    prewarmer = make_prewarmer(tmp_path, StubDockerManager(), engine, ["nginx"])
+    prewarmer.max_bandwidth = 1000
+    
+    started = time.time()
+    assert prewarmer.start()
+    assert wait_until(lambda: not prewarmer.running)
+    assert started + 4 <= prewarmer.not_before <= time.time() + 4
+
+
+def test_wait_turn_waits_for_bandwidth_and_idle():
+    idle = [False]
+    prewarmer = ImagePrewarmer(StubDockerManager(), StubPullEngine(), is_idle=lambda: idle[0])
+    cancel_event = threading.Event()
+    
+    prewarmer.not_before = time.time() - 1
+    threading.Timer(0.2, lambda: idle.__setitem__(0, True)).start()
+    started = time.time()
+    assert prewarmer._wait_turn(cancel_event)
+    assert time.time() - started >= 0.2
+    
+    # Tezlik chegarasi kutilayotganda bekor qilish darhol qaytaradi
+    prewarmer.not_before = time.time() + 60
+    threading.Timer(0.2, cancel_event.set).start()
+    started = time.time()
+    assert not prewarmer._wait_turn(cancel_event)
+    assert time.time() - started < 1
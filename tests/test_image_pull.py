@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Image Pull testlari - soxta Docker API bilan takrorlanmaslik, navbat va bekor qilish
+"""
+
+import threading
+
+import pytest
+
+from managers.docker_manager import DockerManager
+from managers.image_pull import ImagePullEngine
+from tests.fake_docker import UNIX_SOCKETS, FakeDockerDaemon, wait_until
+
+pytestmark = pytest.mark.skipif(not UNIX_SOCKETS, reason="Unix socket kerak")
+
+
+@pytest.fixture
+def daemon():
+    daemon = FakeDockerDaemon().start()
+    yield daemon
+    daemon.stop()
+
+
+@pytest.fixture
+def manager(daemon, monkeypatch):
+    monkeypatch.setenv("DOCKER_HOST", daemon.base_url)
+    return DockerManager()
+
+
+class PullThread(threading.Thread):
+    """pull() ni fon threadida bajarish - natija self.result da"""
+    def __init__(self, engine, image, cancel_event=None, progress=None):
+        super().__init__(daemon=True)
+        self.engine = engine
+        self.image = image
+        self.cancel_event = cancel_event
+        self.progress = progress
+        self.result = None
+        
+    def run(self):
+        self.result = self.engine.pull(self.image, progress_callback=self.progress,
+                                       cancel_event=self.cancel_event)
+
+
+def start_pull(engine, image, cancel_event=None, progress=None) -> PullThread:
+    thread = PullThread(engine, image, cancel_event, progress)
+    thread.start()
+    return thread
+
+
+def pulls(daemon) -> int:
+    return daemon.state.count("POST", "/images/create")
+
+
+def test_normalize_canonicalises_docker_hub_names():
+    engine = ImagePullEngine(None)
+    for name in ("nginx", "nginx:latest", "library/nginx", "docker.io/nginx",
+                 "docker.io/library/nginx:latest", "index.docker.io/library/nginx"):
+        assert engine.normalize(name) == "nginx:latest"
+    assert engine.normalize("docker.io/bitnami/redis:7") == "bitnami/redis:7"
+    assert engine.normalize("ghcr.io/library/tool") == "ghcr.io/library/tool:latest"
+    assert engine.normalize("localhost:5000/app") == "localhost:5000/app:latest"
+
+
+def test_same_image_under_different_names_shares_one_transfer(daemon, manager):
+    daemon.state.pull_gate.clear()
+    engine = ImagePullEngine(manager)
+    threads = [start_pull(engine, name) for name in ("nginx", "docker.io/library/nginx:latest")]
+    assert wait_until(lambda: pulls(daemon) == 1 and len(engine.get_active()[0].subscribers) == 2)
+    
+    daemon.state.pull_gate.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert [thread.result for thread in threads] == [True, True]
+    assert pulls(daemon) == 1
+    assert [entry['image'] for entry in engine.get_history()] == ["nginx:latest"]
+
+
+def test_one_subscriber_cancelling_does_not_abort_the_other(daemon, manager):
+    daemon.state.pull_gate.clear()
+    engine = ImagePullEngine(manager)
+    cancel_event = threading.Event()
+    messages = []
+    cancelled = start_pull(engine, "nginx", cancel_event)
+    waiting = start_pull(engine, "nginx", progress=lambda progress, message: messages.append(progress))
+    assert wait_until(lambda: pulls(daemon) == 1 and len(engine.get_active()[0].subscribers) == 2)
+    
+    cancel_event.set()
+    cancelled.join(timeout=2)
+    assert cancelled.result is False
+    assert not engine.get_active()[0].is_set()
+    
+    daemon.state.pull_gate.set()
+    waiting.join(timeout=5)
+    assert waiting.result is True
+    assert engine.get_history()[0]['result'] is True
+    assert messages[-1] == 1.0
+
+
+def test_all_subscribers_cancelling_stops_the_pull(daemon, manager):
+    daemon.state.pull_gate.clear()
+    engine = ImagePullEngine(manager)
+    cancel_event = threading.Event()
+    thread = start_pull(engine, "nginx", cancel_event)
+    assert wait_until(lambda: pulls(daemon) == 1)
+    
+    cancel_event.set()
+    thread.join(timeout=2)
+    # Pull oqimi keyingi hodisada to'xtaydi
+    daemon.state.pull_gate.set()
+    assert wait_until(lambda: not engine.get_active())
+    assert engine.get_history()[0]['result'] is False
+
+
+def test_third_pull_waits_for_a_slot(daemon, manager):
+    daemon.state.pull_gate.clear()
+    engine = ImagePullEngine(manager, max_concurrent=2)
+    threads = [start_pull(engine, name) for name in ("alpine", "redis", "postgres")]
+    assert wait_until(lambda: pulls(daemon) == 2)
+    assert not wait_until(lambda: pulls(daemon) > 2, timeout=0.5)
+    assert len(engine.get_active()) == 3
+    
+    daemon.state.pull_gate.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert [thread.result for thread in threads] == [True, True, True]
+    assert pulls(daemon) == 3
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ISO Manager testlari - Range qo'llaydigan lokal http.server orqali yuklash
+
+Server HEAD da hajm bermaslik va Range ni qo'llamaslik rejimlariga ega,
+har bir GET so'rovining Range sarlavhasi ranges ro'yxatiga yoziladi.
+Shuningdek ISO larni xesh keshi bilan ro'yxatga olish va dublikatlarni
+hard link bilan birlashtirish tekshiriladi.
+"""
+
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils import iso_manager, persistence
+from utils.iso_manager import ISOManager
+from utils.iso_scan_index import ISOScanIndex
+
+
+class FileServer:
+    def __init__(self, payload: bytes):
+        self.payload = payload
+        # HEAD javobida Content-Length yuborilsinmi
+        self.head_length = True
+        self.ranges_supported = True
+        # GET so'rovlarining Range sarlavhalari (Range siz - None)
+        self.ranges = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.make_handler())
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/test.iso"
+        
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        
+    def make_handler(self):
+        owner = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, *args):
+                pass
+                
+            def do_HEAD(self):
+                self.send_response(200)
+                if owner.ranges_supported:
+                    self.send_header("Accept-Ranges", "bytes")
+                if owner.head_length:
+                    self.send_header("Content-Length", str(len(owner.payload)))
+                else:
+                    self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                
+            def do_GET(self):
+                payload = owner.payload
+                header = self.headers.get("Range")
+                owner.ranges.append(header)
+                match = re.match(r"bytes=(\d+)-(\d*)$", header or "")
+                if not owner.ranges_supported or match is None:
+                    return self.send_body(200, payload)
+                    
+                start = int(match.group(1))
+                end = int(match.group(2)) if match.group(2) else len(payload) - 1
+                if start >= len(payload):
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(payload)}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                end = min(end, len(payload) - 1)
+                self.send_body(206, payload[start:end + 1],
+                               f"bytes {start}-{end}/{len(payload)}")
+                               
+            def send_body(self, code, body, content_range=None):
+                self.send_response(code)
+                self.send_header("Content-Length", str(len(body)))
+                if content_range:
+                    self.send_header("Content-Range", content_range)
+                self.end_headers()
+                self.wfile.write(body)
+                
+        return Handler
+
+
+PAYLOAD = bytes(range(256)) * 1024
+
+
+@pytest.fixture
+def server():
+    server = FileServer(PAYLOAD)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ISOManager(str(tmp_path / "iso_templates.json"),
+                         ISOScanIndex(str(tmp_path / "iso_scan_index.json")))
+    yield manager
+    manager.store.flush()
+
+
+def read(path) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_resumes_from_partial_file(server, manager, tmp_path):
+    save_path = str(tmp_path / "test.iso")
+    with open(save_path + ".part", 'wb') as f:
+        f.write(PAYLOAD[:100000])
+        
+    assert manager.download_iso(server.url, save_path)
+    assert read(save_path) == PAYLOAD
+    assert server.ranges == ["bytes=100000-"]
+    assert not os.path.exists(save_path + ".part")
+
+
+def test_complete_part_without_head_length_finishes_on_416(server, manager, tmp_path):
+    server.head_length = False
+    save_path = str(tmp_path / "test.iso")
+    with open(save_path + ".part", 'wb') as f:
+        f.write(PAYLOAD)
+        
+    assert manager.download_iso(server.url, save_path)
+    assert read(save_path) == PAYLOAD
+    assert server.ranges == [f"bytes={len(PAYLOAD)}-"]
+
+
+def test_oversized_part_is_downloaded_again(server, manager, tmp_path):
+    server.head_length = False
+    save_path = str(tmp_path / "test.iso")
+    with open(save_path + ".part", 'wb') as f:
+        f.write(PAYLOAD + b"stale")
+        
+    assert manager.download_iso(server.url, save_path)
+    assert read(save_path) == PAYLOAD
+    assert server.ranges == [f"bytes={len(PAYLOAD) + 5}-", None]
+
+
+def test_server_without_range_support_restarts(server, manager, tmp_path):
+    server.ranges_supported = False
+    save_path = str(tmp_path / "test.iso")
+    with open(save_path + ".part", 'wb') as f:
+        f.write(b"x" * 1000)
+        
+    assert manager.download_iso(server.url, save_path, connections=4)
+    assert read(save_path) == PAYLOAD
+
+
+def test_segmented_download(server, manager, tmp_path, monkeypatch):
+    monkeypatch.setattr(iso_manager, "MIN_SEGMENT_SIZE", 32 * 1024)
+    save_path = str(tmp_path / "test.iso")
+    progress = []
+    
+    assert manager.download_iso(server.url, save_path, progress.append, connections=4)
+    assert read(save_path) == PAYLOAD
+    assert len(server.ranges) == 4 and all(server.ranges)
+    assert progress[-1] == 100.0
+    assert not os.path.exists(save_path + ".part.json")
+
+
+def test_managers_share_one_store_per_file(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr(persistence.atexit, "register", registered.append)
+    templates_file = str(tmp_path / "iso_templates.json")
+    scan_index = ISOScanIndex(str(tmp_path / "iso_scan_index.json"))
+    first = ISOManager(templates_file, scan_index)
+    second = ISOManager(templates_file, scan_index)
+    
+    assert first.store is second.store and len(registered) == 1
+    first.add_local_iso("first", str(tmp_path / "first.iso"))
+    second.add_local_iso("second", str(tmp_path / "second.iso"))
+    second.store.flush()
+    
+    with open(templates_file, encoding='utf-8') as f:
+        names = [iso["name"] for iso in json.load(f)["local_isos"]]
+    assert names == ["first", "second"]
+
+
+def count_hashing(monkeypatch):
+    """iso_manager.hash_files chaqiruvlarining kirish ro'yxatlari"""
+    calls = []
+    real_hash_files = iso_manager.hash_files
+    
+    def hash_files(paths):
+        calls.append(sorted(paths))
+        return real_hash_files(paths)
+        
+    monkeypatch.setattr(iso_manager, "hash_files", hash_files)
+    return calls
+
+
+def test_register_isos_skips_unchanged_primaries_and_duplicates(manager, tmp_path, monkeypatch):
+    calls = count_hashing(monkeypatch)
+    first = str(tmp_path / "a.iso")
+    second = str(tmp_path / "b.iso")
+    for path in (first, second):
+        with open(path, 'wb') as f:
+            f.write(PAYLOAD)
+            
+    for _ in range(3):
+        manager.register_isos([first, second])
+    assert calls == [[first, second]]
+    
+    [iso] = manager.get_local_isos()
+    assert iso["path"] == first and iso["duplicates"] == [second]
+    
+    # O'zgargan dublikat qayta xeshlanadi va alohida yozuvga o'tadi
+    with open(second, 'ab') as f:
+        f.write(b"changed")
+    hashes = manager.register_isos([first, second])
+    assert calls[1:] == [[second]]
+    assert hashes[second] != hashes[first]
+    assert len(manager.get_local_isos()) == 2
+    assert manager.get_local_isos()[0]["duplicates"] == []
+
+
+def test_deduplicate_links_copy_and_updates_duplicates(manager, tmp_path, monkeypatch):
+    first = str(tmp_path / "a.iso")
+    second = str(tmp_path / "b.iso")
+    missing = str(tmp_path / "gone.iso")
+    for path in (first, second, missing):
+        with open(path, 'wb') as f:
+            f.write(PAYLOAD)
+    manager.register_isos([first, second, missing])
+    os.remove(missing)
+    assert manager.get_duplicate_count() == 1
+    
+    assert manager.deduplicate_isos() == {"linked": 1, "saved_bytes": len(PAYLOAD)}
+    assert os.path.samefile(first, second)
+    [iso] = manager.get_local_isos()
+    assert iso["duplicates"] == [second]
+    assert list(iso["duplicate_signatures"]) == [second]
+    assert manager.get_duplicate_count() == 0
+    
+    # Link qilingan dublikatning yangi mtime i saqlangan - qayta xeshlanmaydi
+    calls = count_hashing(monkeypatch)
+    manager.register_isos([first, second])
+    assert calls == []
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ISO Scan Index testlari - o'zgarmagan papkalar qayta o'qilmasligi
+"""
+
+import os
+
+from utils.iso_scan_index import ISOScanIndex
+
+
+def write(path, data: bytes = b"iso"):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def touch_directory(path):
+    """Papka mtime ini aniq o'zgartirish (fayl tizimi aniqligiga bog'liq bo'lmasin)"""
+    mtime = os.stat(path).st_mtime + 10
+    os.utime(path, (mtime, mtime))
+
+
+def make_tree(root):
+    for name in ("alpha", "beta", os.path.join("beta", "nested")):
+        os.makedirs(root / name)
+    write(root / "alpha" / "one.iso")
+    write(root / "beta" / "two.iso")
+    write(root / "beta" / "notes.txt")
+    write(root / "beta" / "nested" / "three.ISO")
+
+
+def relative(path, root) -> str:
+    return os.path.relpath(path, root).replace(os.sep, "/")
+
+
+def scan(index, root, monkeypatch):
+    """Skan natijasi (nisbiy yo'llar) va qayta o'qilgan papkalar"""
+    listed = []
+    read_directory = ISOScanIndex.read_directory
+    
+    def spy(self, path, mtime):
+        listed.append(relative(path, root))
+        return read_directory(self, path, mtime)
+        
+    monkeypatch.setattr(ISOScanIndex, "read_directory", spy)
+    files = sorted(relative(path, root) for path, size, mtime in index.scan(str(root)))
+    return files, sorted(listed)
+
+
+def test_rescan_lists_only_changed_directories(tmp_path, monkeypatch):
+    root = tmp_path / "isos"
+    make_tree(root)
+    index_file = str(tmp_path / "index.json")
+    index = ISOScanIndex(index_file)
+    
+    files, listed = scan(index, root, monkeypatch)
+    assert files == ["alpha/one.iso", "beta/nested/three.ISO", "beta/two.iso"]
+    assert listed == [".", "alpha", "beta", "beta/nested"]
+    
+    # Hech narsa o'zgarmagan - saqlangan indeksdan ham birorta papka o'qilmaydi
+    assert scan(ISOScanIndex(index_file), root, monkeypatch) == (files, [])
+    
+    write(root / "beta" / "four.iso")
+    touch_directory(root / "beta")
+    files, listed = scan(index, root, monkeypatch)
+    assert "beta/four.iso" in files
+    assert listed == ["beta"]
+    
+    os.remove(root / "alpha" / "one.iso")
+    touch_directory(root / "alpha")
+    files, listed = scan(index, root, monkeypatch)
+    assert "alpha/one.iso" not in files
+    assert listed == ["alpha"]
+
+
+def test_changed_iso_in_unchanged_directory_is_restatted(tmp_path, monkeypatch):
+    root = tmp_path / "isos"
+    make_tree(root)
+    index = ISOScanIndex(str(tmp_path / "index.json"))
+    scan(index, root, monkeypatch)
+    
+    write(root / "alpha" / "one.iso", b"bigger iso")
+    results = {relative(path, root): size for path, size, mtime in index.scan(str(root))}
+    assert results["alpha/one.iso"] == len(b"bigger iso")
+
+
+def test_removed_directory_is_forgotten(tmp_path, monkeypatch):
+    root = tmp_path / "isos"
+    make_tree(root)
+    index = ISOScanIndex(str(tmp_path / "index.json"))
+    scan(index, root, monkeypatch)
+    
+    os.remove(root / "beta" / "nested" / "three.ISO")
+    os.rmdir(root / "beta" / "nested")
+    touch_directory(root / "beta")
+    files, listed = scan(index, root, monkeypatch)
+    assert files == ["alpha/one.iso", "beta/two.iso"]
+    assert listed == ["beta"]
+    assert str(root / "beta" / "nested") not in index.directories
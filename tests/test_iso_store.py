@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ISO Store testlari - parallel xeshlash va hard link bilan almashtirish
+"""
+
+import hashlib
+import os
+
+from utils.iso_store import hash_file, hash_files, is_same_file, link_duplicate
+
+
+def write(path, data: bytes) -> str:
+    with open(path, 'wb') as f:
+        f.write(data)
+    return str(path)
+
+
+def test_hash_files_matches_hashlib_and_reports_missing(tmp_path):
+    paths = [write(tmp_path / f"{index}.iso", bytes([index]) * (100000 + index)) for index in range(3)]
+    missing = str(tmp_path / "missing.iso")
+    
+    hashes = hash_files(paths + [missing, paths[0]], max_workers=2)
+    assert list(hashes) == paths + [missing]
+    for path in paths:
+        with open(path, 'rb') as f:
+            assert hashes[path] == hashlib.sha256(f.read()).hexdigest()
+    assert hashes[missing] is None
+    assert hash_file(paths[1], buffer_size=4096) == hashes[paths[1]]
+
+
+def test_link_duplicate_replaces_copy(tmp_path):
+    source = write(tmp_path / "source.iso", b"iso" * 1000)
+    duplicate = write(tmp_path / "copy.iso", b"iso" * 1000)
+    
+    assert link_duplicate(source, duplicate)
+    assert is_same_file(source, duplicate)
+    assert os.stat(source).st_nlink == 2
+    assert not os.path.exists(duplicate + ".link-tmp")
+    # Allaqachon bitta fayl - qayta link qilinmaydi
+    assert not link_duplicate(source, duplicate)
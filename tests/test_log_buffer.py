@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Log Buffer testlari - halqa bufer, tozalash va soxta Docker log oqimi
+"""
+
+import threading
+import time
+
+import pytest
+
+from managers.docker_manager import DockerManager
+from tests.fake_docker import UNIX_SOCKETS, FakeDockerDaemon, wait_until
+from utils.log_buffer import LogBuffer
+
+
+def test_dropped_counts_only_evicted_lines():
+    buffer = LogBuffer(max_lines=3)
+    buffer.append("a\nb\nc\nd\n")
+    assert buffer.dropped == 1
+    
+    buffer.clear()
+    assert buffer.dropped == 0 and buffer.window(0, 10)[1] == []
+    
+    buffer.append("e\nf\n")
+    assert buffer.dropped == 0
+    buffer.append("g\nh\n")
+    assert buffer.dropped == 1
+    assert buffer.window(0, 10)[1] == ["f", "g", "h"]
+
+
+def test_clear_discards_half_received_line():
+    buffer = LogBuffer()
+    buffer.append(b"first\nhalf ")
+    buffer.clear()
+    
+    buffer.append(b"of the line")
+    buffer.append(b" ends here\nnext\npartial \xd1")
+    buffer.append(b"\x8f\n")
+    assert buffer.window(0, 10)[1] == ["next", "partial я"]
+
+
+@pytest.fixture
+def daemon():
+    daemon = FakeDockerDaemon()
+    image_id = daemon.state.add_image("nginx:latest")
+    daemon.container_id = daemon.state.add_container("web", image_id, "running")
+    daemon.state.log_lines = ["old 1\n", "old 2\n"]
+    daemon.start()
+    yield daemon
+    daemon.stop()
+
+
+@pytest.mark.skipif(not UNIX_SOCKETS, reason="Unix socket kerak")
+def test_stream_into_buffer_clear_and_stop_while_idle(daemon, monkeypatch):
+    monkeypatch.setenv("DOCKER_HOST", daemon.base_url)
+    manager = DockerManager()
+    buffer = LogBuffer(max_lines=100)
+    stop_event = threading.Event()
+    result = []
+    
+    thread = threading.Thread(target=lambda: result.append(manager.stream_container_logs(
+        daemon.container_id, buffer.append, stop_event)), daemon=True)
+    thread.start()
+    assert wait_until(lambda: buffer.total == 2)
+    
+    daemon.state.logs.put("half ")
+    assert wait_until(lambda: buffer.partial == "half ")
+    buffer.clear()
+    daemon.state.logs.put("of a line\n")
+    daemon.state.logs.put("new\n")
+    assert wait_until(lambda: buffer.total == 3)
+    assert buffer.window(0, 10)[1] == ["new"]
+    assert buffer.dropped == 0
+    
+    # Yangi log kelmayapti - to'xtatish baribir oqimni yopadi
+    started = time.time()
+    stop_event.set()
+    thread.join(timeout=5)
+    assert not thread.is_alive() and time.time() - started < 2
+    assert result == [True]
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PowerShell Session testlari - bir xil framingda gapiradigan soxta shell bilan
+
+Soxta shell stdin dan {"id", "script"} qatorlarini o'qib <<PSFRAME>> javob
+qaytaradi. Skript buyruqlari: "echo <matn>", "fail <xabar>", "sleep <s>",
+"pid" va "exit" (javobsiz chiqish).
+"""
+
+import sys
+import threading
+import time
+
+from managers.powershell_session import PowerShellPool, PowerShellSession
+
+STAND_IN_SHELL = r'''
+import base64, json, os, sys, time
+print("PowerShell banner - frame emas", flush=True)
+for line in sys.stdin:
+    if not line.strip():
+        continue
+    request = json.loads(line)
+    script = base64.b64decode(request["script"]).decode("utf-8")
+    command, _, argument = script.partition(" ")
+    ok, stdout, stderr = True, "", ""
+    if command == "echo":
+        stdout = argument + "\n"
+    elif command == "fail":
+        ok, stderr = False, argument + "\n"
+    elif command == "sleep":
+        time.sleep(float(argument))
+        stdout = "woke\n"
+    elif command == "pid":
+        stdout = str(os.getpid()) + "\n"
+    elif command == "exit":
+        sys.exit(3)
+    print("shovqin qatori", flush=True)
+    response = {"id": request["id"], "ok": ok, "stdout": stdout, "stderr": stderr}
+    print("<<PSFRAME>>" + json.dumps(response), flush=True)
+'''
+
+COMMAND = [sys.executable, "-u", "-c", STAND_IN_SHELL]
+
+
+def test_framing_round_trip():
+    session = PowerShellSession(COMMAND)
+    try:
+        result = session.run("echo Salom dunyo - ünïcödé")
+        assert result.returncode == 0
+        assert result.stdout == "Salom dunyo - ünïcödé\n"
+        
+        result = session.run("fail yomon buyruq")
+        assert result.returncode == 1
+        assert result.stderr == "yomon buyruq\n"
+        
+        # Bitta jarayon qayta ishlatiladi
+        assert session.run("pid").stdout == session.run("pid").stdout
+    finally:
+        session.stop()
+
+
+def test_timeout_restarts_process_and_drops_late_reply():
+    session = PowerShellSession(COMMAND)
+    try:
+        first_pid = session.run("pid").stdout
+        
+        started = time.time()
+        result = session.run("sleep 5", timeout=0.5)
+        assert result.returncode == 1
+        assert "tugamadi" in result.stderr
+        assert time.time() - started < 3
+        
+        # Osilgan jarayon o'ldirilgan - keyingi so'rov yangi jarayonda
+        assert session.run("echo keyin").stdout == "keyin\n"
+        assert session.run("pid").stdout != first_pid
+    finally:
+        session.stop()
+
+
+def test_crash_reports_error_and_restarts():
+    session = PowerShellSession(COMMAND)
+    try:
+        result = session.run("exit")
+        assert result.returncode == 1
+        assert "kutilmaganda tugadi" in result.stderr
+        assert session.run("echo tirik").stdout == "tirik\n"
+    finally:
+        session.stop()
+
+
+def test_pool_queues_requests_beyond_size():
+    pool = PowerShellPool(size=2, command=COMMAND)
+    results = {}
+    
+    def worker(index):
+        results[index] = pool.run(f"echo {index}", timeout=10)
+        
+    try:
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+            
+        assert pool.created == 2
+        assert {index: result.stdout for index, result in results.items()} == \
+            {index: f"{index}\n" for index in range(6)}
+    finally:
+        pool.close()
+        
+    assert pool.run("echo yopiq").returncode == 1
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VirtualBox Manager testlari - N ta VM chiqaradigan soxta VBoxManage bilan
+
+Soxta VBoxManage PATH ga qo'yiladi va har bir ishga tushirilishini faylga
+yozadi. Bulk rejimda "list -l vms" bitta chaqiruv bo'lishi, eski rejimda
+esa har bir VM uchun alohida showvminfo ishlashi tekshiriladi.
+"""
+
+import os
+import stat
+import sys
+import time
+
+from managers.virtualbox_manager import VirtualBoxManager
+from utils.discovery_cache import DiscoveryCache
+
+# Soxta VBoxManage qaytaradigan VMlar soni
+VM_COUNT = 40
+
+FAKE_VBOXMANAGE = '''#!{python}
+import sys
+args = sys.argv[1:]
+with open({log!r}, "a") as f:
+    f.write(" ".join(args) + "\\n")
+count = {count}
+uuid = lambda i: "%08d-0000-0000-0000-000000000000" % i
+if args == ["--version"]:
+    print("7.0.0r0")
+elif args == ["list", "vms"]:
+    for i in range(count):
+        print('"vm%d" {{%s}}' % (i, uuid(i)))
+elif args == ["list", "-l", "vms"]:
+    for i in range(count):
+        print("Name:                        vm%d" % i)
+        print("UUID:                        %s" % uuid(i))
+        print("Hardware UUID:               %s" % uuid(i))
+        print("Memory size:                 %dMB" % (512 * (i % 4 + 1)))
+        print("Number of CPUs:              %d" % (i % 2 + 1))
+        print("State:                       %s (since 2024-01-01T00:00:00.000000000)"
+              % ("running" if i % 2 else "powered off"))
+        print()
+elif args[:1] == ["showvminfo"]:
+    i = int(args[1].split("-")[0])
+    print('UUID="%s"' % uuid(i))
+    print('memory=%d' % (512 * (i % 4 + 1)))
+    print('cpus=%d' % (i % 2 + 1))
+    print('VMState="%s"' % ("running" if i % 2 else "poweroff"))
+else:
+    sys.exit(1)
+'''
+
+
+def make_manager(tmp_path, monkeypatch):
+    """PATH da soxta VBoxManage bilan manager va chaqiruvlar jurnali"""
+    log = tmp_path / "calls.log"
+    binary = tmp_path / "bin" / "VBoxManage"
+    binary.parent.mkdir()
+    binary.write_text(FAKE_VBOXMANAGE.format(python=sys.executable, log=str(log), count=VM_COUNT))
+    binary.chmod(binary.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", str(binary.parent) + os.pathsep + os.environ.get("PATH", ""))
+    
+    manager = VirtualBoxManager(DiscoveryCache(str(tmp_path / "discovery_cache.json")))
+    assert manager.is_available()
+    log.write_text("")
+    return manager, log
+
+
+def read_calls(log):
+    return [line for line in log.read_text().splitlines() if line]
+
+
+def test_bulk_listing_uses_constant_launches(tmp_path, monkeypatch):
+    manager, log = make_manager(tmp_path, monkeypatch)
+    
+    started = time.perf_counter()
+    bulk = manager.get_vms(bulk=True)
+    bulk_time = time.perf_counter() - started
+    bulk_calls = read_calls(log)
+    
+    log.write_text("")
+    started = time.perf_counter()
+    per_vm = manager.get_vms(bulk=False)
+    per_vm_time = time.perf_counter() - started
+    per_vm_calls = read_calls(log)
+    
+    print(f"\n{VM_COUNT} VM: bulk {len(bulk_calls)} jarayon, {bulk_time:.3f}s; "
+          f"showvminfo {len(per_vm_calls)} jarayon, {per_vm_time:.3f}s")
+          
+    assert bulk_calls == ["list vms", "list -l vms"]
+    assert len(per_vm_calls) == 1 + VM_COUNT
+    assert sum(call.startswith("showvminfo") for call in per_vm_calls) == VM_COUNT
+    # Ikkala usul bir xil natija beradi
+    assert bulk == per_vm
+    assert len(bulk) == VM_COUNT
+    assert bulk[1] == {'name': 'vm1', 'uuid': '00000001-0000-0000-0000-000000000000',
+                       'state': 'running', 'memory': '1024 MB', 'cpus': '2'}
+    assert bulk[0]['state'] == 'poweroff'
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docker Disk Window - Docker disk sarfi va tozalash oynasi
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+from ui.tree_view import SyncedTreeView
+from utils.docker_disk_usage import DiskUsageAnalyzer, CATEGORY_LABELS, PRUNE_ORDER, prune_selected
+from utils.job_manager import JOB_DONE
+from utils.metrics import format_bytes
+
+# Dry-run ro'yxatida har bir toifadan ko'rsatiladigan nomlar soni
+DRY_RUN_ITEMS = 30
+
+class DockerDiskWindow:
+    def __init__(self, parent, docker_manager, job_manager, on_change=None):
+        """on_change() - tozalashdan keyin (Tk threadida) chaqiriladi"""
+        self.docker_manager = docker_manager
+        self.job_manager = job_manager
+        self.on_change = on_change
+        self.analyzer = None
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Docker disk sarfi")
+        self.dialog.geometry("700x500")
+        self.dialog.transient(parent)
+        
+        self.setup_ui()
+        self.load()
+        
+    def setup_ui(self):
+        """UI ni sozlash"""
+        main_frame = ttk.Frame(self.dialog, padding="10")
+        main_frame.pack(fill="both", expand=True)
+        
+        self.layers_var = tk.StringVar(value="Hisoblanmoqda...")
+        ttk.Label(main_frame, textvariable=self.layers_var, justify="left").pack(anchor="w", pady=(0, 10))
+        
+        table_frame = ttk.Frame(main_frame)
+        table_frame.pack(fill="both", expand=True)
+        self.view = SyncedTreeView(table_frame, ("Turi", "Soni", "Hajmi", "Bo'shatish mumkin"), 150)
+        self.view.show()
+        
+        options_frame = ttk.LabelFrame(main_frame, text="Tozalash", padding="10")
+        options_frame.pack(fill="x", pady=(10, 0))
+        
+        self.category_vars = {}
+        labels = {
+            "containers": "To'xtagan konteynerlar",
+            "images": "Osilib qolgan (tegsiz) imagelar",
+            "volumes": "Ishlatilmayotgan anonim volumelar",
+            "build_cache": "Build kesh",
+        }
+        for kind in PRUNE_ORDER:
+            self.category_vars[kind] = tk.BooleanVar(value=kind in ("containers", "images"))
+            ttk.Checkbutton(options_frame, text=labels[kind], variable=self.category_vars[kind],
+                            command=self.update_estimate).pack(anchor="w")
+        self.all_images_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Konteynerda ishlatilmayotgan barcha imagelar",
+                        variable=self.all_images_var, command=self.update_estimate).pack(anchor="w", padx=(20, 0))
+                        
+        self.estimate_var = tk.StringVar()
+        ttk.Label(options_frame, textvariable=self.estimate_var).pack(anchor="w", pady=(5, 0))
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill="x", pady=(10, 0))
+        
+        ttk.Button(button_frame, text="Yangilash", command=self.load).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Dry-run", command=self.show_dry_run).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Tozalash", command=self.prune).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Yopish", command=self.dialog.destroy).pack(side="right", padx=5)
+        
+    def selected_categories(self):
+        return [kind for kind, var in self.category_vars.items() if var.get()]
+        
+    def load(self):
+        """Disk sarfini fon vazifasida hisoblash (/system/df sekin bo'lishi mumkin)"""
+        self.layers_var.set("Hisoblanmoqda...")
+        
+        def on_done(job):
+            if not self.dialog.winfo_exists():
+                return
+            if job.state == JOB_DONE:
+                self.analyzer = DiskUsageAnalyzer(job.result)
+                self.show_summary()
+            else:
+                self.layers_var.set("Disk sarfini olishda xatolik")
+                
+        self.job_manager.submit("Docker: disk sarfini hisoblash",
+                                lambda job: self.docker_manager.get_disk_usage() or False, on_done)
+                                
+    def show_summary(self):
+        """Toifalar jadvali va qatlamlar taqsimoti"""
+        summary = self.analyzer.summary()
+        images = summary['images']
+        layers = summary['layers']
+        containers = summary['containers']
+        volumes = summary['volumes']
+        build_cache = summary['build_cache']
+        
+        self.layers_var.set(
+            f"Imagelar qatlamlari diskda: {format_bytes(layers['on_disk'])} "
+            f"(alohida: {format_bytes(layers['unique'])}, umumiy: {format_bytes(layers['shared'])})\n"
+            f"Image hajmlari yig'indisi: {format_bytes(layers['naive_total'])} - "
+            f"umumiy qatlamlar har bir imageda qayta sanaladi"
+        )
+        self.view.sync([
+            ("images", (f"{CATEGORY_LABELS['images']} ({images['dangling']} ta tegsiz)",
+                        f"{images['count']} ({images['active']} ta ishlatilmoqda)",
+                        format_bytes(images['size']), format_bytes(images['dangling_size']))),
+            ("containers", ("Konteynerlar", f"{containers['count']} ({containers['stopped']} ta to'xtagan)",
+                            format_bytes(containers['size']), format_bytes(containers['stopped_size']))),
+            ("volumes", (f"{CATEGORY_LABELS['volumes']} ({volumes['named_unused']} ta nomli)",
+                         f"{volumes['count']} ({volumes['unused']} ta ishlatilmayapti)",
+                         format_bytes(volumes['size']), format_bytes(volumes['unused_size']))),
+            ("build_cache", (CATEGORY_LABELS['build_cache'], str(build_cache['count']),
+                             format_bytes(build_cache['size']), format_bytes(build_cache['reclaimable']))),
+        ])
+        self.update_estimate()
+        
+    def update_estimate(self):
+        """Tanlangan toifalar bo'yicha bo'shaydigan joy taxmini"""
+        if self.analyzer is None:
+            return
+        estimate = self.analyzer.estimate(self.selected_categories(), self.all_images_var.get())
+        total = sum(entry['size'] for entry in estimate.values())
+        self.estimate_var.set(f"Taxminan bo'shaydi: kamida {format_bytes(total)}")
+        
+    def show_dry_run(self):
+        """Tozalashda o'chiriladigan obyektlar ro'yxati (hech narsa o'chirilmaydi)"""
+        if self.analyzer is None:
+            return
+        estimate = self.analyzer.estimate(self.selected_categories(), self.all_images_var.get())
+        lines = []
+        for kind in PRUNE_ORDER:
+            if kind not in estimate:
+                continue
+            entry = estimate[kind]
+            lines.append(f"{CATEGORY_LABELS[kind]}: {entry['count']} ta, {format_bytes(entry['size'])}")
+            lines.extend(f"    {name}" for name in entry['items'][:DRY_RUN_ITEMS])
+            if entry['count'] > DRY_RUN_ITEMS:
+                lines.append(f"    ... yana {entry['count'] - DRY_RUN_ITEMS} ta")
+        messagebox.showinfo("Dry-run", "\n".join(lines) or "Hech narsa tanlanmagan", parent=self.dialog)
+        
+    def prune(self):
+        """Tanlangan toifalarni fon vazifasida tozalash"""
+        categories = self.selected_categories()
+        if not categories:
+            messagebox.showwarning("Ogohlantirish", "Tozalash uchun toifa tanlang", parent=self.dialog)
+            return
+        all_images = self.all_images_var.get()
+        if not messagebox.askyesno("Tasdiqlash", f"{self.estimate_var.get()}\nTozalashni boshlaysizmi?",
+                                   parent=self.dialog):
+            return
+            
+        def on_done(job):
+            if job.state == JOB_DONE:
+                failed = [CATEGORY_LABELS[kind] for kind, result in job.result.items() if result is None]
+                reclaimed = sum(result['reclaimed'] for result in job.result.values() if result)
+                message = f"Bo'shatildi: {format_bytes(reclaimed)}"
+                if failed:
+                    message += "\nXatolik: " + ", ".join(failed)
+                messagebox.showinfo("Tozalash", message)
+            if self.on_change is not None:
+                self.on_change()
+            if self.dialog.winfo_exists():
+                self.load()
+                
+        self.job_manager.submit("Docker: tozalash",
+                                lambda job: prune_selected(self.docker_manager, categories, all_images, job),
+                                on_done)
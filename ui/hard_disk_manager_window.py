@@ -9,13 +9,18 @@ from tkinter import ttk, messagebox, filedialog, simpledialog
 import threading
 import os
 from typing import Dict, List
+from utils.job_manager import JOB_DONE
 
 class HardDiskManagerWindow:
-    def __init__(self, parent, vm_manager, vm_name, vm_type):
+    def __init__(self, parent, vm_manager, vm_name, vm_type, vm_id=None, job_manager=None):
         self.parent = parent
         self.vm_manager = vm_manager
         self.vm_name = vm_name
+        # VirtualBox uchun UUID (berilmasa manager indeksidan olinadi)
+        self.vm_id = vm_id
         self.vm_type = vm_type
+        # Berilsa uzoq amallar (hajmni o'zgartirish) fon vazifasi sifatida bajariladi
+        self.job_manager = job_manager
         
         self.dialog = tk.Toplevel(parent)
         self.dialog.title(f"Hard Disk Boshqaruvi - {vm_name}")
@@ -112,12 +117,7 @@ class HardDiskManagerWindow:
         try:
             if self.vm_type == "VirtualBox":
                 # UUID olish kerak
-                vms = self.vm_manager.get_vms()
-                vm_uuid = None
-                for vm in vms:
-                    if vm.get('name') == self.vm_name:
-                        vm_uuid = vm.get('uuid')
-                        break
+                vm_uuid = self.vm_id or self.vm_manager.get_vm_uuid(self.vm_name)
                         
                 if vm_uuid:
                     hard_disks = self.vm_manager.get_vm_hard_disks(vm_uuid)
@@ -145,7 +145,7 @@ class HardDiskManagerWindow:
             
     def add_hard_disk(self):
         """Yangi hard disk qo'shish"""
-        dialog = AddHardDiskDialog(self.dialog, self.vm_manager, self.vm_name, self.vm_type)
+        dialog = AddHardDiskDialog(self.dialog, self.vm_manager, self.vm_name, self.vm_type, self.vm_id)
         self.dialog.wait_window(dialog.dialog)
         self.load_hard_disks()
         
@@ -176,23 +176,35 @@ class HardDiskManagerWindow:
                 
             # Hajmni o'zgartirish
             if self.vm_type == "VirtualBox":
-                success = self.vm_manager.resize_hard_disk(disk_path, new_size_int)
+                resize = lambda: self.vm_manager.resize_hard_disk(disk_path, new_size_int)
             elif self.vm_type == "Hyper-V":
-                success = self.vm_manager.resize_hard_disk(disk_path, new_size_int // 1024)  # GB ga o'tkazish
+                resize = lambda: self.vm_manager.resize_hard_disk(disk_path, new_size_int // 1024)  # GB ga o'tkazish
             else:
-                success = False
+                resize = lambda: False
                 
-            if success:
-                messagebox.showinfo("Muvaffaqiyat", "Hard disk hajmi muvaffaqiyatli o'zgartirildi")
-                self.load_hard_disks()
+            if self.job_manager is not None:
+                self.job_manager.submit(
+                    f"{self.vm_name}: disk hajmi - {os.path.basename(str(disk_path))}",
+                    lambda job: resize(),
+                    lambda job: self.on_resize_done(job.state == JOB_DONE)
+                )
             else:
-                messagebox.showerror("Xatolik", "Hard disk hajmini o'zgartirishda xatolik")
+                self.on_resize_done(resize())
                 
         except IndexError:
             messagebox.showwarning("Ogohlantirish", "Hard disk tanlang")
         except Exception as e:
             messagebox.showerror("Xatolik", f"Hajmni o'zgartirishda xatolik: {str(e)}")
             
+    def on_resize_done(self, success):
+        """Hajmni o'zgartirish natijasini ko'rsatish"""
+        if success:
+            messagebox.showinfo("Muvaffaqiyat", "Hard disk hajmi muvaffaqiyatli o'zgartirildi")
+            if self.dialog.winfo_exists():
+                self.load_hard_disks()
+        else:
+            messagebox.showerror("Xatolik", "Hard disk hajmini o'zgartirishda xatolik")
+            
     def remove_hard_disk(self):
         """Hard diskni olib tashlash"""
         try:
@@ -247,9 +259,11 @@ class HardDiskManagerWindow:
 
 
 class AddHardDiskDialog:
-    def __init__(self, parent, vm_manager, vm_name, vm_type):
+    def __init__(self, parent, vm_manager, vm_name, vm_type, vm_id=None):
         self.vm_manager = vm_manager
         self.vm_name = vm_name
+        # VirtualBox uchun UUID (berilmasa manager indeksidan olinadi)
+        self.vm_id = vm_id
         self.vm_type = vm_type
         
         self.dialog = tk.Toplevel(parent)
@@ -330,12 +344,7 @@ class AddHardDiskDialog:
         try:
             if self.vm_type == "VirtualBox":
                 # UUID olish kerak
-                vms = self.vm_manager.get_vms()
-                vm_uuid = None
-                for vm in vms:
-                    if vm.get('name') == self.vm_name:
-                        vm_uuid = vm.get('uuid')
-                        break
+                vm_uuid = self.vm_id or self.vm_manager.get_vm_uuid(self.vm_name)
                         
                 if vm_uuid:
                     success = self.vm_manager.add_hard_disk(vm_uuid, disk_path, size)
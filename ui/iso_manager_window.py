@@ -10,6 +10,9 @@ import threading
 import os
 from utils.iso_manager import ISOManager
 
+# Server Range ni qo'llasa ISO shuncha parallel ulanishda yuklanadi
+DOWNLOAD_CONNECTIONS = 4
+
 class ISOManagerWindow:
     def __init__(self, parent):
         self.parent = parent
@@ -20,6 +23,7 @@ class ISOManagerWindow:
         self.dialog.geometry("800x600")
         self.dialog.transient(parent)
         self.dialog.grab_set()
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
         
         self.setup_ui()
         self.load_isos()
@@ -56,8 +60,15 @@ class ISOManagerWindow:
                   command=self.add_local_iso).pack(side="left", padx=5)
         ttk.Button(button_frame, text="Papkadan skan qilish", 
                   command=self.scan_directory).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Dublikatlarni birlashtirish",
+                  command=self.deduplicate_isos).pack(side="left", padx=5)
         ttk.Button(button_frame, text="Yopish", 
-                  command=self.dialog.destroy).pack(side="right", padx=5)
+                  command=self.close).pack(side="right", padx=5)
+                  
+    def close(self):
+        """Oyna yopilganda yozilmagan o'zgarishlar darhol saqlanadi"""
+        self.iso_manager.store.flush()
+        self.dialog.destroy()
         
     def setup_popular_tab(self):
         """Mashhur ISO'lar tabini sozlash"""
@@ -192,6 +203,9 @@ class ISOManagerWindow:
             if path and os.path.exists(path):
                 iso_info = self.iso_manager.get_iso_info(path)
                 status = "Mavjud"
+                duplicates = len(iso.get("duplicates", []))
+                if duplicates:
+                    status += f" (+{duplicates} dublikat)"
             else:
                 iso_info = {"size": "N/A"}
                 status = "Topilmadi"
@@ -213,12 +227,22 @@ class ISOManagerWindow:
         if not iso_path:
             return
             
-        name = os.path.basename(iso_path)
-        description = f"Mahalliy ISO: {name}"
-        
-        self.iso_manager.add_local_iso(name, iso_path, description)
-        self.load_isos()
-        messagebox.showinfo("Muvaffaqiyat", "ISO fayl qo'shildi")
+        def add_thread():
+            # Fayl SHA-256 bo'yicha ro'yxatga olinadi (dublikat bo'lsa birlashadi)
+            hashes = self.iso_manager.register_isos([iso_path])
+        
+            def finish():
+                self.load_isos()
+                self.status_var.set("Tayyor")
+                if hashes.get(iso_path):
+                    messagebox.showinfo("Muvaffaqiyat", "ISO fayl qo'shildi")
+                else:
+                    messagebox.showerror("Xatolik", "ISO faylni o'qib bo'lmadi")
+                    
+            self.dialog.after(0, finish)
+            
+        self.status_var.set("ISO xeshlanmoqda...")
+        threading.Thread(target=add_thread, daemon=True).start()
         
     def remove_local_iso(self):
         """Mahalliy ISO'ni olib tashlash"""
@@ -260,18 +284,38 @@ class ISOManagerWindow:
             self.status_var.set("Skan qilinmoqda...")
             iso_files = self.iso_manager.scan_local_isos(directory)
             
-            for iso_info in iso_files:
-                name = iso_info.get("name", "")
-                path = iso_info.get("path", "")
-                description = f"Skan qilingan: {name}"
-                
-                self.iso_manager.add_local_iso(name, path, description)
+            self.dialog.after(0, lambda: self.status_var.set(f"{len(iso_files)} ta ISO xeshlanmoqda..."))
+            self.iso_manager.register_isos([iso_info.get("path", "") for iso_info in iso_files],
+                                           "Skan qilingan")
+            duplicates = self.iso_manager.get_duplicate_count()
                 
             self.dialog.after(0, lambda: self.load_isos())
-            self.dialog.after(0, lambda: self.status_var.set("Skan tugadi"))
+            self.dialog.after(0, lambda: self.status_var.set(
+                f"Skan tugadi: {len(iso_files)} ta ISO, {duplicates} ta dublikat"))
             
         threading.Thread(target=scan_thread, daemon=True).start()
         
+    def deduplicate_isos(self):
+        """Dublikat ISO fayllarni hard link bilan birlashtirish"""
+        if not self.iso_manager.get_duplicate_count():
+            messagebox.showinfo("Ma'lumot", "Dublikat ISO fayllar topilmadi")
+            return
+            
+        if not messagebox.askyesno("Tasdiqlash",
+                                   "Dublikat fayllar asosiy faylga hard link bilan almashtirilsinmi?"):
+            return
+            
+        def dedup_thread():
+            result = self.iso_manager.deduplicate_isos()
+            saved = result["saved_bytes"] / (1024 ** 3)
+            message = f"{result['linked']} ta fayl birlashtirildi, {saved:.2f} GB bo'shatildi"
+            
+            self.dialog.after(0, lambda: self.load_isos())
+            self.dialog.after(0, lambda: self.status_var.set(message))
+            
+        self.status_var.set("Dublikatlar tekshirilmoqda...")
+        threading.Thread(target=dedup_thread, daemon=True).start()
+        
     def download_selected_iso(self):
         """Tanlangan ISO'ni yuklab olish"""
         try:
@@ -310,9 +354,27 @@ class ISOManagerWindow:
                 def progress_callback(progress):
                     self.dialog.after(0, lambda: self.progress_var.set(progress))
                     
-                success = self.iso_manager.download_iso(download_url, save_path, progress_callback)
+                # Uzilgan yuklash .part fayldan davom ettiriladi
+                success = self.iso_manager.download_iso(download_url, save_path, progress_callback,
+                                                        connections=DOWNLOAD_CONNECTIONS)
                 
+                expected = self.iso_manager.get_template_checksum(iso_name)
+                if success and expected:
+                    # Shablonda SHA-256 bo'lsa yuklangan fayl tekshiriladi
+                    self.dialog.after(0, lambda: self.status_var.set("Checksum tekshirilmoqda..."))
+                    if not self.iso_manager.verify_iso(save_path, expected):
+                        # Buzilgan fayl qoldirilmaydi - keyingi urinish boshidan yuklaydi
+                        try:
+                            os.remove(save_path)
+                        except OSError as e:
+                            print(f"Buzilgan ISO ni o'chirishda xatolik: {str(e)}")
+                        self.dialog.after(0, lambda: self.status_var.set("Checksum mos kelmadi"))
+                        self.dialog.after(0, lambda: messagebox.showerror(
+                            "Xatolik", "Yuklangan ISO checksum'i shablondagi bilan mos kelmadi"))
+                        return
+                        
                 if success:
+                    self.iso_manager.register_isos([save_path], "Yuklab olingan")
                     self.dialog.after(0, lambda: self.status_var.set("Yuklab olish tugadi"))
                     self.dialog.after(0, lambda: messagebox.showinfo("Muvaffaqiyat", "ISO muvaffaqiyatli yuklab olindi"))
                     self.dialog.after(0, lambda: self.load_isos())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Jobs Panel - Fon vazifalari ro'yxati (holat, jarayon, bekor qilish)
+"""
+
+from tkinter import ttk
+from ui.tree_view import SyncedTreeView
+from utils.job_manager import JobManager, JOB_STATE_LABELS
+
+class JobsPanel:
+    def __init__(self, parent, job_manager: JobManager):
+        self.job_manager = job_manager
+        self.frame = ttk.Frame(parent)
+        self.frame.pack(fill="both", expand=True)
+        
+        # Tugmalar
+        button_frame = ttk.Frame(self.frame)
+        button_frame.pack(fill="x", pady=(0, 5))
+        
+        ttk.Button(button_frame, text="Bekor qilish",
+                  command=self.cancel_selected).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Tugaganlarni tozalash",
+                  command=self.clear_finished).pack(side="left", padx=5)
+                  
+        self.view = SyncedTreeView(self.frame, ("Vazifa", "Holat", "Jarayon", "Xabar"), 180)
+        self.view.show()
+        
+        self.job_manager.add_listener(lambda job: self.refresh())
+        
+    def refresh(self):
+        """Vazifalar ro'yxatini yangilash (Tk threadida)"""
+        self.view.sync(
+            (str(job.id), (
+                job.title,
+                JOB_STATE_LABELS.get(job.state, job.state),
+                f"{job.progress * 100:.0f}%" if job.progress is not None else "",
+                job.error or job.message
+            ))
+            for job in self.job_manager.get_jobs()
+        )
+        
+    def cancel_selected(self):
+        """Tanlangan vazifalarni bekor qilish"""
+        for key in self.view.selected_keys():
+            self.job_manager.cancel(int(key.rstrip("_")))
+            
+    def clear_finished(self):
+        """Tugagan vazifalarni olib tashlash"""
+        self.job_manager.clear_finished()
+        self.refresh()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Log Viewer - Konteyner loglarini jonli kuzatish oynasi
+
+Loglar fon threadida LogBuffer ga yoziladi. Text vidjetida faqat ekranga
+sig'adigan qatorlar turadi va ular ma'lum oraliqda buferdan qayta
+chiziladi - konteyner soniyasiga minglab qator yozsa ham Tk ishi va
+xotira cheklangan bo'ladi.
+"""
+
+import re
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+from tkinter import font as tkfont
+from utils.log_buffer import LogBuffer, MAX_LOG_LINES
+
+# Ko'rinish shu oraliqda buferdan yangilanadi (ms)
+LOG_REFRESH_MS = 200
+# Sichqoncha g'ildiragi bir qadamda shuncha qator suradi
+WHEEL_LINES = 3
+
+class ContainerLogViewer:
+    def __init__(self, parent, docker_manager, container_id: str, name: str,
+                 tail: int = 500, max_lines: int = MAX_LOG_LINES):
+        self.docker_manager = docker_manager
+        self.container_id = container_id
+        self.buffer = LogBuffer(max_lines)
+        self.stop_event = threading.Event()
+        self.stream_error = False
+        # Ko'rinishdagi birinchi qator raqami va ko'rinadigan qatorlar soni
+        self.top = 0
+        self.rows = 30
+        self.rendered = None
+        self.after_id = None
+        # Qidiruv natijalari - qator raqamlari
+        self.matches = []
+        self.match_set = set()
+        self.match_index = -1
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(f"Loglar: {name}")
+        self.dialog.geometry("900x550")
+        self.dialog.transient(parent)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.setup_ui()
+        
+        threading.Thread(target=self.read_logs, args=(tail,), daemon=True).start()
+        self.refresh()
+        
+    def setup_ui(self):
+        toolbar = ttk.Frame(self.dialog, padding="5")
+        toolbar.pack(fill=tk.X)
+        
+        ttk.Label(toolbar, text="Qidirish:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(toolbar, textvariable=self.search_var, width=30)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        search_entry.bind("<Return>", lambda event: self.search())
+        ttk.Button(toolbar, text="Qidirish", command=self.search).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="Oldingi", command=lambda: self.next_match(-1)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="Keyingi", command=lambda: self.next_match(1)).pack(side=tk.LEFT, padx=2)
+        self.regex_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(toolbar, text="Regex", variable=self.regex_var).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(toolbar, text="Tozalash", command=self.clear).pack(side=tk.RIGHT, padx=2)
+        self.follow_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(toolbar, text="Oxirini kuzatish", variable=self.follow_var).pack(side=tk.RIGHT, padx=5)
+        
+        frame = ttk.Frame(self.dialog, padding=(5, 0))
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.text = tk.Text(frame, wrap=tk.NONE, height=self.rows)
+        # Scrollbar Text ga emas, butun buferga bog'langan
+        self.scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        x_scrollbar = ttk.Scrollbar(frame, orient=tk.HORIZONTAL, command=self.text.xview)
+        self.text.configure(xscrollcommand=x_scrollbar.set, state=tk.DISABLED)
+        self.text.tag_configure("match", background="#fff3a0")
+        self.text.tag_configure("current", background="#ffb347")
+        
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        self.line_height = max(1, tkfont.Font(font=self.text.cget("font")).metrics("linespace"))
+        self.text.bind("<Configure>", self.on_configure)
+        self.text.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.text.bind("<Button-4>", self.on_mouse_wheel)
+        self.text.bind("<Button-5>", self.on_mouse_wheel)
+        
+        self.info_var = tk.StringVar()
+        ttk.Label(self.dialog, textvariable=self.info_var, anchor=tk.W).pack(fill=tk.X, padx=5, pady=5)
+        
+    def read_logs(self, tail: int):
+        """Log oqimini buferga yozish (fon threadida)"""
+        ok = self.docker_manager.stream_container_logs(self.container_id, self.buffer.append,
+                                                        self.stop_event, tail)
+        self.buffer.flush()
+        self.stream_error = not ok
+        
+    def refresh(self):
+        """Davriy yangilash - kuzatish yoqilgan bo'lsa oxirgi qatorlar ko'rsatiladi"""
+        if self.follow_var.get():
+            self.top = self.buffer.total - self.rows
+        self.render()
+        self.after_id = self.dialog.after(LOG_REFRESH_MS, self.refresh)
+        
+    def render(self, force: bool = False):
+        """Faqat ko'rinadigan qatorlarni Text ga yozish"""
+        top, lines = self.buffer.window(self.top, self.rows)
+        self.top = top
+        state = (top, self.buffer.total, self.rows)
+        if state == self.rendered and not force:
+            return
+        self.rendered = state
+        
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", "\n".join(lines))
+        current = self.matches[self.match_index] if self.matches else None
+        for row in range(len(lines)):
+            number = top + row
+            if number in self.match_set:
+                self.text.tag_add("current" if number == current else "match",
+                                  f"{row + 1}.0", f"{row + 1}.end")
+        self.text.configure(state=tk.DISABLED)
+        
+        first = self.buffer.first
+        span = self.buffer.total - first
+        if span:
+            self.scrollbar.set((top - first) / span, (top - first + len(lines)) / span)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+            
+        info = f"Buferda {span} qator"
+        dropped = self.buffer.dropped
+        if dropped:
+            info += f", {dropped} ta eski qator tashlab yuborilgan"
+        if self.matches:
+            info += f" | Moslik {self.match_index + 1}/{len(self.matches)}"
+        if self.stream_error:
+            info += " | Log oqimini o'qishda xatolik"
+        self.info_var.set(info)
+        
+    def scroll_to(self, top: int):
+        """Ko'rinishni top qatoriga surish - oxiriga yetganda kuzatish qayta yoqiladi"""
+        self.top = top
+        self.follow_var.set(top >= self.buffer.total - self.rows)
+        self.render(force=True)
+        
+    def on_scrollbar(self, *args):
+        first = self.buffer.first
+        if args[0] == "moveto":
+            self.scroll_to(first + int(float(args[1]) * (self.buffer.total - first)))
+        elif args[0] == "scroll":
+            step = self.rows if args[2] == "pages" else 1
+            self.scroll_to(self.top + int(args[1]) * step)
+            
+    def on_mouse_wheel(self, event):
+        # Linuxda Button-4/5, Windows va macOS da delta
+        up = event.num == 4 or getattr(event, 'delta', 0) > 0
+        self.scroll_to(self.top + (-WHEEL_LINES if up else WHEEL_LINES))
+        return "break"
+        
+    def on_configure(self, event):
+        """Oyna o'lchami o'zgarsa ko'rinadigan qatorlar soni qayta hisoblanadi"""
+        rows = max(1, event.height // self.line_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.render()
+            
+    def search(self):
+        """Buferdagi qatorlardan qidirish - eng yangi moslik ko'rsatiladi"""
+        try:
+            self.matches = self.buffer.search(self.search_var.get(), regex=self.regex_var.get())
+        except re.error as e:
+            messagebox.showerror("Xatolik", f"Noto'g'ri ifoda: {str(e)}")
+            return
+        self.match_set = set(self.matches)
+        self.match_index = len(self.matches) - 1
+        if self.matches:
+            self.scroll_to(self.matches[self.match_index] - self.rows // 2)
+        else:
+            self.render(force=True)
+            self.info_var.set("Hech narsa topilmadi")
+            
+    def next_match(self, step: int):
+        if not self.matches:
+            return
+        self.match_index = (self.match_index + step) % len(self.matches)
+        self.scroll_to(self.matches[self.match_index] - self.rows // 2)
+        
+    def clear(self):
+        """Ko'rinishni tozalash - yangi kelgan loglar ko'rsatilaveradi"""
+        self.buffer.clear()
+        self.matches = []
+        self.match_set = set()
+        self.match_index = -1
+        self.render(force=True)
+        
+    def close(self):
+        """Oyna yopilganda log oqimi ham yopiladi"""
+        self.stop_event.set()
+        if self.after_id is not None:
+            self.dialog.after_cancel(self.after_id)
+            self.after_id = None
+        self.dialog.destroy()
@@ -6,8 +6,44 @@ Asosiy oyna - Barcha VM va konteynerlarni boshqarish uchun GUI
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
-import threading
-from typing import Dict, List
+import queue
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from ui.tree_view import SyncedTreeView
+from ui.jobs_panel import JobsPanel
+from ui.log_viewer import ContainerLogViewer
+from ui.metrics_panel import MetricsPanel
+from managers.image_prewarm import ImagePrewarmer, load_docker_templates
+from managers.image_pull import ImagePullEngine
+from utils.host_capacity import HostCapacity
+from utils.inventory_store import InventoryStore
+from utils.job_manager import JobManager, JOB_DONE, JOB_FAILED, JOB_STATE_LABELS, run_bulk
+from utils.metrics import MetricsCollector, MetricsStore, format_bytes
+from utils.refresh_scheduler import RefreshScheduler
+
+# Fon natijalari navbatini tekshirish oralig'i (ms)
+REFRESH_POLL_MS = 50
+# Avtomatik yangilash rejalashtiruvchisi tick oralig'i (ms)
+SCHEDULER_TICK_MS = 1000
+# Umumiy ko'rinish statistikasi: (sarlavha, inventar kaliti)
+OVERVIEW_STATS = [
+    ("Docker Konteynerlar", "docker_containers"),
+    ("Docker Imagelar", "docker_images"),
+    ("VirtualBox VMlar", "vbox_vms"),
+    ("Hyper-V VMlar", "hyperv_vms")
+]
+
+# Konteyner amali -> DockerManager metodi
+CONTAINER_ACTIONS = {
+    "start": "start_container",
+    "stop": "stop_container",
+    "pause": "pause_container",
+    "resume": "resume_container",
+    "reset": "restart_container",
+    "remove": "remove_container",
+}
 
 class MainWindow:
     def __init__(self, root, docker_manager, vbox_manager, hyperv_manager, config_manager):
@@ -17,8 +53,73 @@ class MainWindow:
         self.hyperv_manager = hyperv_manager
         self.config_manager = config_manager
         
+        # Backendlar parallel so'raladi, natijalar navbat orqali Tk threadiga beriladi
+        self.refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="refresh")
+        self.refresh_queue = queue.Queue()
+        # Fon ishlari tugagach Tk threadida chaqiriladigan callbacklar
+        self.ui_callbacks = queue.Queue()
+        # Uzoq amallar (VM boshqaruvi, konteyner/VM yaratish) shu navbatda bajariladi
+        self.job_manager = JobManager(self.config_manager.get("jobs.max_workers", 3),
+                                      dispatch=self.ui_callbacks.put)
+        self.job_manager.add_listener(self.on_job_update)
+        # Image yuklashlari cheklangan parallellikda, bir xil image bitta yuklashda
+        self.pull_engine = ImagePullEngine(self.docker_manager,
+                                           self.config_manager.get("docker.max_concurrent_pulls", 2))
+        # Shablon imagelari bo'sh vaqtda oldindan yuklanadi (sozlamalarda yoqiladi)
+        self.last_input = time.time()
+        self.prewarmer = ImagePrewarmer(
+            self.docker_manager, self.pull_engine,
+            is_idle=self.is_idle,
+            interval=self.config_manager.get("prewarm.interval", 21600),
+            max_concurrent=self.config_manager.get("prewarm.max_concurrent", 1),
+            max_bandwidth=self.config_manager.get("prewarm.max_bandwidth_mb", 10) * 1024 * 1024,
+            on_pulled=lambda image: self.ui_callbacks.put(lambda: self.on_image_prewarmed(image))
+        )
+        # Barcha ko'rinishlar o'qiydigan umumiy inventar snapshotlari
+        self.inventory = InventoryStore()
+        # Host resurslari fonda o'lchanib keshlanadi (umumiy ko'rinish va VM yaratish uchun)
+        self.host_capacity = HostCapacity(self.inventory, self.docker_manager)
+        self.host_capacity.refresh_async(force=True)
+        self.refresh_waiting = set()
+        # Docker tabida hozir ko'rsatilayotgan ro'yxat: "containers" yoki "images"
+        self.docker_mode = "containers"
+        # Docker events oqimi o'zgartirgan, hali render qilinmagan kalitlar
+        self.docker_dirty = set()
+        
+        # kalit -> (manager, ma'lumot olish funksiyasi, render funksiyasi)
+        self.backend_tasks = {
+            "docker_containers": (self.docker_manager, self.docker_manager.get_containers,
+                                  self.show_docker_containers),
+            "docker_images": (self.docker_manager, self.docker_manager.get_images,
+                              self.show_docker_images),
+            "vbox_vms": (self.vbox_manager, self.vbox_manager.get_vms, self.show_vbox_vms),
+            "hyperv_vms": (self.hyperv_manager, self.hyperv_manager.get_vms, self.show_hyperv_vms)
+        }
+        self.scheduler = RefreshScheduler(self.config_manager, self.backend_tasks)
+        # Jonli metrikalar faqat "Metrikalar" tabi ochiq bo'lganda yig'iladi
+        self.metrics_collector = MetricsCollector(
+            self.docker_manager, self.vbox_manager, self.hyperv_manager, self.inventory,
+            MetricsStore(self.config_manager.get("metrics.history", 60)),
+            interval=self.config_manager.get("metrics.interval", 2),
+            max_streams=self.config_manager.get("metrics.max_streams", 8)
+        )
+        
         self.setup_ui()
+        # Bo'sh vaqtni aniqlash uchun oxirgi klaviatura/sichqoncha bosilishi
+        self.root.bind_all("<Any-KeyPress>", self.on_user_input, add="+")
+        self.root.bind_all("<Any-ButtonPress>", self.on_user_input, add="+")
+        self.root.after(REFRESH_POLL_MS, self.process_refresh_queue)
         self.refresh_all()
+        self.root.after(SCHEDULER_TICK_MS, self.scheduler_tick)
+        
+        # Docker ulanishi fon threadida o'rnatiladi - holati status barda ko'rsatiladi
+        self.docker_manager.add_status_listener(
+            lambda status: self.ui_callbacks.put(lambda: self.on_docker_status(status))
+        )
+        
+        # Docker o'zgarishlari events oqimidan olinadi (polling xarajatisiz)
+        if self.config_manager.get("docker.event_stream", True):
+            self.docker_manager.start_event_watch(on_change=self.on_docker_change)
         
     def setup_ui(self):
         """UI ni sozlash"""
@@ -61,6 +162,10 @@ class MainWindow:
                   command=lambda: self.show_docker_images()).pack(fill="x", pady=2)
         ttk.Button(docker_frame, text="Yangi Konteyner", 
                   command=self.create_docker_container).pack(fill="x", pady=2)
+        ttk.Button(docker_frame, text="Image yuklab olish",
+                  command=self.pull_docker_image).pack(fill="x", pady=2)
+        ttk.Button(docker_frame, text="Disk sarfi",
+                  command=self.show_docker_disk_usage).pack(fill="x", pady=2)
         
         # VirtualBox bo'limi
         vbox_frame = ttk.LabelFrame(nav_frame, text="VirtualBox", padding="5")
@@ -119,9 +224,44 @@ class MainWindow:
         self.hyperv_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.hyperv_frame, text="Hyper-V")
         
+        # Jadvallar bir marta yaratiladi, yangilashda faqat qatorlar o'zgaradi
+        self.container_view = SyncedTreeView(self.docker_frame, ("Name", "Image", "Status", "Created", "Host"),
+                                             150, "Docker mavjud emas yoki ishlamayapti")
+        self.image_view = SyncedTreeView(self.docker_frame, ("Tags", "Size", "Created", "Host"),
+                                         200, "Docker mavjud emas yoki ishlamayapti")
+        self.vbox_view = SyncedTreeView(self.vbox_frame, ("Name", "State", "Memory", "CPUs"),
+                                        150, "VirtualBox mavjud emas yoki ishlamayapti")
+        self.hyperv_view = SyncedTreeView(self.hyperv_frame, ("Name", "State", "Memory", "CPUs"),
+                                          150, "Hyper-V mavjud emas yoki ishlamayapti")
+                                          
+        # Context menu qo'shish
+        self.setup_container_context_menu(self.container_view.tree)
+        self.setup_vm_context_menu(self.vbox_view.tree, "VirtualBox")
+        self.setup_vm_context_menu(self.hyperv_view.tree, "Hyper-V")
+        
         # Umumiy tab
         self.overview_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.overview_frame, text="Umumiy Ko'rinish")
+        self.setup_overview()
+        
+        # Metrikalar tab
+        self.metrics_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.metrics_frame, text="Metrikalar")
+        self.metrics_panel = MetricsPanel(self.metrics_frame, self.metrics_collector)
+        
+        # Vazifalar tab
+        self.jobs_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.jobs_frame, text="Vazifalar")
+        self.jobs_panel = JobsPanel(self.jobs_frame, self.job_manager)
+        
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        
+    def on_tab_changed(self, event=None):
+        """Metrikalar tabi ochilganda namuna olishni boshlash, yopilganda to'xtatish"""
+        if self.notebook.select() == str(self.metrics_frame):
+            self.metrics_panel.start()
+        else:
+            self.metrics_panel.stop()
         
     def setup_status_bar(self, parent):
         """Status bar yaratish"""
@@ -134,214 +274,385 @@ class MainWindow:
         
     def refresh_all(self):
         """Barcha ma'lumotlarni yangilash"""
+        # Oldingi yangilash hali tugamagan bo'lsa yangisini boshlamaymiz
+        if self.refresh_waiting:
+            return
+            
         self.status_var.set("Ma'lumotlar yangilanmoqda...")
         
-        # Thread orqali yangilash
-        def refresh_thread():
+        # Barcha backendlar bir vaqtda so'raladi
+        for key in self.backend_tasks:
+            self.refresh_waiting.add(key)
+            self.submit_fetch(key)
+        
+    def scheduler_tick(self):
+        """Avtomatik yangilash - vaqti kelgan backendlarni so'rash"""
+        if self.scheduler.is_enabled():
+            for key in self.scheduler.due_backends():
+                self.submit_fetch(key)
+            
+        # Oldindan yuklash sozlamalarda o'chirilsa navbatdagilari bekor qilinadi
+        if not self.config_manager.get("prewarm.enabled", False):
+            self.prewarmer.stop()
+        elif self.docker_manager.is_connected and self.is_idle():
+            self.prewarmer.start()
+            
+        self.root.after(SCHEDULER_TICK_MS, self.scheduler_tick)
+        
+    def on_user_input(self, event=None):
+        self.last_input = time.time()
+        
+    def is_idle(self) -> bool:
+        """Foydalanuvchi prewarm.idle_seconds davomida hech narsa bosmagan va vazifalar yo'q"""
+        return (time.time() - self.last_input >= self.config_manager.get("prewarm.idle_seconds", 120)
+                and self.job_manager.active_count() == 0)
+                
+    def on_image_prewarmed(self, image):
+        """Shablon imagesi oldindan yuklandi (Tk threadida)"""
+        self.status_var.set(f"Image oldindan yuklandi: {image}")
+        self.submit_fetch("docker_images")
+        
+    def submit_fetch(self, key):
+        """Ma'lumotni fon threadida olish, natijani Tk threadida render qilish"""
+        # Shu backend so'rovi hali tugamagan - uning natijasi baribir keladi
+        if self.scheduler.backends[key].in_flight:
+            return
+            
+        manager, fetch, render = self.backend_tasks[key]
+        self.scheduler.mark_started(key)
+        
+        def task():
+            started = time.time()
             try:
-                self.show_docker_containers()
-                self.show_vbox_vms()
-                self.show_hyperv_vms()
-                self.show_overview()
-                self.status_var.set("Ma'lumotlar yangilandi")
+                # Backend hali fon threadida tekshirilayotgan bo'lsa natijasini kutish
+                if hasattr(manager, 'wait_ready'):
+                    manager.wait_ready()
+                available = manager.is_available()
+                data = fetch() if available else []
+                self.inventory.update(key, data)
+                return key, data, None, available, time.time() - started
             except Exception as e:
-                self.status_var.set(f"Xatolik: {str(e)}")
+                return key, None, e, False, time.time() - started
                 
-        threading.Thread(target=refresh_thread, daemon=True).start()
+        future = self.refresh_executor.submit(task)
+        future.add_done_callback(lambda f: self.refresh_queue.put(f.result()))
         
-    def show_docker_containers(self):
-        """Docker konteynerlarini ko'rsatish"""
-        # Eski widgetlarni tozalash
-        for widget in self.docker_frame.winfo_children():
-            widget.destroy()
+    def run_in_background(self, func, on_done):
+        """func ni fon threadida bajarish, on_done(result, error) ni Tk threadida chaqirish"""
+        def task():
+            try:
+                result, error = func(), None
+            except Exception as e:
+                result, error = None, e
+            self.ui_callbacks.put(lambda: on_done(result, error))
             
-        if not self.docker_manager.is_available():
-            ttk.Label(self.docker_frame, text="Docker mavjud emas yoki ishlamayapti").pack(pady=20)
-            return
+        self.refresh_executor.submit(task)
+        
+    def on_job_update(self, job):
+        """Vazifa holati o'zgardi (Tk threadida)"""
+        if job.is_finished:
+            self.status_var.set(f"{job.title}: {JOB_STATE_LABELS.get(job.state, job.state)}")
+        
+    def on_docker_status(self, status):
+        """Docker ulanish holati o'zgardi (Tk threadida)"""
+        messages = {
+            "connecting": "Docker ga ulanilmoqda...",
+            "connected": "Docker ga ulandi",
+            "retrying": "Docker ga ulanib bo'lmadi, qayta urinilmoqda...",
+            "disconnected": "Docker bilan aloqa uzildi"
+        }
+        self.status_var.set(messages.get(status, status))
+        
+        # Ulanish tiklanganda backoff kutilmasdan darhol yangilanadi
+        if status == "connected":
+            self.submit_fetch("docker_containers")
+            self.submit_fetch("docker_images")
+        elif status == "disconnected":
+            # Qo'shimcha endpointlar bo'lsa ularning konteynerlari qoladi
+            self.submit_fetch("docker_containers")
+        
+    def on_docker_change(self, kind):
+        """Docker events jadvali o'zgardi (fon threadidan chaqiriladi)"""
+        # Faqat belgi qo'yiladi - render Tk threadida, bir nechta hodisa birlashtiriladi
+        self.docker_dirty.add("docker_containers" if kind == "containers" else "docker_images")
+        
+    def process_refresh_queue(self):
+        """Fon threadlaridan kelgan natijalarni Tk threadida qo'llash"""
+        updated = False
+        
+        # Events jadvalidan o'qish arzon - API ga so'rov yuborilmaydi,
+        # qo'shimcha endpointlarning oxirgi natijalari ishlatiladi
+        while self.docker_dirty and self.docker_manager.is_event_synced():
+            key = self.docker_dirty.pop()
+            if key == "docker_containers":
+                data = self.docker_manager.get_containers(cached_only=True)
+            else:
+                data = self.docker_manager.get_images(cached_only=True)
+            self.inventory.update(key, data)
+            self.backend_tasks[key][2](data)
+            updated = True
             
-        # Treeview yaratish
-        columns = ("Name", "Image", "Status", "Created")
-        tree = ttk.Treeview(self.docker_frame, columns=columns, show="headings")
-        
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=150)
+        try:
+            while True:
+                self.ui_callbacks.get_nowait()()
+        except queue.Empty:
+            pass
+            
+        try:
+            while True:
+                key, data, error, available, duration = self.refresh_queue.get_nowait()
+                self.scheduler.mark_finished(key, duration, available and error is None, data)
+                
+                if error is not None:
+                    self.status_var.set(f"Xatolik: {str(error)}")
+                else:
+                    updated = True
+                    try:
+                        self.backend_tasks[key][2](data)
+                    except Exception as e:
+                        self.status_var.set(f"Xatolik: {str(e)}")
+                            
+                if key in self.refresh_waiting:
+                    self.refresh_waiting.discard(key)
+                    if not self.refresh_waiting and error is None:
+                        self.status_var.set("Ma'lumotlar yangilandi")
+        except queue.Empty:
+            pass
+            
+        # Umumiy ko'rinish snapshotlardan hisoblanadi - backendga qo'shimcha so'rov yo'q
+        if updated:
+            self.show_overview()
             
-        # Scrollbar qo'shish
-        scrollbar = ttk.Scrollbar(self.docker_frame, orient="vertical", command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
+        self.root.after(REFRESH_POLL_MS, self.process_refresh_queue)
         
-        tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+    def show_docker_containers(self, containers=None):
+        """Docker konteynerlarini ko'rsatish"""
+        # Ma'lumot berilmagan bo'lsa fon threadida olinadi
+        if containers is None:
+            self.docker_mode = "containers"
+            self.submit_fetch("docker_containers")
+            return
+            
+        if not self.docker_manager.is_available():
+            if self.docker_mode == "containers":
+                self.image_view.hide()
+                self.container_view.show_message()
+            return
         
-        # Ma'lumotlarni yuklash
-        containers = self.docker_manager.get_containers()
-        for container in containers:
-            tree.insert("", "end", values=(
+        # Faqat o'zgargan qatorlar yangilanadi
+        self.container_view.sync(
+            (container.get('id') or container.get('name', ''), (
                 container.get('name', ''),
                 container.get('image', ''),
                 container.get('status', ''),
-                container.get('created', '')[:19] if container.get('created') else ''
+                container.get('created', '')[:19] if container.get('created') else '',
+                self.format_host(container)
             ))
+            for container in containers
+        )
+        
+        unresponsive = [name for name, state in self.docker_manager.get_endpoint_states().items()
+                        if state in ("timeout", "error")]
+        if unresponsive:
+            self.status_var.set(f"Javob bermagan Docker hostlar: {', '.join(unresponsive)}")
+            
+        # Fon yangilashi foydalanuvchi tanlagan ro'yxatni almashtirmaydi
+        if self.docker_mode == "containers":
+            self.image_view.hide()
+            self.container_view.show()
             
-    def show_docker_images(self):
+    def show_docker_images(self, images=None):
         """Docker imagelarini ko'rsatish"""
-        # Docker tabga o'tish
-        self.notebook.select(self.docker_frame)
+        if images is None:
+            # Docker tabga o'tish
+            self.notebook.select(self.docker_frame)
+            self.docker_mode = "images"
+            self.submit_fetch("docker_images")
+            return
         
-        # Eski widgetlarni tozalash
-        for widget in self.docker_frame.winfo_children():
-            widget.destroy()
-            
         if not self.docker_manager.is_available():
-            ttk.Label(self.docker_frame, text="Docker mavjud emas yoki ishlamayapti").pack(pady=20)
+            if self.docker_mode == "images":
+                self.container_view.hide()
+                self.image_view.show_message()
             return
-            
-        # Treeview yaratish
-        columns = ("Tags", "Size", "Created")
-        tree = ttk.Treeview(self.docker_frame, columns=columns, show="headings")
-        
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=200)
-            
-        # Scrollbar qo'shish
-        scrollbar = ttk.Scrollbar(self.docker_frame, orient="vertical", command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
         
-        tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Ma'lumotlarni yuklash
-        images = self.docker_manager.get_images()
+        rows = []
         for image in images:
             tags = ', '.join(image.get('tags', [])) if image.get('tags') else 'None'
             size_mb = image.get('size', 0) // (1024 * 1024)
-            tree.insert("", "end", values=(
+            rows.append((image.get('id') or tags, (
                 tags,
                 f"{size_mb} MB",
-                image.get('created', '')[:19] if image.get('created') else ''
-            ))
+                image.get('created', '')[:19] if image.get('created') else '',
+                self.format_host(image)
+            )))
+        self.image_view.sync(rows)
+            
+        if self.docker_mode == "images":
+            self.container_view.hide()
+            self.image_view.show()
             
-    def show_vbox_vms(self):
+    def format_host(self, item):
+        """Host ustuni - timeoutga tushgan hostning eski natijasi belgilanadi"""
+        host = item.get('host', '')
+        return f"{host} (javob yo'q)" if item.get('stale') else host
+            
+    def show_vbox_vms(self, vms=None):
         """VirtualBox VMlarini ko'rsatish"""
-        # Eski widgetlarni tozalash
-        for widget in self.vbox_frame.winfo_children():
-            widget.destroy()
+        if vms is None:
+            self.submit_fetch("vbox_vms")
+            return
             
         if not self.vbox_manager.is_available():
-            ttk.Label(self.vbox_frame, text="VirtualBox mavjud emas yoki ishlamayapti").pack(pady=20)
+            self.vbox_view.show_message()
             return
             
-        # Treeview yaratish
-        columns = ("Name", "State", "Memory", "CPUs")
-        tree = ttk.Treeview(self.vbox_frame, columns=columns, show="headings")
-        
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=150)
-            
-        # Scrollbar qo'shish
-        scrollbar = ttk.Scrollbar(self.vbox_frame, orient="vertical", command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        
-        tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Ma'lumotlarni yuklash
-        vms = self.vbox_manager.get_vms()
-        for vm in vms:
-            tree.insert("", "end", values=(
+        self.vbox_view.show()
+        self.vbox_view.sync(
+            (vm.get('uuid') or vm.get('name', ''), (
                 vm.get('name', ''),
                 vm.get('state', ''),
                 vm.get('memory', ''),
                 vm.get('cpus', '')
             ))
+            for vm in vms
+        )
             
-        # Context menu qo'shish
-        self.setup_vm_context_menu(tree, "VirtualBox")
-            
-    def show_hyperv_vms(self):
+    def show_hyperv_vms(self, vms=None):
         """Hyper-V VMlarini ko'rsatish"""
-        # Eski widgetlarni tozalash
-        for widget in self.hyperv_frame.winfo_children():
-            widget.destroy()
+        if vms is None:
+            self.submit_fetch("hyperv_vms")
+            return
             
         if not self.hyperv_manager.is_available():
-            ttk.Label(self.hyperv_frame, text="Hyper-V mavjud emas yoki ishlamayapti").pack(pady=20)
+            self.hyperv_view.show_message()
             return
             
-        # Treeview yaratish
-        columns = ("Name", "State", "Memory", "CPUs")
-        tree = ttk.Treeview(self.hyperv_frame, columns=columns, show="headings")
-        
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=150)
-            
-        # Scrollbar qo'shish
-        scrollbar = ttk.Scrollbar(self.hyperv_frame, orient="vertical", command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        
-        tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Ma'lumotlarni yuklash
-        vms = self.hyperv_manager.get_vms()
-        for vm in vms:
-            tree.insert("", "end", values=(
+        self.hyperv_view.show()
+        self.hyperv_view.sync(
+            (vm.get('id') or vm.get('name', ''), (
                 vm.get('name', ''),
                 vm.get('state', ''),
                 vm.get('memory', ''),
                 vm.get('cpus', '')
             ))
+            for vm in vms
+        )
             
-        # Context menu qo'shish
-        self.setup_vm_context_menu(tree, "Hyper-V")
-            
-    def show_overview(self):
-        """Umumiy ko'rinish"""
-        # Eski widgetlarni tozalash
-        for widget in self.overview_frame.winfo_children():
-            widget.destroy()
-            
-        # Statistikalar
+    def setup_overview(self):
+        """Umumiy ko'rinish widgetlari bir marta yaratiladi, keyin faqat matni yangilanadi"""
         stats_frame = ttk.LabelFrame(self.overview_frame, text="Statistika", padding="10")
         stats_frame.pack(fill="x", pady=(0, 10))
         
-        # Docker statistikasi
-        docker_containers = len(self.docker_manager.get_containers()) if self.docker_manager.is_available() else 0
-        docker_images = len(self.docker_manager.get_images()) if self.docker_manager.is_available() else 0
-        
-        # VirtualBox statistikasi
-        vbox_vms = len(self.vbox_manager.get_vms()) if self.vbox_manager.is_available() else 0
-        
-        # Hyper-V statistikasi
-        hyperv_vms = len(self.hyperv_manager.get_vms()) if self.hyperv_manager.is_available() else 0
-        
-        # Statistikalar ko'rsatish
-        ttk.Label(stats_frame, text=f"Docker Konteynerlar: {docker_containers}").pack(anchor="w")
-        ttk.Label(stats_frame, text=f"Docker Imagelar: {docker_images}").pack(anchor="w")
-        ttk.Label(stats_frame, text=f"VirtualBox VMlar: {vbox_vms}").pack(anchor="w")
-        ttk.Label(stats_frame, text=f"Hyper-V VMlar: {hyperv_vms}").pack(anchor="w")
-        
+        self.overview_labels = {}
+        for label, key in OVERVIEW_STATS:
+            self.overview_labels[key] = ttk.Label(stats_frame)
+            self.overview_labels[key].pack(anchor="w")
+        
+        # Host ma'lumoti birinchi o'lchovdan keyin ko'rsatiladi
+        self.host_frame = ttk.LabelFrame(self.overview_frame, text="Host resurslari", padding="10")
+        self.host_label = ttk.Label(self.host_frame, justify="left")
+        self.host_label.pack(anchor="w")
+        self.host_warning_label = ttk.Label(self.host_frame, text="Ogohlantirish: ishlayotgan VM va konteynerlarga "
+                                            "hostdagidan ko'p xotira ajratilgan", foreground="red")
+        self.host_frame_visible = False
+        self.host_warning_visible = False
+        # Widget -> oxirgi matn, o'zgarmagan matn qayta o'rnatilmaydi
+        self.overview_texts = {}
+        
+    def set_overview_text(self, widget, text):
+        if self.overview_texts.get(widget) != text:
+            self.overview_texts[widget] = text
+            widget.config(text=text)
+            
+    def show_overview(self):
+        """Umumiy ko'rinish - inventar snapshotlaridan, widgetlar qayta yaratilmaydi"""
+        for label, key in OVERVIEW_STATS:
+            timestamp = self.inventory.get_timestamp(key)
+            updated = time.strftime("%H:%M:%S", time.localtime(timestamp)) if timestamp else "-"
+            self.set_overview_text(self.overview_labels[key],
+                                   f"{label}: {self.inventory.count(key)} (yangilangan: {updated})")
+        
+        self.show_host_capacity()
+        
+    def show_host_capacity(self):
+        """Host resurslari va VM/konteynerlarga ajratilgan qism (keshdan)"""
+        self.host_capacity.refresh_async()
+        summary = self.host_capacity.summary()
+        if not summary.get('memory_total'):
+            return
+            
+        if not self.host_frame_visible:
+            self.host_frame.pack(fill="x", pady=(0, 10))
+            self.host_frame_visible = True
+        
+        lines = [
+            f"Xotira: {format_bytes(summary['memory_total'])} "
+            f"(bo'sh: {format_bytes(summary['memory_available'])})",
+            f"CPU: {summary['cpu_count']} ta ({summary['cpu_percent']:.0f}% band)",
+            f"Ajratilgan xotira: {format_bytes(summary['committed_memory'])} "
+            f"({summary['memory_commit_ratio'] * 100:.0f}%, konteynerlar: "
+            f"{format_bytes(summary['container_memory'])})",
+            f"Ajratilgan CPU: {summary['committed_cpus']} ta ({summary['cpu_commit_ratio'] * 100:.0f}%)",
+            f"Barcha VMlar sozlangan xotirasi: {format_bytes(summary['configured_memory'])}",
+        ]
+        if 'disk_total' in summary:
+            lines.append(f"Disk: {format_bytes(summary['disk_free'])} bo'sh / {format_bytes(summary['disk_total'])}")
+        self.set_overview_text(self.host_label, "\n".join(lines))
+            
+        overcommitted = summary['memory_commit_ratio'] > 1
+        if overcommitted != self.host_warning_visible:
+            if overcommitted:
+                self.host_warning_label.pack(anchor="w")
+            else:
+                self.host_warning_label.pack_forget()
+            self.host_warning_visible = overcommitted
+                                       
     def create_docker_container(self):
         """Yangi Docker konteyner yaratish"""
-        dialog = ContainerCreateDialog(self.root, self.docker_manager)
-        self.root.wait_window(dialog.dialog)
-        self.show_docker_containers()
+        # Yaratish fon vazifasi - ro'yxat vazifa tugaganda yangilanadi
+        ContainerCreateDialog(self.root, self.docker_manager, self.job_manager,
+                              on_done=lambda job: self.show_docker_containers(),
+                              pull_engine=self.pull_engine)
+                              
+    def pull_docker_image(self):
+        """Imageni fon vazifasida yuklab olish"""
+        image_name = simpledialog.askstring("Image yuklab olish", "Image nomi (masalan: nginx:latest):",
+                                            parent=self.root)
+        if not image_name or not image_name.strip():
+            return
+            
+        image_name = image_name.strip()
+        
+        def on_done(job):
+            if job.state == JOB_DONE:
+                self.submit_fetch("docker_images")
+                
+        self.job_manager.submit(
+            f"Docker: {image_name} yuklab olish",
+            lambda job: self.pull_engine.pull(image_name, job.set_progress, job.cancel_event),
+            on_done
+        )
         
     def create_vbox_vm(self):
         """Yangi VirtualBox VM yaratish"""
-        dialog = VMCreateDialog(self.root, self.vbox_manager, "VirtualBox")
-        self.root.wait_window(dialog.dialog)
-        self.show_vbox_vms()
+        VMCreateDialog(self.root, self.vbox_manager, "VirtualBox", self.job_manager,
+                       on_done=lambda job: self.show_vbox_vms(), host_capacity=self.host_capacity)
         
     def create_hyperv_vm(self):
         """Yangi Hyper-V VM yaratish"""
-        dialog = VMCreateDialog(self.root, self.hyperv_manager, "Hyper-V")
-        self.root.wait_window(dialog.dialog)
-        self.show_hyperv_vms()
+        VMCreateDialog(self.root, self.hyperv_manager, "Hyper-V", self.job_manager,
+                       on_done=lambda job: self.show_hyperv_vms(), host_capacity=self.host_capacity)
+                       
+    def show_docker_disk_usage(self):
+        """Docker disk sarfi va tozalash oynasi"""
+        from ui.docker_disk_window import DockerDiskWindow
+        
+        def on_change():
+            self.submit_fetch("docker_containers")
+            self.submit_fetch("docker_images")
+            
+        DockerDiskWindow(self.root, self.docker_manager, self.job_manager, on_change=on_change)
         
     def show_iso_manager(self):
         """ISO boshqaruv oynasini ko'rsatish"""
@@ -353,6 +664,122 @@ class MainWindow:
         from ui.settings_window import SettingsWindow
         SettingsWindow(self.root, self.config_manager)
         
+    def setup_container_context_menu(self, tree):
+        """Konteyner uchun context menu yaratish"""
+        context_menu = tk.Menu(self.root, tearoff=0)
+        
+        context_menu.add_command(label="Batafsil ma'lumot",
+                               command=lambda: self.show_container_details(tree))
+        context_menu.add_command(label="Loglar",
+                               command=lambda: self.show_container_logs(tree))
+        context_menu.add_separator()
+        context_menu.add_command(label="Ishga tushirish",
+                               command=lambda: self.container_action(tree, "start"))
+        context_menu.add_command(label="To'xtatish",
+                               command=lambda: self.container_action(tree, "stop"))
+        context_menu.add_command(label="Pauza",
+                               command=lambda: self.container_action(tree, "pause"))
+        context_menu.add_command(label="Davom ettirish",
+                               command=lambda: self.container_action(tree, "resume"))
+        context_menu.add_command(label="Qayta ishga tushirish",
+                               command=lambda: self.container_action(tree, "reset"))
+        context_menu.add_command(label="O'chirish",
+                               command=lambda: self.container_action(tree, "remove"))
+                               
+        def show_context_menu(event):
+            try:
+                item = tree.selection()[0]
+                context_menu.post(event.x_root, event.y_root)
+            except IndexError:
+                pass
+                
+        tree.bind("<Button-3>", show_context_menu)  # Right click
+        tree.bind("<Double-1>", lambda event: self.show_container_details(tree))
+        
+    def container_action(self, tree, action):
+        """Tanlangan konteynerlar ustida amal bajarish"""
+        # Qator iid si konteyner ID si
+        containers = {item: str(tree.item(item)['values'][0]) for item in tree.selection()}
+        if not containers:
+            messagebox.showwarning("Ogohlantirish", "Konteyner tanlang")
+            return
+            
+        if action == "remove" and not messagebox.askyesno(
+                "Tasdiqlash", f"{len(containers)} ta konteynerni o'chirishni xohlaysizmi?"):
+            return
+            
+        method = getattr(self.docker_manager, CONTAINER_ACTIONS[action])
+        self.submit_bulk_action("Docker", action, containers, method, self.show_docker_containers)
+        
+    def submit_bulk_action(self, kind, action, items, method, refresh, bulk_func=None):
+        """Bir yoki bir nechta element uchun amalni fon vazifasi sifatida bajarish
+        
+        items - element ID -> nom. Bir nechta element parallel bajariladi
+        (jobs.bulk_concurrency), bulk_func berilsa hammasi bitta chaqiruvda.
+        """
+        names = list(items.values())
+        if len(items) == 1:
+            item_id = next(iter(items))
+            title = f"{kind}: {names[0]} - {action}"
+            func = lambda job: method(item_id)
+        elif bulk_func is not None:
+            title = f"{kind}: {len(items)} ta - {action}"
+            func = lambda job: bulk_func(names)
+        else:
+            title = f"{kind}: {len(items)} ta - {action}"
+            concurrency = self.config_manager.get("jobs.bulk_concurrency", 4)
+            func = lambda job: run_bulk(job, items, method, concurrency)
+            
+        def on_done(job):
+            # Ommaviy amalda natija har bir element uchun alohida (nom -> muvaffaqiyat)
+            if isinstance(job.result, dict):
+                failed = [name for name, success in job.result.items() if not success]
+            else:
+                failed = names if job.state == JOB_FAILED else []
+                
+            if job.state != JOB_FAILED or isinstance(job.result, dict):
+                refresh()
+            if failed:
+                messagebox.showerror("Xatolik", f"{action} amalida xatolik:\n" + "\n".join(failed))
+                
+        # Amal fon vazifasi sifatida bajariladi - UI bloklanmaydi
+        self.job_manager.submit(title, func, on_done)
+        self.status_var.set(f"{title} - navbatga qo'shildi")
+        
+    def show_container_details(self, tree):
+        """Konteynerning to'liq ma'lumotini ko'rsatish"""
+        try:
+            # Qator iid si konteyner ID si
+            container_id = tree.selection()[0]
+        except IndexError:
+            messagebox.showwarning("Ogohlantirish", "Konteyner tanlang")
+            return
+            
+        # Ro'yxat sparse rejimda olinadi - to'liq inspect faqat shu yerda so'raladi
+        self.status_var.set("Konteyner ma'lumotlari olinmoqda...")
+        
+        def on_done(details, error):
+            if error is not None or not details:
+                self.status_var.set("Konteyner ma'lumotlarini olishda xatolik")
+                return
+            self.status_var.set("Tayyor")
+            ContainerDetailsDialog(self.root, details)
+            
+        self.run_in_background(lambda: self.docker_manager.get_container_details(container_id), on_done)
+        
+    def show_container_logs(self, tree):
+        """Tanlangan konteyner loglarini jonli kuzatish oynasi"""
+        try:
+            container_id = tree.selection()[0]
+        except IndexError:
+            messagebox.showwarning("Ogohlantirish", "Konteyner tanlang")
+            return
+            
+        name = str(tree.item(container_id)['values'][0])
+        ContainerLogViewer(self.root, self.docker_manager, container_id, name,
+                           tail=self.config_manager.get("container_logs.tail", 500),
+                           max_lines=self.config_manager.get("container_logs.max_lines", 10000))
+        
     def setup_vm_context_menu(self, tree, vm_type):
         """VM uchun context menu yaratish"""
         context_menu = tk.Menu(self.root, tearoff=0)
@@ -367,6 +794,8 @@ class MainWindow:
                                command=lambda: self.vm_action(tree, "resume", vm_type))
         context_menu.add_command(label="Qayta ishga tushirish", 
                                command=lambda: self.vm_action(tree, "reset", vm_type))
+        context_menu.add_command(label="O'chirish",
+                               command=lambda: self.vm_action(tree, "remove", vm_type))
         context_menu.add_separator()
         context_menu.add_command(label="ISO ulash", 
                                command=lambda: self.attach_iso(tree, vm_type))
@@ -385,59 +814,52 @@ class MainWindow:
                 
         tree.bind("<Button-3>", show_context_menu)  # Right click
         
+    def get_vbox_uuid(self, item, vm_name):
+        """VirtualBox qatori uchun UUID (qatorlar UUID kaliti bilan yaratiladi)"""
+        if item in self.vbox_view.rows and item != vm_name:
+            return item
+        return self.vbox_manager.get_vm_uuid(vm_name)
+        
     def vm_action(self, tree, action, vm_type):
-        """VM boshqaruv amallarini bajarish"""
+        """VM boshqaruv amallarini bajarish (barcha tanlangan VMlar uchun)"""
         try:
-            selected_item = tree.selection()[0]
-            vm_name = tree.item(selected_item)['values'][0]
+            selected_items = tree.selection()
+            if not selected_items:
+                raise IndexError()
             
-            if vm_type == "VirtualBox":
-                # UUID olish kerak VirtualBox uchun
-                vms = self.vbox_manager.get_vms()
-                vm_uuid = None
-                for vm in vms:
-                    if vm.get('name') == vm_name:
-                        vm_uuid = vm.get('uuid')
-                        break
-                        
-                if not vm_uuid:
-                    messagebox.showerror("Xatolik", "VM UUID topilmadi")
-                    return
+            # VM ID -> nom
+            vms = {}
+            for selected_item in selected_items:
+                vm_name = str(tree.item(selected_item)['values'][0])
+                
+                if vm_type == "VirtualBox":
+                    # Qator iid si VM UUID si - VBoxManage qayta so'ralmaydi
+                    vm_uuid = self.get_vbox_uuid(selected_item, vm_name)
                     
-                success = False
-                if action == "start":
-                    success = self.vbox_manager.start_vm(vm_uuid)
-                elif action == "stop":
-                    success = self.vbox_manager.stop_vm(vm_uuid)
-                elif action == "pause":
-                    success = self.vbox_manager.pause_vm(vm_uuid)
-                elif action == "resume":
-                    success = self.vbox_manager.resume_vm(vm_uuid)
-                elif action == "reset":
-                    success = self.vbox_manager.reset_vm(vm_uuid)
+                    if not vm_uuid:
+                        messagebox.showerror("Xatolik", f"VM UUID topilmadi: {vm_name}")
+                        return
+                    vms[vm_uuid] = vm_name
+                else:
+                    vms[vm_name] = vm_name
                     
+            if action == "remove" and not messagebox.askyesno(
+                    "Tasdiqlash", f"{len(vms)} ta VMni o'chirishni xohlaysizmi?"):
+                return
+                
+            bulk_func = None
+            if vm_type == "VirtualBox":
+                manager, refresh = self.vbox_manager, self.show_vbox_vms
             elif vm_type == "Hyper-V":
-                success = False
-                if action == "start":
-                    success = self.hyperv_manager.start_vm(vm_name)
-                elif action == "stop":
-                    success = self.hyperv_manager.stop_vm(vm_name)
-                elif action == "pause":
-                    success = self.hyperv_manager.pause_vm(vm_name)
-                elif action == "resume":
-                    success = self.hyperv_manager.resume_vm(vm_name)
-                elif action == "reset":
-                    success = self.hyperv_manager.reset_vm(vm_name)
-                    
-            if success:
-                messagebox.showinfo("Muvaffaqiyat", f"VM {action} amali muvaffaqiyatli bajarildi")
-                # Ma'lumotlarni yangilash
-                if vm_type == "VirtualBox":
-                    self.show_vbox_vms()
-                elif vm_type == "Hyper-V":
-                    self.show_hyperv_vms()
+                manager, refresh = self.hyperv_manager, self.show_hyperv_vms
+                # Hyper-V cmdletlari bir nechta nomni qabul qiladi - bitta PowerShell chaqiruvi
+                bulk_func = lambda names: self.hyperv_manager.bulk_vm_action(action, names)
             else:
-                messagebox.showerror("Xatolik", f"VM {action} amalida xatolik")
+                return
+                    
+            # start_vm, stop_vm, pause_vm, resume_vm, reset_vm, remove_vm
+            method = getattr(manager, f"{action}_vm")
+            self.submit_bulk_action(vm_type, action, vms, method, refresh, bulk_func)
                 
         except IndexError:
             messagebox.showwarning("Ogohlantirish", "VM tanlang")
@@ -461,12 +883,7 @@ class MainWindow:
                 
             success = False
             if vm_type == "VirtualBox":
-                vms = self.vbox_manager.get_vms()
-                vm_uuid = None
-                for vm in vms:
-                    if vm.get('name') == vm_name:
-                        vm_uuid = vm.get('uuid')
-                        break
+                vm_uuid = self.get_vbox_uuid(selected_item, vm_name)
                         
                 if vm_uuid:
                     success = self.vbox_manager.attach_iso(vm_uuid, iso_path)
@@ -492,12 +909,7 @@ class MainWindow:
             
             success = False
             if vm_type == "VirtualBox":
-                vms = self.vbox_manager.get_vms()
-                vm_uuid = None
-                for vm in vms:
-                    if vm.get('name') == vm_name:
-                        vm_uuid = vm.get('uuid')
-                        break
+                vm_uuid = self.get_vbox_uuid(selected_item, vm_name)
                         
                 if vm_uuid:
                     success = self.vbox_manager.detach_iso(vm_uuid)
@@ -524,9 +936,11 @@ class MainWindow:
             from ui.hard_disk_manager_window import HardDiskManagerWindow
             
             if vm_type == "VirtualBox":
-                HardDiskManagerWindow(self.root, self.vbox_manager, vm_name, vm_type)
+                HardDiskManagerWindow(self.root, self.vbox_manager, vm_name, vm_type,
+                                      self.get_vbox_uuid(selected_item, vm_name), self.job_manager)
             elif vm_type == "Hyper-V":
-                HardDiskManagerWindow(self.root, self.hyperv_manager, vm_name, vm_type)
+                HardDiskManagerWindow(self.root, self.hyperv_manager, vm_name, vm_type,
+                                      job_manager=self.job_manager)
             else:
                 messagebox.showerror("Xatolik", "Hard disk boshqaruvi bu VM turi uchun qo'llab-quvvatlanmaydi")
                 
@@ -536,12 +950,41 @@ class MainWindow:
             messagebox.showerror("Xatolik", f"Hard disk boshqaruv oynasini ochishda xatolik: {str(e)}")
 
 
+class ContainerDetailsDialog:
+    def __init__(self, parent, details: Dict):
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(f"Konteyner: {details.get('Name', '').lstrip('/')}")
+        self.dialog.geometry("600x500")
+        self.dialog.transient(parent)
+        
+        frame = ttk.Frame(self.dialog, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        text = tk.Text(frame, wrap=tk.NONE)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=text.yview)
+        text.configure(yscrollcommand=scrollbar.set)
+        
+        text.insert(tk.END, json.dumps(details, indent=2, ensure_ascii=False))
+        text.configure(state=tk.DISABLED)
+        
+        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        ttk.Button(self.dialog, text="Yopish", command=self.dialog.destroy).pack(pady=5)
+
+
 class ContainerCreateDialog:
-    def __init__(self, parent, docker_manager):
+    def __init__(self, parent, docker_manager, job_manager, on_done=None, pull_engine=None):
         self.docker_manager = docker_manager
+        self.job_manager = job_manager
+        self.on_done = on_done
+        self.pull_engine = pull_engine or ImagePullEngine(docker_manager)
+        self.templates = load_docker_templates()
+        # Tanlangan shablon (muhit o'zgaruvchilari shundan olinadi)
+        self.template = None
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Yangi Docker Konteyner")
-        self.dialog.geometry("400x300")
+        self.dialog.geometry("400x330")
         self.dialog.transient(parent)
         self.dialog.grab_set()
         
@@ -551,28 +994,44 @@ class ContainerCreateDialog:
         frame = ttk.Frame(self.dialog, padding="10")
         frame.pack(fill="both", expand=True)
         
+        # Template
+        ttk.Label(frame, text="Shablon:").grid(row=0, column=0, sticky="w", pady=5)
+        self.template_var = tk.StringVar()
+        template_combo = ttk.Combobox(frame, textvariable=self.template_var, state="readonly", width=27,
+                                      values=[template.get('name', '') for template in self.templates])
+        template_combo.grid(row=0, column=1, pady=5)
+        template_combo.bind("<<ComboboxSelected>>", self.on_template_selected)
+        
         # Image name
-        ttk.Label(frame, text="Image nomi:").grid(row=0, column=0, sticky="w", pady=5)
+        ttk.Label(frame, text="Image nomi:").grid(row=1, column=0, sticky="w", pady=5)
         self.image_var = tk.StringVar(value="ubuntu:latest")
-        ttk.Entry(frame, textvariable=self.image_var, width=30).grid(row=0, column=1, pady=5)
+        ttk.Entry(frame, textvariable=self.image_var, width=30).grid(row=1, column=1, pady=5)
         
         # Container name
-        ttk.Label(frame, text="Konteyner nomi:").grid(row=1, column=0, sticky="w", pady=5)
+        ttk.Label(frame, text="Konteyner nomi:").grid(row=2, column=0, sticky="w", pady=5)
         self.name_var = tk.StringVar()
-        ttk.Entry(frame, textvariable=self.name_var, width=30).grid(row=1, column=1, pady=5)
+        ttk.Entry(frame, textvariable=self.name_var, width=30).grid(row=2, column=1, pady=5)
         
         # Ports
-        ttk.Label(frame, text="Portlar (masalan: 8080:80):").grid(row=2, column=0, sticky="w", pady=5)
+        ttk.Label(frame, text="Portlar (masalan: 8080:80):").grid(row=3, column=0, sticky="w", pady=5)
         self.ports_var = tk.StringVar()
-        ttk.Entry(frame, textvariable=self.ports_var, width=30).grid(row=2, column=1, pady=5)
+        ttk.Entry(frame, textvariable=self.ports_var, width=30).grid(row=3, column=1, pady=5)
         
         # Buttons
         button_frame = ttk.Frame(frame)
-        button_frame.grid(row=3, column=0, columnspan=2, pady=20)
+        button_frame.grid(row=4, column=0, columnspan=2, pady=20)
         
         ttk.Button(button_frame, text="Yaratish", command=self.create_container).pack(side="left", padx=5)
         ttk.Button(button_frame, text="Bekor qilish", command=self.dialog.destroy).pack(side="left", padx=5)
         
+    def on_template_selected(self, event=None):
+        """Shablon tanlanganda image va portlar to'ldiriladi"""
+        name = self.template_var.get()
+        self.template = next((template for template in self.templates if template.get('name') == name), None)
+        if self.template is not None:
+            self.image_var.set(self.template.get('image', ''))
+            self.ports_var.set(self.template.get('ports', ''))
+        
     def create_container(self):
         image_name = self.image_var.get()
         container_name = self.name_var.get()
@@ -593,23 +1052,46 @@ class ContainerCreateDialog:
                 messagebox.showerror("Xatolik", "Port format noto'g'ri. Masalan: 8080:80")
                 return
                 
-        success = self.docker_manager.run_container(
-            image_name, 
-            name=container_name if container_name else None,
-            ports=ports if ports else None
-        )
-        
-        if success:
-            messagebox.showinfo("Muvaffaqiyat", "Konteyner muvaffaqiyatli yaratildi")
-            self.dialog.destroy()
-        else:
-            messagebox.showerror("Xatolik", "Konteyner yaratishda xatolik")
+        # Shablon imagesi o'zgartirilmagan bo'lsa uning muhit o'zgaruvchilari ham beriladi
+        environment = None
+        if self.template is not None and self.template.get('image') == image_name:
+            environment = self.template.get('environment') or None
+            
+        def run(job):
+            # Image yo'q bo'lsa avval jarayon va bekor qilish imkoniyati bilan yuklanadi
+            if not self.docker_manager.has_image(image_name):
+                job.set_progress(None, "Image yuklab olinmoqda...")
+                if not self.pull_engine.pull(image_name, job.set_progress, job.cancel_event):
+                    return False
+                job.check_cancelled()
+        
+            job.set_progress(None, "Konteyner ishga tushirilmoqda...")
+            return self.docker_manager.run_container(
+                image_name,
+                name=container_name if container_name else None,
+                ports=ports if ports else None,
+                environment=environment
+            )
+            
+        def on_done(job):
+            if job.state == JOB_DONE:
+                messagebox.showinfo("Muvaffaqiyat", "Konteyner muvaffaqiyatli yaratildi")
+            elif job.state == JOB_FAILED:
+                messagebox.showerror("Xatolik", "Konteyner yaratishda xatolik")
+            if self.on_done:
+                self.on_done(job)
+                
+        self.job_manager.submit(f"Docker: {container_name or image_name} yaratish", run, on_done)
+        self.dialog.destroy()
 
 
 class VMCreateDialog:
-    def __init__(self, parent, vm_manager, vm_type):
+    def __init__(self, parent, vm_manager, vm_type, job_manager, on_done=None, host_capacity=None):
         self.vm_manager = vm_manager
         self.vm_type = vm_type
+        self.job_manager = job_manager
+        self.on_done = on_done
+        self.host_capacity = host_capacity
         self.dialog = tk.Toplevel(parent)
         self.dialog.title(f"Yangi {vm_type} VM")
         self.dialog.geometry("500x400")
@@ -732,21 +1214,37 @@ class VMCreateDialog:
             messagebox.showerror("Xatolik", "Memory va CPU soni raqam bo'lishi kerak")
             return
             
+        # Host xotirasi yetmasa oldindan ogohlantirish (keshlangan o'lchovdan)
+        if self.host_capacity is not None:
+            warning = self.host_capacity.check_new_vm(memory, cpus)
+            if warning and not messagebox.askyesno("Ogohlantirish",
+                                                   f"{warning}\n\nVM baribir yaratilsinmi?",
+                                                   parent=self.dialog):
+                return
+                
         # VM yaratish
         if self.vm_type == "VirtualBox":
             os_type = self.os_type_var.get()
             hdd_path = self.hdd_path_var.get() if hasattr(self, 'hdd_path_var') and self.hdd_path_var.get() else None
             hdd_size = int(self.hdd_size_var.get()) if hasattr(self, 'hdd_size_var') and self.hdd_size_var.get() else 20480  # MB
-            success = self.vm_manager.create_vm(name, memory, cpus, os_type, iso_path, hdd_path, hdd_size)
+            create = lambda: self.vm_manager.create_vm(name, memory, cpus, os_type, iso_path, hdd_path, hdd_size)
         elif self.vm_type == "Hyper-V":
             hdd_path = self.hdd_path_var.get() if hasattr(self, 'hdd_path_var') and self.hdd_path_var.get() else None
             hdd_size = int(self.hdd_size_var.get()) if hasattr(self, 'hdd_size_var') and self.hdd_size_var.get() else 20  # GB
-            success = self.vm_manager.create_vm(name, memory, cpus, hdd_path, iso_path, hdd_size)
+            create = lambda: self.vm_manager.create_vm(name, memory, cpus, hdd_path, iso_path, hdd_size)
         else:
-            success = self.vm_manager.create_vm(name, memory, cpus)
+            create = lambda: self.vm_manager.create_vm(name, memory, cpus)
         
-        if success:
-            messagebox.showinfo("Muvaffaqiyat", f"{self.vm_type} VM muvaffaqiyatli yaratildi")
-            self.dialog.destroy()
-        else:
-            messagebox.showerror("Xatolik", f"{self.vm_type} VM yaratishda xatolik")
+        vm_type = self.vm_type
+
+        def on_done(job):
+            if job.state == JOB_DONE:
+                messagebox.showinfo("Muvaffaqiyat", f"{vm_type} VM muvaffaqiyatli yaratildi")
+            elif job.state == JOB_FAILED:
+                messagebox.showerror("Xatolik", f"{vm_type} VM yaratishda xatolik")
+            if self.on_done:
+                self.on_done(job)
+                
+        # VM yaratish (disk yaratish bilan) uzoq davom etadi - fon vazifasi
+        self.job_manager.submit(f"{vm_type}: {name} yaratish", lambda job: create(), on_done)
+        self.dialog.destroy()
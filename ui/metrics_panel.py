@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Metrics Panel - Konteyner va VMlarning jonli CPU/xotira/tarmoq/disk ko'rsatkichlari
+"""
+
+from tkinter import ttk
+from ui.tree_view import SyncedTreeView
+from utils.metrics import MetricsCollector, sparkline, format_bytes
+
+# Jadval shu oraliqda yangilanadi (ms)
+METRICS_REFRESH_MS = 1000
+
+class MetricsPanel:
+    def __init__(self, parent, collector: MetricsCollector):
+        self.collector = collector
+        self.after_id = None
+        self.frame = ttk.Frame(parent)
+        self.frame.pack(fill="both", expand=True)
+        
+        self.view = SyncedTreeView(self.frame, ("Nomi", "Turi", "CPU", "CPU tarixi", "Xotira",
+                                                "Xotira tarixi", "Tarmoq", "Disk"), 120)
+        self.view.tree.column("CPU tarixi", width=200)
+        self.view.tree.column("Xotira tarixi", width=200)
+        self.view.show()
+        
+    def start(self):
+        """Namuna olish va jadvalni yangilashni boshlash (tab ochilganda)"""
+        self.collector.start()
+        if self.after_id is None:
+            self.refresh()
+            
+    def stop(self):
+        """Tab yopilganda namuna olish to'xtatiladi - backendlarga yuk yo'q"""
+        self.collector.stop()
+        if self.after_id is not None:
+            self.frame.after_cancel(self.after_id)
+            self.after_id = None
+            
+    def refresh(self):
+        """Jadvalni halqa buferlardagi namunalardan qayta chizish"""
+        store = self.collector.store
+        rows = []
+        for key, kind, name in sorted(store.entities(), key=lambda entity: (entity[1], entity[2])):
+            sample = store.latest(key)
+            if sample is None:
+                continue
+                
+            cpu_history = store.series(key, "cpu")
+            memory_limit = sample.get("memory_limit")
+            memory = format_bytes(sample["memory"]) if sample.get("memory") is not None else ""
+            if memory and memory_limit:
+                memory += f" / {format_bytes(memory_limit)}"
+                
+            rows.append((key, (
+                name,
+                kind,
+                f"{sample.get('cpu', 0):.1f}%",
+                # Ko'p yadroli konteyner 100% dan oshishi mumkin
+                sparkline(cpu_history, max(100.0, max(cpu_history, default=0))),
+                memory,
+                sparkline(store.series(key, "memory"), memory_limit),
+                self.format_rates(sample, "net_rx", "net_tx", "↓", "↑"),
+                self.format_rates(sample, "block_read", "block_write", "o'q", "yoz")
+            )))
+            
+        self.view.sync(rows)
+        self.after_id = self.frame.after(METRICS_REFRESH_MS, self.refresh)
+        
+    def format_rates(self, sample, first, second, first_label, second_label) -> str:
+        """Ikki tezlik maydonini "↓ 1.2 KB/s ↑ 300 B/s" ko'rinishida"""
+        if sample.get(first) is None and sample.get(second) is None:
+            return ""
+        return (f"{first_label} {format_bytes(sample.get(first) or 0)}/s "
+                f"{second_label} {format_bytes(sample.get(second) or 0)}/s")
@@ -128,6 +128,10 @@ class SettingsWindow:
         self.docker_ports_var = tk.StringVar()
         ttk.Entry(defaults_frame, textvariable=self.docker_ports_var, width=30).grid(row=0, column=1, pady=5)
         
+        self.prewarm_enabled_var = tk.BooleanVar()
+        ttk.Checkbutton(defaults_frame, text="Shablon imagelarini bo'sh vaqtda oldindan yuklash",
+                       variable=self.prewarm_enabled_var).grid(row=1, column=0, columnspan=2, sticky="w", pady=5)
+                       
     def setup_virtualbox_tab(self):
         """VirtualBox sozlamalari tabini sozlash"""
         self.virtualbox_frame = ttk.Frame(self.notebook)
@@ -208,6 +212,7 @@ class SettingsWindow:
         docker_config = self.config_manager.get_docker_config()
         self.docker_auto_connect_var.set(docker_config.get("auto_connect", True))
         self.docker_ports_var.set(docker_config.get("default_ports", "8080:80"))
+        self.prewarm_enabled_var.set(self.config_manager.get("prewarm.enabled", False))
         
         # VirtualBox sozlamalari
         vbox_config = self.config_manager.get_virtualbox_config()
@@ -224,27 +229,37 @@ class SettingsWindow:
     def save_settings(self):
         """Sozlamalarni saqlash"""
         try:
-            # Umumiy sozlamalar
-            self.config_manager.set("language", self.language_var.get())
-            self.config_manager.set("theme", self.theme_var.get())
-            self.config_manager.set("auto_refresh", self.auto_refresh_var.get())
-            self.config_manager.set("refresh_interval", int(self.refresh_interval_var.get()))
-            self.config_manager.set("enable_logging", self.enable_logging_var.get())
-            self.config_manager.set("log_path", self.log_path_var.get())
+            # Qiymatlar avval tekshiriladi - xato bo'lsa hech narsa saqlanmaydi
+            refresh_interval = int(self.refresh_interval_var.get())
+            vbox_memory = int(self.vbox_memory_var.get())
+            vbox_cpus = int(self.vbox_cpus_var.get())
+            hyperv_memory = int(self.hyperv_memory_var.get())
+            hyperv_cpus = int(self.hyperv_cpus_var.get())
             
-            # Docker sozlamalari
-            self.config_manager.set("docker.auto_connect", self.docker_auto_connect_var.get())
-            self.config_manager.set("docker.default_ports", self.docker_ports_var.get())
+            # Barcha sozlamalar bitta yozishda saqlanadi
+            with self.config_manager.batch():
+                # Umumiy sozlamalar
+                self.config_manager.set("language", self.language_var.get())
+                self.config_manager.set("theme", self.theme_var.get())
+                self.config_manager.set("auto_refresh", self.auto_refresh_var.get())
+                self.config_manager.set("refresh_interval", refresh_interval)
+                self.config_manager.set("enable_logging", self.enable_logging_var.get())
+                self.config_manager.set("log_path", self.log_path_var.get())
             
-            # VirtualBox sozlamalari
-            self.config_manager.set("virtualbox.auto_connect", self.vbox_auto_connect_var.get())
-            self.config_manager.set("virtualbox.default_memory", int(self.vbox_memory_var.get()))
-            self.config_manager.set("virtualbox.default_cpus", int(self.vbox_cpus_var.get()))
+                # Docker sozlamalari
+                self.config_manager.set("docker.auto_connect", self.docker_auto_connect_var.get())
+                self.config_manager.set("docker.default_ports", self.docker_ports_var.get())
+                self.config_manager.set("prewarm.enabled", self.prewarm_enabled_var.get())
             
-            # Hyper-V sozlamalari
-            self.config_manager.set("hyperv.auto_connect", self.hyperv_auto_connect_var.get())
-            self.config_manager.set("hyperv.default_memory", int(self.hyperv_memory_var.get()))
-            self.config_manager.set("hyperv.default_cpus", int(self.hyperv_cpus_var.get()))
+                # VirtualBox sozlamalari
+                self.config_manager.set("virtualbox.auto_connect", self.vbox_auto_connect_var.get())
+                self.config_manager.set("virtualbox.default_memory", vbox_memory)
+                self.config_manager.set("virtualbox.default_cpus", vbox_cpus)
+                
+                # Hyper-V sozlamalari
+                self.config_manager.set("hyperv.auto_connect", self.hyperv_auto_connect_var.get())
+                self.config_manager.set("hyperv.default_memory", hyperv_memory)
+                self.config_manager.set("hyperv.default_cpus", hyperv_cpus)
             
             messagebox.showinfo("Muvaffaqiyat", "Sozlamalar muvaffaqiyatli saqlandi")
             
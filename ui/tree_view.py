@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Synced Tree View - Kalit bo'yicha yangilanadigan Treeview
+
+Treeview, scrollbar va "mavjud emas" yozuvi bir marta yaratiladi. Har bir
+yangilashda yangi ro'yxat joriy qatorlar bilan solishtiriladi va faqat
+o'zgargan qatorlar qo'shiladi, yangilanadi yoki o'chiriladi. Shu sababli
+tanlov va scroll holati saqlanib qoladi.
+"""
+
+from tkinter import ttk
+from typing import Dict, Iterable, Tuple
+
+class SyncedTreeView:
+    def __init__(self, parent, columns, column_width: int = 150, message: str = ""):
+        self.parent = parent
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings")
+        
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=column_width)
+            
+        # Scrollbar qo'shish
+        scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        self.message_label = ttk.Label(parent, text=message)
+        
+        # iid -> qiymatlar (Tcl ga murojaat qilmasdan solishtirish uchun)
+        self.rows: Dict[str, Tuple] = {}
+        self.visible = None
+        
+    def show(self):
+        """Jadvalni ko'rsatish"""
+        if self.visible == "tree":
+            return
+        self.message_label.pack_forget()
+        self.frame.pack(fill="both", expand=True)
+        self.visible = "tree"
+        
+    def show_message(self, text: str = None):
+        """Jadval o'rniga xabar ko'rsatish"""
+        if text is not None:
+            self.message_label.configure(text=text)
+        if self.visible == "message":
+            return
+        self.frame.pack_forget()
+        self.message_label.pack(pady=20)
+        self.visible = "message"
+        
+    def hide(self):
+        """Jadval va xabarni yashirish"""
+        self.frame.pack_forget()
+        self.message_label.pack_forget()
+        self.visible = None
+        
+    def sync(self, rows: Iterable[Tuple[str, Tuple]]):
+        """Yangi (kalit, qiymatlar) ro'yxatini joriy qatorlar bilan solishtirish"""
+        new_rows: Dict[str, Tuple] = {}
+        for key, values in rows:
+            key = str(key)
+            # Takroriy kalitlar Treeview da xatolik beradi
+            while key in new_rows:
+                key += "_"
+            new_rows[key] = tuple(values)
+            
+        removed = [key for key in self.rows if key not in new_rows]
+        if removed:
+            self.tree.delete(*removed)
+            
+        for index, (key, values) in enumerate(new_rows.items()):
+            old_values = self.rows.get(key)
+            if old_values is None:
+                self.tree.insert("", index, iid=key, values=values)
+            elif old_values != values:
+                self.tree.item(key, values=values)
+                
+        # Tartib o'zgargan bo'lsagina qatorlarni ko'chirish
+        order = list(new_rows)
+        if list(self.tree.get_children("")) != order:
+            for index, key in enumerate(order):
+                self.tree.move(key, "", index)
+                
+        self.rows = new_rows
+        
+    def selected_keys(self):
+        """Tanlangan qatorlar kalitlari"""
+        return list(self.tree.selection())
@@ -7,11 +7,14 @@ Config Manager - Dastur sozlamalarini boshqarish
 import json
 import os
 from typing import Dict, Any
+from utils.persistence import JsonWriteBehind
 
 class ConfigManager:
     def __init__(self, config_file: str = "configs/settings.json"):
         self.config_file = config_file
         self.config = self.load_config()
+        # set() o'zgarishlari to'planib bitta atomar yozishda saqlanadi
+        self.store = JsonWriteBehind(config_file, lambda: self.config, indent=4)
         
     def load_config(self) -> Dict[str, Any]:
         """Sozlamalarni yuklash"""
@@ -28,9 +31,33 @@ class ConfigManager:
             "language": "uz",
             "auto_refresh": True,
             "refresh_interval": 30,
+            "jobs": {
+                "max_workers": 3,
+                "bulk_concurrency": 4
+            },
+            "metrics": {
+                "interval": 2,
+                "history": 60,
+                "max_streams": 8
+            },
+            "container_logs": {
+                "tail": 500,
+                "max_lines": 10000
+            },
+            "prewarm": {
+                "enabled": False,
+                "idle_seconds": 120,
+                "interval": 21600,
+                "max_concurrent": 1,
+                "max_bandwidth_mb": 10
+            },
             "docker": {
                 "auto_connect": True,
-                "default_ports": "8080:80"
+                "default_ports": "8080:80",
+                "event_stream": True,
+                "max_concurrent_pulls": 2,
+                "local_name": "local",
+                "endpoints": []
             },
             "virtualbox": {
                 "auto_connect": True,
@@ -45,15 +72,17 @@ class ConfigManager:
         }
         
     def save_config(self):
-        """Sozlamalarni saqlash"""
-        try:
-            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
-            return True
-        except Exception as e:
-            print(f"Sozlamalarni saqlashda xatolik: {str(e)}")
-            return False
+        """Sozlamalarni darhol saqlash"""
+        return self.store.save()
+        
+    def batch(self):
+        """Bir nechta set() ni bitta yozishga birlashtirish
+        
+        with config_manager.batch():
+            config_manager.set(...)
+        """
+        return self.store.batch()
+        
             
     def get(self, key: str, default=None):
         """Sozlamani olish"""
@@ -71,15 +100,16 @@ class ConfigManager:
     def set(self, key: str, value: Any):
         """Sozlamani o'rnatish"""
         keys = key.split('.')
-        config = self.config
         
-        for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            config = config[k]
+        with self.store.lock:
+            config = self.config
+            for k in keys[:-1]:
+                if k not in config:
+                    config[k] = {}
+                config = config[k]
             
-        config[keys[-1]] = value
-        self.save_config()
+            config[keys[-1]] = value
+            self.store.mark_dirty()
         
     def get_docker_config(self) -> Dict[str, Any]:
         """Docker sozlamalarini olish"""
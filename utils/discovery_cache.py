@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Discovery Cache - Backend dasturlarini aniqlash natijalarini saqlash
+
+VBoxManage / PowerShell yo'li, versiyasi va binar faylning o'zgarish vaqti
+(mtime) shu yerda saqlanadi. Keyingi ishga tushishda faqat os.stat bilan
+fayl o'zgarmaganligi tekshiriladi - subprocess ishga tushirilmaydi.
+Salbiy natijalar (masalan, Hyper-V yoqilmagan) binar fayl o'zgarmasa ham
+NEGATIVE_RESULT_TTL dan keyin qayta tekshiriladi.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Dict, Optional
+from utils.persistence import atomic_write_text
+
+# Salbiy natija shuncha vaqt ishlatiladi (soniya) - xususiyat yoqilsa keyin ko'rinadi
+NEGATIVE_RESULT_TTL = 3600
+
+class DiscoveryCache:
+    def __init__(self, cache_file: str = "configs/discovery_cache.json"):
+        self.cache_file = cache_file
+        self.lock = threading.Lock()
+        self.entries = self.load_cache()
+        
+    def load_cache(self) -> Dict[str, Dict]:
+        """Keshni yuklash"""
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+            except Exception as e:
+                print(f"Aniqlash keshini yuklashda xatolik: {str(e)}")
+                
+        return {}
+        
+    def save_cache(self) -> bool:
+        """Keshni saqlash"""
+        try:
+            # Yozish ham lock ichida - parallel tekshiruvlarning eski snapshoti
+            # yangisining ustidan yozilmaydi
+            with self.lock:
+                data = json.dumps(self.entries, indent=4, ensure_ascii=False)
+                return atomic_write_text(self.cache_file, data)
+        except Exception as e:
+            print(f"Aniqlash keshini saqlashda xatolik: {str(e)}")
+            return False
+            
+    def get(self, key: str) -> Optional[Dict]:
+        """Yozuv binar fayl o'zgarmagan bo'lsa qaytariladi, aks holda None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            
+        if not entry:
+            return None
+            
+        expires_at = entry.get('expires_at')
+        if expires_at is not None and time.time() >= expires_at:
+            return None
+            
+        path = entry.get('path')
+        if not path:
+            # Oldin topilmagan - PATH da paydo bo'lmagan bo'lsa natija o'zgarmaydi
+            candidates = entry.get('candidates') or []
+            return None if any(resolve_binary(c) for c in candidates) else entry
+            
+        signature = file_signature(path)
+        if signature is None or signature != (entry.get('mtime'), entry.get('size')):
+            return None
+        return entry
+        
+    def set(self, key: str, path: Optional[str], ttl: Optional[float] = None, **values):
+        """Yozuvni yangilash va saqlash
+        
+        ttl berilsa yozuv shuncha soniyadan keyin eskirgan hisoblanadi.
+        """
+        entry = dict(values, path=path)
+        if ttl is not None:
+            entry['expires_at'] = time.time() + ttl
+        signature = file_signature(path) if path else None
+        if signature is not None:
+            entry['mtime'], entry['size'] = signature
+            
+        with self.lock:
+            self.entries[key] = entry
+        self.save_cache()
+        
+    def invalidate(self, key: str):
+        """Yozuvni o'chirish (keyingi safar qayta tekshiriladi)"""
+        with self.lock:
+            removed = self.entries.pop(key, None)
+        if removed is not None:
+            self.save_cache()
+
+
+def resolve_binary(name: str) -> Optional[str]:
+    """Nom yoki yo'lni mavjud bajariladigan faylning to'liq yo'liga aylantirish"""
+    if os.path.isabs(name):
+        return name if os.path.isfile(name) else None
+    return shutil.which(name)
+
+
+def file_signature(path: str):
+    """(mtime, size) - fayl mavjud bo'lmasa None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime, stat.st_size
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docker Disk Usage - Docker disk sarfini tahlil qilish va tozalash
+
+/system/df javobidan imagelarning alohida (unique) va umumiy (shared)
+qatlamlari, to'xtagan konteynerlar, osilib qolgan imagelar, ishlatilmayotgan
+volumelar va build kesh hajmi hisoblanadi. Tozalashdan oldin qancha joy
+bo'shashi shu ma'lumotlardan taxmin qilinadi (dry-run).
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Tozalash tartibi: avval konteynerlar - ular ushlab turgan image va volumelar bo'shaydi
+PRUNE_ORDER = ("containers", "images", "volumes", "build_cache")
+
+CATEGORY_LABELS = {
+    "containers": "To'xtagan konteynerlar",
+    "images": "Imagelar",
+    "volumes": "Volumelar",
+    "build_cache": "Build kesh",
+}
+
+# Anonim volume nomi - 64 ta hex belgi (eski daemonlarda label bo'lmaydi)
+ANONYMOUS_VOLUME_NAME = re.compile(r'^[0-9a-f]{64}$')
+
+class DiskUsageAnalyzer:
+    def __init__(self, df: Dict):
+        """df - DockerManager.get_disk_usage() natijasi"""
+        self.images = df.get('Images') or []
+        self.containers = df.get('Containers') or []
+        self.volumes = df.get('Volumes') or []
+        self.build_cache = df.get('BuildCache') or []
+        self.layers_size = df.get('LayersSize') or 0
+        
+    def image_unique_size(self, image: Dict) -> int:
+        """Faqat shu imagega tegishli qatlamlar hajmi"""
+        # SharedSize hisoblanmagan bo'lsa -1 keladi
+        return max((image.get('Size') or 0) - max(image.get('SharedSize') or 0, 0), 0)
+        
+    def is_dangling(self, image: Dict) -> bool:
+        """Tegi yo'q (<none>:<none>) image"""
+        return not [tag for tag in image.get('RepoTags') or [] if tag != '<none>:<none>']
+        
+    def is_stopped(self, container: Dict) -> bool:
+        """container prune o'chiradigan holat (ishlayotgan va pauzadagilar emas)"""
+        return container.get('State') not in ('running', 'paused', 'restarting')
+        
+    def is_anonymous(self, volume: Dict) -> bool:
+        labels = volume.get('Labels') or {}
+        return 'com.docker.volume.anonymous' in labels or bool(ANONYMOUS_VOLUME_NAME.match(volume.get('Name', '')))
+        
+    def image_name(self, image: Dict) -> str:
+        tags = [tag for tag in image.get('RepoTags') or [] if tag != '<none>:<none>']
+        return tags[0] if tags else image.get('Id', '')[7:19]
+        
+    def summary(self) -> Dict:
+        """Toifalar bo'yicha soni va hajmi, qatlamlar taqsimoti"""
+        used_images = {container.get('ImageID') for container in self.containers}
+        naive_total = sum(image.get('Size') or 0 for image in self.images)
+        unique_total = sum(self.image_unique_size(image) for image in self.images)
+        # Diskdagi haqiqiy hajm - LayersSize bo'lmasa har bir image hajmi yig'indisi
+        on_disk = self.layers_size or naive_total
+        dangling = [image for image in self.images if self.is_dangling(image)]
+        stopped = [container for container in self.containers if self.is_stopped(container)]
+        unused_volumes = [volume for volume in self.volumes
+                          if (volume.get('UsageData') or {}).get('RefCount') == 0]
+                          
+        return {
+            'images': {
+                'count': len(self.images),
+                'active': sum(1 for image in self.images if image.get('Id') in used_images),
+                'size': on_disk,
+                'dangling': len(dangling),
+                'dangling_size': sum(self.image_unique_size(image) for image in dangling),
+            },
+            'layers': {
+                # Har bir image hajmini qo'shganda umumiy qatlamlar bir necha marta sanaladi
+                'naive_total': naive_total,
+                'on_disk': on_disk,
+                'unique': unique_total,
+                'shared': max(on_disk - unique_total, 0),
+            },
+            'containers': {
+                'count': len(self.containers),
+                'stopped': len(stopped),
+                'size': sum(container.get('SizeRw') or 0 for container in self.containers),
+                'stopped_size': sum(container.get('SizeRw') or 0 for container in stopped),
+            },
+            'volumes': {
+                'count': len(self.volumes),
+                'size': sum(volume_size(volume) for volume in self.volumes),
+                'unused': len(unused_volumes),
+                'unused_size': sum(volume_size(volume) for volume in unused_volumes),
+                'named_unused': sum(1 for volume in unused_volumes if not self.is_anonymous(volume)),
+            },
+            'build_cache': {
+                'count': len(self.build_cache),
+                'size': sum(record.get('Size') or 0 for record in self.build_cache if not record.get('Shared')),
+                'reclaimable': sum(record.get('Size') or 0 for record in self.build_cache
+                                   if not record.get('InUse') and not record.get('Shared')),
+            },
+        }
+        
+    def estimate(self, categories: Iterable[str], all_images: bool = False) -> Dict[str, Dict]:
+        """Tanlangan toifalar tozalansa nimalar o'chishi va qancha joy bo'shashi (dry-run)
+        
+        Natija: toifa -> {'count', 'size', 'items'}. Image hajmi faqat
+        alohida qatlamlar bo'yicha hisoblanadi - o'chiriladigan imagelar
+        o'zaro bo'lishgan qatlamlar kiritilmaydi, shuning uchun image
+        qiymati kamida shuncha.
+        """
+        categories = set(categories)
+        # Konteynerlar ham tozalansa faqat qolgan konteynerlar image/volumeni ushlab turadi
+        if "containers" in categories:
+            remaining = [container for container in self.containers if not self.is_stopped(container)]
+        else:
+            remaining = self.containers
+        used_images = {container.get('ImageID') for container in remaining}
+        used_volumes = {mount.get('Name') for container in remaining
+                        for mount in container.get('Mounts') or [] if mount.get('Name')}
+                        
+        result = {}
+        if "containers" in categories:
+            stopped = [container for container in self.containers if self.is_stopped(container)]
+            result["containers"] = estimate_entry(
+                [(', '.join(name.lstrip('/') for name in container.get('Names') or []) or container.get('Id', '')[:12],
+                  container.get('SizeRw') or 0) for container in stopped]
+            )
+        if "images" in categories:
+            images = [image for image in self.images
+                      if image.get('Id') not in used_images and (all_images or self.is_dangling(image))]
+            result["images"] = estimate_entry(
+                [(self.image_name(image), self.image_unique_size(image)) for image in images]
+            )
+        if "volumes" in categories:
+            # volume prune (API 1.42+) faqat anonim volumelarni o'chiradi
+            volumes = [volume for volume in self.volumes
+                       if self.is_anonymous(volume) and volume.get('Name') not in used_volumes
+                       and ((volume.get('UsageData') or {}).get('RefCount') == 0 or "containers" in categories)]
+            result["volumes"] = estimate_entry(
+                [(volume.get('Name', '')[:12], volume_size(volume)) for volume in volumes]
+            )
+        if "build_cache" in categories:
+            records = [record for record in self.build_cache if not record.get('InUse')]
+            result["build_cache"] = estimate_entry(
+                [(record.get('ID', '')[:12], 0 if record.get('Shared') else record.get('Size') or 0)
+                 for record in records]
+            )
+        return result
+
+
+def volume_size(volume: Dict) -> int:
+    """Volume hajmi (hisoblanmagan bo'lsa -1 o'rniga 0)"""
+    return max((volume.get('UsageData') or {}).get('Size') or 0, 0)
+
+
+def estimate_entry(items: List[tuple]) -> Dict:
+    """(nomi, hajmi) ro'yxatidan {'count', 'size', 'items'}"""
+    return {
+        'count': len(items),
+        'size': sum(size for _, size in items),
+        'items': [name for name, _ in items],
+    }
+
+
+def prune_selected(docker_manager, categories: Iterable[str], all_images: bool = False,
+                   job=None) -> Dict[str, Optional[Dict]]:
+    """Tanlangan toifalarni PRUNE_ORDER tartibida tozalash
+    
+    Natija: toifa -> {'deleted', 'reclaimed'} (xatolikda None). job
+    berilsa har bir qadamdan oldin jarayon va bekor qilish tekshiriladi.
+    """
+    selected = [kind for kind in PRUNE_ORDER if kind in set(categories)]
+    results = {}
+    for index, kind in enumerate(selected):
+        if job is not None:
+            job.check_cancelled()
+            job.set_progress(index / len(selected), f"{CATEGORY_LABELS[kind]} tozalanmoqda...")
+        results[kind] = docker_manager.prune(kind, all_images=all_images)
+    return results
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Host Capacity - Host resurslari va VM/konteynerlarga ajratilgan resurslar
+
+psutil bilan olingan host RAM/CPU/disk qiymatlari inventar snapshotlaridagi
+VM xotirasi/CPU soni va konteynerlarning xotira limitlari bilan
+solishtiriladi. Host o'lchovlari fon threadida olinib keshlanadi - dialog
+ochilganda faqat tayyor qiymatlar o'qiladi.
+"""
+
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+import psutil
+
+# Host o'lchovlari shundan eski bo'lsa fonda yangilanadi (soniya)
+HOST_SAMPLE_TTL = 30
+# Ajratilgan xotira hostdagi xotiraning shu ulushidan oshsa ogohlantiriladi
+OVERCOMMIT_RATIO = 1.0
+
+class HostCapacity:
+    def __init__(self, inventory, docker_manager=None, disk_path: str = None,
+                 ttl: float = HOST_SAMPLE_TTL):
+        self.inventory = inventory
+        self.docker_manager = docker_manager
+        self.disk_path = disk_path or os.path.abspath(os.sep)
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.host: Dict = {}
+        self.sampled_at = 0.0
+        self.sampling = False
+        # konteyner ID -> xotira limiti (bayt, 0 - cheklanmagan)
+        self.container_limits: Dict[str, int] = {}
+        # Birinchi chaqiruvda 0 qaytaradi - keyingi o'lchov uchun boshlang'ich nuqta
+        psutil.cpu_percent(interval=None)
+        
+    def sample_host(self) -> Dict:
+        """Host resurslarini o'lchash (fon threadida chaqiriladi)"""
+        memory = psutil.virtual_memory()
+        host = {
+            'memory_total': memory.total,
+            'memory_available': memory.available,
+            'cpu_count': psutil.cpu_count(logical=True) or 1,
+            'cpu_percent': psutil.cpu_percent(interval=None),
+        }
+        try:
+            disk = psutil.disk_usage(self.disk_path)
+            host['disk_total'] = disk.total
+            host['disk_free'] = disk.free
+        except OSError as e:
+            print(f"Disk hajmini olishda xatolik: {str(e)}")
+        return host
+        
+    def refresh(self):
+        """Host o'lchovi va konteyner limitlarini yangilash (bloklovchi)"""
+        try:
+            host = self.sample_host()
+            limits = self.fetch_container_limits()
+            with self.lock:
+                self.host = host
+                self.container_limits = limits
+                self.sampled_at = time.time()
+        except Exception as e:
+            print(f"Host resurslarini olishda xatolik: {str(e)}")
+        finally:
+            with self.lock:
+                self.sampling = False
+                
+    def refresh_async(self, force: bool = False):
+        """Kesh eskirgan bo'lsa fon threadida yangilash"""
+        with self.lock:
+            if self.sampling or (not force and time.time() - self.sampled_at < self.ttl):
+                return
+            self.sampling = True
+        threading.Thread(target=self.refresh, daemon=True).start()
+        
+    def fetch_container_limits(self) -> Dict[str, int]:
+        """Ishlayotgan konteynerlar xotira limitlari - faqat yangi konteynerlar so'raladi"""
+        if self.docker_manager is None or not self.docker_manager.is_available():
+            return {}
+            
+        with self.lock:
+            known = dict(self.container_limits)
+            
+        limits = {}
+        local_name = getattr(self.docker_manager, 'local_name', None)
+        for container in self.inventory.get_list("docker_containers"):
+            container_id = container.get('id')
+            if not container_id or container.get('status') != 'running':
+                continue
+            # Boshqa Docker hostlaridagi konteynerlar bu host xotirasini band qilmaydi
+            if container.get('host', local_name) != local_name:
+                continue
+            if container_id in known:
+                limits[container_id] = known[container_id]
+                continue
+            details = self.docker_manager.get_container_details(container_id)
+            limits[container_id] = (details.get('HostConfig') or {}).get('Memory') or 0
+        return limits
+        
+    def summary(self) -> Dict:
+        """Host qiymatlari va ajratilgan resurslar (keshdan, subprocess/psutil chaqiruvisiz)"""
+        with self.lock:
+            host = dict(self.host)
+            container_memory = sum(self.container_limits.values())
+            
+        running_memory = configured_memory = 0
+        running_cpus = configured_cpus = 0
+        for key in ("vbox_vms", "hyperv_vms"):
+            for vm in self.inventory.get_list(key):
+                memory = parse_memory_mb(vm.get('memory')) * 1024 * 1024
+                cpus = parse_int(vm.get('cpus'))
+                configured_memory += memory
+                configured_cpus += cpus
+                if is_running(vm.get('state')):
+                    running_memory += memory
+                    running_cpus += cpus
+                    
+        committed_memory = running_memory + container_memory
+        summary = dict(host,
+                       committed_memory=committed_memory,
+                       configured_memory=configured_memory,
+                       container_memory=container_memory,
+                       committed_cpus=running_cpus,
+                       configured_cpus=configured_cpus)
+        if host.get('memory_total'):
+            summary['memory_commit_ratio'] = committed_memory / host['memory_total']
+        if host.get('cpu_count'):
+            summary['cpu_commit_ratio'] = running_cpus / host['cpu_count']
+        return summary
+        
+    def check_new_vm(self, memory_mb: int, cpus: int) -> Optional[str]:
+        """Yangi VM host xotirasini ortiqcha band qilsa ogohlantirish matni, aks holda None"""
+        summary = self.summary()
+        total = summary.get('memory_total')
+        if not total:
+            # Host hali o'lchanmagan - ogohlantirish uchun ma'lumot yo'q
+            return None
+            
+        committed = summary['committed_memory'] + memory_mb * 1024 * 1024
+        if committed <= total * OVERCOMMIT_RATIO:
+            return None
+            
+        message = (f"Ishlayotgan VM va konteynerlarga {summary['committed_memory'] // (1024 * 1024)} MB "
+                   f"ajratilgan. Yangi VM bilan {committed // (1024 * 1024)} MB bo'ladi, "
+                   f"hostda esa {total // (1024 * 1024)} MB xotira bor "
+                   f"({committed / total * 100:.0f}%).")
+        if summary['committed_cpus'] + cpus > summary.get('cpu_count', cpus):
+            message += (f"\nCPU: {summary['committed_cpus'] + cpus} ta virtual CPU, "
+                        f"hostda {summary['cpu_count']} ta.")
+        return message
+
+
+def parse_memory_mb(value) -> int:
+    """"1024 MB" yoki 1024 ko'rinishidagi qiymatdan megabaytlar (noma'lum bo'lsa 0)"""
+    match = re.match(r'^\s*(\d+)', str(value or ''))
+    return int(match.group(1)) if match else 0
+
+
+def parse_int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def is_running(state) -> bool:
+    """VirtualBox "running", Hyper-V "Running" yoki JSON enum qiymati 2"""
+    return str(state).lower() in ("running", "2")
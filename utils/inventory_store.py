@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Inventory Store - Oxirgi inventar snapshotlarini saqlash
+
+Har bir backenddan olingan ro'yxat (konteynerlar, imagelar, VMlar) vaqt
+belgisi bilan shu yerda saqlanadi. Barcha ko'rinishlar backendlarni qayta
+so'ramasdan ma'lumotni shu yerdan o'qiydi.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+class InventoryStore:
+    def __init__(self):
+        self.lock = threading.Lock()
+        # kalit -> (vaqt belgisi, ma'lumot)
+        self.snapshots: Dict[str, tuple] = {}
+        
+    def update(self, key: str, data: Any):
+        """Snapshotni yangilash"""
+        with self.lock:
+            self.snapshots[key] = (time.time(), data)
+            
+    def get(self, key: str, default: Any = None) -> Any:
+        """Snapshot ma'lumotini olish"""
+        with self.lock:
+            snapshot = self.snapshots.get(key)
+        return snapshot[1] if snapshot else default
+        
+    def get_list(self, key: str) -> List:
+        """Snapshotni ro'yxat ko'rinishida olish (mavjud bo'lmasa bo'sh ro'yxat)"""
+        return self.get(key) or []
+        
+    def get_timestamp(self, key: str) -> Optional[float]:
+        """Snapshot olingan vaqt"""
+        with self.lock:
+            snapshot = self.snapshots.get(key)
+        return snapshot[0] if snapshot else None
+        
+    def age(self, key: str) -> Optional[float]:
+        """Snapshot necha soniya oldin olingan"""
+        timestamp = self.get_timestamp(key)
+        return time.time() - timestamp if timestamp is not None else None
+        
+    def count(self, key: str) -> int:
+        """Snapshotdagi elementlar soni"""
+        return len(self.get_list(key))
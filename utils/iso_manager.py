@@ -6,14 +6,64 @@ ISO Manager - ISO fayllarini boshqarish
 
 import os
 import json
+import threading
+import time
 import requests
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Optional
 from urllib.parse import urlparse
+from utils.iso_store import hash_file, hash_files, file_signature, is_same_file, link_duplicate
+from utils.iso_scan_index import ISOScanIndex
+from utils.persistence import atomic_write_json, shared_store
+
+# Yuklab olishda bir marta o'qiladigan/yoziladigan blok hajmi
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Segmentli yuklashda bitta segmentning eng kichik hajmi
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+# Progress callback shundan tez-tez chaqirilmaydi (soniya)
+PROGRESS_INTERVAL = 0.25
+# Segmentlar holati .part.json faylga shu oraliqda yoziladi (soniya)
+STATE_SAVE_INTERVAL = 2
+# (ulanish, o'qish) timeoutlari
+DOWNLOAD_TIMEOUT = (10, 60)
+
+
+class RangeNotSupported(Exception):
+    """Server Range so'roviga 206 bilan javob bermadi"""
+
+
+def content_range_total(value: Optional[str]) -> Optional[int]:
+    """Content-Range ("bytes 0-99/1000" yoki "bytes */1000") dan fayl hajmi"""
+    if not value or '/' not in value:
+        return None
+    total = value.rsplit('/', 1)[1].strip()
+    return int(total) if total.isdigit() else None
+
+
+class ProgressReporter:
+    def __init__(self, callback, total: int):
+        self.callback = callback
+        self.total = total
+        self.last_report = 0.0
+        
+    def update(self, downloaded: int, force: bool = False):
+        """Progressni foizda xabar qilish (PROGRESS_INTERVAL dan tez emas)"""
+        if self.callback is None or self.total <= 0:
+            return
+        now = time.time()
+        if force or now - self.last_report >= PROGRESS_INTERVAL:
+            self.last_report = now
+            self.callback(min(downloaded / self.total * 100, 100.0))
+
 
 class ISOManager:
-    def __init__(self, templates_file: str = "templates/iso_templates.json"):
+    def __init__(self, templates_file: str = "templates/iso_templates.json",
+                 scan_index: Optional[ISOScanIndex] = None):
         self.templates_file = templates_file
-        self.templates = self.load_templates()
+        # O'zgarishlar to'planib bitta atomar yozishda saqlanadi. Bir nechta
+        # ISOManager (har bir oyna) bitta shablonlar lug'ati va store ni bo'lishadi
+        self.templates, self.store = shared_store(templates_file, self.load_templates, indent=4)
+        self.scan_index = scan_index or ISOScanIndex()
         
     def load_templates(self) -> Dict:
         """ISO template'larini yuklash"""
@@ -34,13 +84,64 @@ class ISOManager:
         """Mahalliy ISO'larni olish"""
         return self.templates.get("local_isos", [])
         
-    def add_local_iso(self, name: str, path: str, description: str = ""):
-        """Mahalliy ISO qo'shish"""
+    def get_template_checksum(self, name: str) -> Optional[str]:
+        """Mashhur ISO uchun iso_templates.json dagi SHA-256 (bo'lmasa None)"""
+        for iso in self.get_popular_isos():
+            if iso.get("name") == name and iso.get("sha256"):
+                return iso["sha256"].lower()
+        return None
+        
+    def add_local_iso(self, name: str, path: str, description: str = "", sha256: str = None) -> str:
+        """Mahalliy ISO qo'shish
+        
+        sha256 berilsa va shu xeshli ISO allaqachon ro'yxatda bo'lsa yangi
+        yozuv yaratilmaydi - yo'l mavjud yozuvning "duplicates" ro'yxatiga,
+        (hajm, mtime) esa "duplicate_signatures" ga qo'shiladi (keyingi
+        skanda o'zgarmagan dublikat qayta xeshlanmaydi). Yozuv nomini qaytaradi.
+        """
+        with self.store.lock:
+            name = self._add_local_iso(name, path, description, sha256)
+            self.store.mark_dirty()
+        return name
+        
+    def _add_local_iso(self, name: str, path: str, description: str, sha256: Optional[str]) -> str:
+        """add_local_iso ning o'zi (saqlamasdan, store.lock ostida chaqiriladi)"""
         local_isos = self.templates.get("local_isos", [])
+        signature = file_signature(path)
         
+        if sha256:
+            # Fayl o'zgargan bo'lsa u boshqa yozuvning dublikati emas
+            for iso in local_isos:
+                if iso.get("sha256") != sha256 and path in iso.get("duplicates", []):
+                    iso["duplicates"].remove(path)
+                    iso.get("duplicate_signatures", {}).pop(path, None)
+                    
+            for iso in local_isos:
+                if iso.get("sha256") != sha256:
+                    continue
+                primary = iso.get("path", "")
+                if primary and os.path.exists(primary) and not is_same_file(primary, path):
+                    duplicates = iso.setdefault("duplicates", [])
+                    if path not in duplicates:
+                        duplicates.append(path)
+                    if signature:
+                        size, mtime = signature
+                        iso.setdefault("duplicate_signatures", {})[path] = {"size": size, "mtime": mtime}
+                else:
+                    # Asosiy fayl yo'qolgan yoki o'sha fayl - yo'l yangilanadi
+                    iso["path"] = path
+                    if signature:
+                        iso["size"], iso["mtime"] = signature
+                return iso.get("name", name)
+                
+                
         # Mavjud ISO'ni tekshirish
         for iso in local_isos:
             if iso.get("name") == name:
+                if sha256 and iso.get("sha256") and iso["sha256"] != sha256 and iso.get("path") != path:
+                    # Boshqa ISO bilan bir xil nom - nom farqlanadi
+                    name = self.unique_iso_name(name)
+                    continue
                 iso["path"] = path
                 iso["description"] = description
                 break
@@ -50,50 +151,341 @@ class ISOManager:
                 "path": path,
                 "description": description
             })
+            iso = local_isos[-1]
+            
+        if sha256:
+            iso["sha256"] = sha256
+            if signature:
+                iso["size"], iso["mtime"] = signature
             
         self.templates["local_isos"] = local_isos
-        self.save_templates()
+        return name
+        
+    def unique_iso_name(self, name: str) -> str:
+        """Ro'yxatda band bo'lmagan nom: "nom (2)", "nom (3)", ..."""
+        names = {iso.get("name") for iso in self.get_local_isos()}
+        index = 2
+        while f"{name} ({index})" in names:
+            index += 1
+        return f"{name} ({index})"
+        
+    def get_hash_entries(self) -> Dict[str, Dict]:
+        """Yo'l -> {"sha256", "size", "mtime"} - asosiy fayllar va dublikatlar uchun"""
+        entries = {}
+        for iso in self.get_local_isos():
+            if not iso.get("sha256"):
+                continue
+            for path, signature in iso.get("duplicate_signatures", {}).items():
+                entries[path] = dict(signature, sha256=iso["sha256"])
+            if iso.get("path"):
+                entries[iso["path"]] = {"sha256": iso["sha256"], "size": iso.get("size"),
+                                        "mtime": iso.get("mtime")}
+        return entries
+        
+    def get_cached_hash(self, path: str, entries: Optional[Dict[str, Dict]] = None) -> Optional[str]:
+        """Fayl (hajm, mtime) o'zgarmagan bo'lsa ro'yxatdagi xeshni qaytarish
+        
+        entries - get_hash_entries() natijasi (ko'p fayl uchun oldindan tuziladi).
+        """
+        signature = file_signature(path)
+        if signature is None:
+            return None
+        if entries is None:
+            with self.store.lock:
+                entries = self.get_hash_entries()
+        entry = entries.get(path)
+        if entry and (entry.get("size"), entry.get("mtime")) == signature:
+            return entry["sha256"]
+        return None
+        
+    def register_isos(self, paths: List[str], description_prefix: str = "Mahalliy ISO") -> Dict[str, Optional[str]]:
+        """ISO fayllarni xeshlab ro'yxatga qo'shish (dublikatlar bitta yozuvga)
+        
+        Xeshlanmagan yoki o'zgargan fayllar jarayonlar pulida parallel
+        xeshlanadi. Ro'yxat bir marta saqlanadi. Natija: yo'l -> SHA-256.
+        """
+        with self.store.lock:
+            entries = self.get_hash_entries()
+        hashes = {path: self.get_cached_hash(path, entries) for path in paths}
+        missing = [path for path, sha256 in hashes.items() if sha256 is None]
+        if missing:
+            hashes.update(hash_files(missing))
+            
+        with self.store.batch():
+            for path, sha256 in hashes.items():
+                if sha256 is None:
+                    continue
+                name = os.path.basename(path)
+                self.add_local_iso(name, path, f"{description_prefix}: {name}", sha256)
+            
+        return hashes
+        
+    def get_duplicate_count(self) -> int:
+        """Hali hard link qilinmagan (joy egallaydigan) dublikat fayllar soni"""
+        return sum(
+            1 for iso in self.get_local_isos()
+            for path in iso.get("duplicates", [])
+            if os.path.exists(path) and not is_same_file(iso.get("path", ""), path)
+        )
+        
+    def deduplicate_isos(self) -> Dict[str, int]:
+        """Dublikat ISO fayllarni asosiy faylga hard link bilan almashtirish
+        
+        Har bir dublikat almashtirishdan oldin qayta xeshlanadi. Bitta diskda
+        bo'lmagan dublikatlar o'zgarishsiz qoladi.
+        """
+        linked = 0
+        saved_bytes = 0
+        
+        for iso in self.get_local_isos():
+            primary = iso.get("path", "")
+            duplicates = [path for path in iso.get("duplicates", []) if os.path.exists(path)]
+            if not primary or not os.path.exists(primary) or not duplicates:
+                continue
+                
+            hashes = hash_files(duplicates)
+            for path in duplicates:
+                if hashes.get(path) != iso.get("sha256"):
+                    continue
+                size = os.path.getsize(path)
+                if link_duplicate(primary, path):
+                    linked += 1
+                    saved_bytes += size
+                    
+            # Mavjud bo'lmagan dublikatlar ro'yxatdan olib tashlanadi. Hard link
+            # asosiy fayl mtime ini oladi - imzolar qayta yoziladi
+            with self.store.lock:
+                iso["duplicates"] = duplicates
+                iso["duplicate_signatures"] = {}
+                for path in duplicates:
+                    signature = file_signature(path)
+                    if signature and hashes.get(path) == iso.get("sha256"):
+                        size, mtime = signature
+                        iso["duplicate_signatures"][path] = {"size": size, "mtime": mtime}
+                self.store.mark_dirty()
+            
+        return {"linked": linked, "saved_bytes": saved_bytes}
         
     def remove_local_iso(self, name: str):
         """Mahalliy ISO'ni olib tashlash"""
-        local_isos = self.templates.get("local_isos", [])
-        self.templates["local_isos"] = [iso for iso in local_isos if iso.get("name") != name]
-        self.save_templates()
+        with self.store.lock:
+            local_isos = self.templates.get("local_isos", [])
+            self.templates["local_isos"] = [iso for iso in local_isos if iso.get("name") != name]
+            self.store.mark_dirty()
+            
+    def batch(self):
+        """Bir nechta o'zgarishni bitta yozishga birlashtirish"""
+        return self.store.batch()
         
     def save_templates(self):
-        """Template'larni saqlash"""
+        """Template'larni darhol saqlash"""
+        return self.store.save()
+            
+    def download_iso(self, url: str, save_path: str, progress_callback=None,
+                     connections: int = 1, cancel_event=None) -> bool:
+        """ISO fayl yuklab olish
+        
+        Ma'lumot avval save_path + ".part" ga yoziladi va to'liq yuklangach
+        save_path ga ko'chiriladi. Uzilgan yuklash keyingi chaqiruvda Range
+        so'rovi bilan davom ettiriladi. Server Range ni qo'llasa va
+        connections > 1 bo'lsa fayl bir nechta ulanishda segmentlab
+        yuklanadi. progress_callback(foiz) PROGRESS_INTERVAL dan tez
+        chaqirilmaydi. cancel_event o'rnatilsa yuklash to'xtatiladi
+        (.part fayl davom ettirish uchun saqlanadi).
+        """
+        part_path = save_path + ".part"
+        state_path = part_path + ".json"
+        
         try:
-            with open(self.templates_file, 'w', encoding='utf-8') as f:
-                json.dump(self.templates, f, indent=4, ensure_ascii=False)
+            url, total, accepts_ranges = self.probe_download(url)
+            reporter = ProgressReporter(progress_callback, total)
+            
+            success = None
+            if (total >= 2 * MIN_SEGMENT_SIZE and accepts_ranges
+                    and (connections > 1 or os.path.exists(state_path))):
+                success = self.download_segmented(url, part_path, state_path, total,
+                                                  connections, reporter, cancel_event)
+            
+            if success is None:
+                # Segmentli .part oldindan to'liq hajmda yaratiladi - oddiy
+                # davom ettirish uchun yaroqsiz
+                if os.path.exists(state_path):
+                    os.remove(state_path)
+                    if os.path.exists(part_path):
+                        os.remove(part_path)
+                success = self.download_single(url, part_path, reporter, cancel_event)
+                        
+            if not success:
+                return False
+                            
+            size = os.path.getsize(part_path)
+            if reporter.total and size != reporter.total:
+                print(f"ISO yuklab olishda xatolik: hajm mos emas ({size} != {reporter.total})")
+                return False
+                
+            os.replace(part_path, save_path)
+            reporter.update(size, force=True)
             return True
+            
         except Exception as e:
-            print(f"Template'larni saqlashda xatolik: {str(e)}")
+            print(f"ISO yuklab olishda xatolik: {str(e)}")
             return False
             
-    def download_iso(self, url: str, save_path: str, progress_callback=None) -> bool:
-        """ISO fayl yuklab olish"""
+    def probe_download(self, url: str):
+        """Yakuniy URL (redirectlardan keyin), hajm va Range qo'llanishini aniqlash"""
         try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
+            response = requests.head(url, allow_redirects=True, timeout=DOWNLOAD_TIMEOUT)
+        except requests.RequestException:
+            return url, 0, False
             
-            total_size = int(response.headers.get('content-length', 0))
+        # Ba'zi serverlar HEAD ni qo'llamaydi - oddiy yuklashga o'tiladi
+        if response.status_code >= 400:
+            return url, 0, False
+            
+        total = int(response.headers.get('content-length', 0) or 0)
+        accepts_ranges = response.headers.get('accept-ranges', '').lower() == 'bytes'
+        return response.url, total, accepts_ranges
+        
+    def download_single(self, url: str, part_path: str, reporter: ProgressReporter,
+                        cancel_event=None) -> bool:
+        """Bitta ulanishda yuklash, mavjud .part oxiridan davom ettirish"""
+        downloaded = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if reporter.total and downloaded >= reporter.total:
+            if downloaded == reporter.total:
+                return True
             downloaded = 0
             
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
+        headers = {'Range': f'bytes={downloaded}-'} if downloaded else {}
+        response = requests.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT)
+        if downloaded and response.status_code == 416:
+            # HEAD hajm bermagan va .part allaqachon to'liq - server "bytes */hajm" qaytaradi
+            response.close()
+            size = content_range_total(response.headers.get('content-range'))
+            if size is None or size == downloaded:
+                reporter.total = downloaded
+                return True
+            # .part serverdagi fayldan katta - eskirgan, boshidan yuklanadi
+            os.remove(part_path)
+            return self.download_single(url, part_path, reporter, cancel_event)
+            
+        with response:
+            response.raise_for_status()
+            
+            if downloaded and response.status_code != 206:
+                # Server Range ni qo'llamaydi - boshidan yuklanadi
+                downloaded = 0
+                
+            if not reporter.total:
+                length = int(response.headers.get('content-length', 0) or 0)
+                reporter.total = downloaded + length if length else 0
+                
+            with open(part_path, 'ab' if downloaded else 'wb') as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if cancel_event is not None and cancel_event.is_set():
+                        return False
                     if chunk:
                         f.write(chunk)
                         downloaded += len(chunk)
+                        reporter.update(downloaded)
                         
-                        if progress_callback and total_size > 0:
-                            progress = (downloaded / total_size) * 100
-                            progress_callback(progress)
-                            
-            return True
+        return True
+        
+    def download_segmented(self, url: str, part_path: str, state_path: str, total: int,
+                           connections: int, reporter: ProgressReporter,
+                           cancel_event=None) -> Optional[bool]:
+        """Faylni bir nechta Range so'rovida parallel yuklash
+        
+        Har bir segment [boshi, oxiri, yuklangan] ko'rinishida state_path ga
+        yoziladi, shuning uchun uzilgan yuklash segmentlar bo'yicha davom
+        ettiriladi. Server Range ni qo'llamasa None qaytaradi.
+        """
+        segments = self.load_download_state(state_path, total)
+        if segments is None or not os.path.exists(part_path) or os.path.getsize(part_path) != total:
+            count = max(1, min(connections, total // MIN_SEGMENT_SIZE))
+            size = total // count
+            segments = [[i * size, (i + 1) * size - 1 if i < count - 1 else total - 1, 0]
+                        for i in range(count)]
+            with open(part_path, 'wb') as f:
+                f.truncate(total)
+            self.save_download_state(state_path, total, segments)
             
-        except Exception as e:
-            print(f"ISO yuklab olishda xatolik: {str(e)}")
+        stop_event = threading.Event()
+        
+        def fetch(segment) -> bool:
+            start, end = segment[0], segment[1]
+            if start + segment[2] > end:
+                return True
+                
+            headers = {'Range': f'bytes={start + segment[2]}-{end}'}
+            with requests.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise RangeNotSupported()
+                    
+                with open(part_path, 'r+b') as f:
+                    f.seek(start + segment[2])
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        if stop_event.is_set() or (cancel_event is not None and cancel_event.is_set()):
+                            return False
+                        chunk = chunk[:end - start - segment[2] + 1]
+                        f.write(chunk)
+                        segment[2] += len(chunk)
+                        
+            return start + segment[2] > end
+            
+        results = []
+        with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+            pending = {executor.submit(fetch, segment) for segment in segments}
+            last_save = time.time()
+            
+            while pending:
+                done, pending = wait(pending, timeout=PROGRESS_INTERVAL)
+                for future in done:
+                    if future.exception() is not None or not future.result():
+                        # Bitta segment xatoligida qolganlari ham to'xtatiladi
+                        stop_event.set()
+                    results.append(future)
+                    
+                reporter.update(sum(segment[2] for segment in segments))
+                if time.time() - last_save >= STATE_SAVE_INTERVAL:
+                    self.save_download_state(state_path, total, segments)
+                    last_save = time.time()
+                    
+        self.save_download_state(state_path, total, segments)
+        
+        errors = [future.exception() for future in results if future.exception() is not None]
+        if any(isinstance(error, RangeNotSupported) for error in errors):
+            return None
+        if errors:
+            print(f"ISO segmentini yuklashda xatolik: {str(errors[0])}")
             return False
+        if not all(future.result() for future in results):
+            return False
+            
+        os.remove(state_path)
+        return True
+        
+    def load_download_state(self, state_path: str, total: int) -> Optional[List[List[int]]]:
+        """Segmentlar holatini o'qish (hajm mos kelmasa None)"""
+        if not os.path.exists(state_path):
+            return None
+            
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('total') == total and state.get('segments'):
+                return [list(segment) for segment in state['segments']]
+        except Exception as e:
+            print(f"Yuklash holatini o'qishda xatolik: {str(e)}")
+            
+        return None
+        
+    def save_download_state(self, state_path: str, total: int, segments: List[List[int]]):
+        """Segmentlar holatini yozish"""
+        try:
+            atomic_write_json(state_path, {'total': total, 'segments': segments})
+        except Exception as e:
+            print(f"Yuklash holatini saqlashda xatolik: {str(e)}")
             
     def get_iso_info(self, iso_path: str) -> Dict:
         """ISO fayl haqida ma'lumot olish"""
@@ -112,33 +504,55 @@ class ISOManager:
         }
         
     def scan_local_isos(self, directory: str) -> List[Dict]:
-        """Papkadan ISO fayllarni topish"""
+        """Papkadan ISO fayllarni topish
+        
+        Skan indeksidan foydalaniladi - oldingi skandan beri o'zgarmagan
+        papkalar qayta o'qilmaydi.
+        """
         iso_files = []
         
         if not os.path.exists(directory):
             return iso_files
             
         try:
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    if file.lower().endswith('.iso'):
-                        full_path = os.path.join(root, file)
-                        iso_info = self.get_iso_info(full_path)
-                        iso_files.append(iso_info)
+            for path, size, mtime in self.scan_index.scan(directory):
+                iso_files.append({
+                    "path": path,
+                    "name": os.path.basename(path),
+                    "size": f"{size / (1024 * 1024):.1f} MB",
+                    "modified": mtime
+                })
                         
         except Exception as e:
             print(f"ISO fayllarni skan qilishda xatolik: {str(e)}")
             
         return iso_files
         
-    def validate_iso(self, iso_path: str) -> bool:
-        """ISO fayl to'g'riligini tekshirish"""
+    def validate_iso(self, iso_path: str, expected_sha256: str = None) -> bool:
+        """ISO fayl to'g'riligini tekshirish
+        
+        expected_sha256 berilsa fayl xeshi ham solishtiriladi.
+        """
         if not os.path.exists(iso_path):
             return False
             
         # Asosiy tekshirish - fayl mavjudligi va hajmi
         try:
             stat = os.stat(iso_path)
-            return stat.st_size > 1024 * 1024  # Kamida 1MB bo'lishi kerak
+            if stat.st_size <= 1024 * 1024:  # Kamida 1MB bo'lishi kerak
+                return False
         except:
             return False
+
+        if expected_sha256:
+            return self.verify_iso(iso_path, expected_sha256)
+        return True
+        
+    def verify_iso(self, iso_path: str, expected_sha256: str) -> bool:
+        """Fayl SHA-256 xeshini kutilgan qiymat bilan solishtirish"""
+        try:
+            sha256 = self.get_cached_hash(iso_path) or hash_file(iso_path)
+        except OSError as e:
+            print(f"ISO xeshini hisoblashda xatolik: {str(e)}")
+            return False
+        return sha256 == expected_sha256.lower()
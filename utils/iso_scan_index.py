@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ISO Scan Index - Papkalarni qayta skan qilishni tezlashtiruvchi indeks
+
+Har bir papka uchun uning mtime qiymati, ichki papkalari va ISO fayllari
+(hajm, mtime) saqlanadi. Papka mtime o'zgarmagan bo'lsa (fayl qo'shilmagan,
+o'chirilmagan, nomi o'zgarmagan) uning ro'yxati o'qilmaydi - faqat ichki
+papkalar va ISO fayllar os.stat bilan tekshiriladi.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Tuple
+from utils.persistence import atomic_write_text
+
+ISO_EXTENSION = ".iso"
+
+class ISOScanIndex:
+    def __init__(self, index_file: str = "configs/iso_scan_index.json"):
+        self.index_file = index_file
+        self.lock = threading.Lock()
+        self.directories = self.load_index()
+        
+    def load_index(self) -> Dict[str, Dict]:
+        """Indeksni yuklash"""
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+            except Exception as e:
+                print(f"Skan indeksini yuklashda xatolik: {str(e)}")
+                
+        return {}
+        
+    def save_index(self) -> bool:
+        """Indeksni saqlash"""
+        try:
+            with self.lock:
+                data = json.dumps(self.directories, ensure_ascii=False)
+            return atomic_write_text(self.index_file, data)
+        except Exception as e:
+            print(f"Skan indeksini saqlashda xatolik: {str(e)}")
+            return False
+            
+    def scan(self, directory: str) -> List[Tuple[str, int, float]]:
+        """Papkadagi barcha ISO fayllar: (yo'l, hajm, mtime)
+        
+        O'zgargan papkalar os.scandir bilan qayta o'qiladi, qolganlari
+        indeksdan olinadi. Indeks skan oxirida bir marta saqlanadi.
+        """
+        results = []
+        visited = set()
+        changed = False
+        pending = [os.path.abspath(directory)]
+        
+        while pending:
+            path = pending.pop()
+            if path in visited:
+                continue
+            visited.add(path)
+            
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+                
+            with self.lock:
+                entry = self.directories.get(path)
+                
+            if entry is None or entry.get("mtime") != mtime:
+                entry = self.read_directory(path, mtime)
+                if entry is None:
+                    continue
+                with self.lock:
+                    self.directories[path] = entry
+                changed = True
+            else:
+                # Papka ro'yxati o'zgarmagan - faqat ISO fayllar tekshiriladi
+                for name, signature in list(entry["files"].items()):
+                    try:
+                        stat = os.stat(os.path.join(path, name))
+                    except OSError:
+                        continue
+                    current = [stat.st_size, stat.st_mtime]
+                    if current != signature:
+                        entry["files"][name] = current
+                        changed = True
+                        
+            for name, (size, file_mtime) in entry["files"].items():
+                results.append((os.path.join(path, name), size, file_mtime))
+            pending.extend(os.path.join(path, name) for name in entry["subdirs"])
+            
+        if self.forget_missing(directory, visited):
+            changed = True
+        if changed:
+            self.save_index()
+        return results
+        
+    def read_directory(self, path: str, mtime: float):
+        """Papka ro'yxatini os.scandir bilan o'qish (xatolikda None)"""
+        files = {}
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for item in entries:
+                    try:
+                        if item.is_dir(follow_symlinks=False):
+                            subdirs.append(item.name)
+                        elif item.name.lower().endswith(ISO_EXTENSION) and item.is_file():
+                            stat = item.stat()
+                            files[item.name] = [stat.st_size, stat.st_mtime]
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"Papkani o'qishda xatolik ({path}): {str(e)}")
+            return None
+            
+        return {"mtime": mtime, "files": files, "subdirs": subdirs}
+        
+    def forget_missing(self, directory: str, visited: set) -> bool:
+        """Skan qilingan daraxtdan yo'qolgan papkalarni indeksdan o'chirish"""
+        root = os.path.abspath(directory)
+        prefix = os.path.join(root, "")
+        with self.lock:
+            missing = [path for path in self.directories
+                       if (path == root or path.startswith(prefix)) and path not in visited]
+            for path in missing:
+                del self.directories[path]
+        return bool(missing)
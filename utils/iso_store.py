@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ISO Store - ISO fayllarini SHA-256 bo'yicha aniqlash va dublikatlarni birlashtirish
+
+Fayllar katta bufer (readinto) bilan oqimli xeshlanadi, bir nechta fayl
+jarayonlar pulida parallel xeshlanadi. Bir xil xeshli fayllar bitta yozuvga
+birlashtiriladi va xohlansa hard link bilan almashtiriladi.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+# Xeshlashda bir marta o'qiladigan blok hajmi
+HASH_BUFFER_SIZE = 8 * 1024 * 1024
+
+
+def hash_file(path: str, buffer_size: int = HASH_BUFFER_SIZE) -> str:
+    """Faylning SHA-256 xeshi (bitta bufer qayta ishlatiladi)"""
+    digest = hashlib.sha256()
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            digest.update(view[:size])
+            
+    return digest.hexdigest()
+
+
+def _hash_or_none(path: str) -> Optional[str]:
+    """Xatolikda None qaytaradigan hash_file (jarayonlar puli uchun)"""
+    try:
+        return hash_file(path)
+    except OSError as e:
+        print(f"Faylni xeshlashda xatolik ({path}): {str(e)}")
+        return None
+
+
+def hash_files(paths: Iterable[str], max_workers: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """Bir nechta faylni parallel xeshlash: yo'l -> SHA-256 (xatolikda None)"""
+    paths = list(dict.fromkeys(paths))
+    if len(paths) <= 1:
+        return {path: _hash_or_none(path) for path in paths}
+        
+    workers = max_workers or min(len(paths), os.cpu_count() or 1)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(paths, executor.map(_hash_or_none, paths)))
+    except Exception as e:
+        # Jarayon ochib bo'lmasa (masalan, muzlatilgan dastur) - threadlar.
+        # hashlib katta buferlarda GIL ni bo'shatadi
+        print(f"Jarayonlar pulini ochishda xatolik, threadlar ishlatiladi: {str(e)}")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(paths, executor.map(_hash_or_none, paths)))
+
+
+def file_signature(path: str):
+    """(hajm, mtime) - fayl o'zgarganini xeshlamasdan aniqlash uchun"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime
+
+
+def is_same_file(first: str, second: str) -> bool:
+    """Ikkala yo'l bitta faylga (inode) ishora qiladimi"""
+    try:
+        return os.path.samefile(first, second)
+    except OSError:
+        return False
+
+
+def link_duplicate(source: str, duplicate: str) -> bool:
+    """Dublikat faylni manba faylga hard link bilan almashtirish
+    
+    Fayllar bitta diskda bo'lishi kerak. Avval vaqtinchalik link
+    yaratiladi, keyin atomar ravishda dublikat o'rniga qo'yiladi.
+    """
+    if is_same_file(source, duplicate):
+        return False
+    if os.stat(source).st_dev != os.stat(duplicate).st_dev:
+        return False
+        
+    temp_path = duplicate + ".link-tmp"
+    try:
+        os.link(source, temp_path)
+        os.replace(temp_path, duplicate)
+        return True
+    except OSError as e:
+        print(f"Hard link yaratishda xatolik ({duplicate}): {str(e)}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Job Manager - Uzoq davom etadigan amallar navbati
+
+VM ishga tushirish, konteyner yaratish, image yuklab olish kabi amallar
+cheklangan sondagi fon threadlarida bajariladi. Har bir vazifaning holati
+(queued/running/done/failed/cancelled), jarayoni va xabari kuzatiladi.
+Callbacklar dispatch funksiyasi orqali UI threadiga uzatiladi.
+"""
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+# Vazifa holatlari
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINISHED_STATES = {JOB_DONE, JOB_FAILED, JOB_CANCELLED}
+
+# Holatlarning foydalanuvchiga ko'rsatiladigan nomlari
+JOB_STATE_LABELS = {
+    JOB_QUEUED: "Navbatda",
+    JOB_RUNNING: "Bajarilmoqda",
+    JOB_DONE: "Tugadi",
+    JOB_FAILED: "Xatolik",
+    JOB_CANCELLED: "Bekor qilindi",
+}
+
+# Jarayon xabarlari UI ga shundan tez-tez yuborilmaydi (soniya)
+PROGRESS_NOTIFY_INTERVAL = 0.2
+
+_job_ids = itertools.count(1)
+
+
+class JobCancelled(Exception):
+    """Vazifa bekor qilinganda funksiya ichidan ko'tariladi"""
+
+
+class Job:
+    def __init__(self, title: str, func: Callable, on_done: Optional[Callable] = None):
+        self.id = next(_job_ids)
+        self.title = title
+        self.func = func
+        self.on_done = on_done
+        self.state = JOB_QUEUED
+        self.result = None
+        self.error: Optional[str] = None
+        # 0..1 oralig'ida, noma'lum bo'lsa None
+        self.progress: Optional[float] = None
+        self.message = ""
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.cancel_event = threading.Event()
+        self.future = None
+        self.manager = None
+        self.last_notify = 0.0
+        
+    @property
+    def cancelled(self) -> bool:
+        """Bekor qilish so'ralganmi"""
+        return self.cancel_event.is_set()
+        
+    @property
+    def is_finished(self) -> bool:
+        return self.state in FINISHED_STATES
+        
+    def check_cancelled(self):
+        """Bekor qilingan bo'lsa JobCancelled ko'tarish"""
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+            
+    def set_progress(self, progress: Optional[float] = None, message: str = None):
+        """Jarayonni yangilash (fon threadidan chaqiriladi)"""
+        if progress is not None:
+            progress = max(0.0, min(1.0, progress))
+        self.progress = progress
+        if message is not None:
+            self.message = message
+            
+        now = time.time()
+        if self.manager is not None and now - self.last_notify >= PROGRESS_NOTIFY_INTERVAL:
+            self.last_notify = now
+            self.manager.notify(self)
+
+
+class JobManager:
+    def __init__(self, max_workers: int = 3, dispatch: Optional[Callable[[Callable], None]] = None):
+        """dispatch(callable) - callbackni UI threadida bajarishga topshiradi"""
+        self.executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="job")
+        self.dispatch = dispatch
+        self.lock = threading.Lock()
+        self.jobs: Dict[int, Job] = {}
+        self.listeners: List[Callable[[Job], None]] = []
+        
+    def submit(self, title: str, func: Callable[[Job], object],
+               on_done: Optional[Callable[[Job], None]] = None) -> Job:
+        """Vazifani navbatga qo'shish
+        
+        func(job) fon threadida chaqiriladi. False qaytarsa yoki xatolik
+        ko'tarsa vazifa "failed" holatiga o'tadi. on_done(job) vazifa
+        tugaganda dispatch orqali chaqiriladi.
+        """
+        job = Job(title, func, on_done)
+        job.manager = self
+        with self.lock:
+            self.jobs[job.id] = job
+        job.future = self.executor.submit(self._run, job)
+        self.notify(job)
+        return job
+        
+    def _run(self, job: Job):
+        """Vazifani bajarish"""
+        if job.cancelled:
+            job.state = JOB_CANCELLED
+            self._finish(job)
+            return
+            
+        job.state = JOB_RUNNING
+        job.started = time.time()
+        self.notify(job)
+        
+        try:
+            job.result = job.func(job)
+            if job.cancelled:
+                job.state = JOB_CANCELLED
+            elif job.result is False:
+                job.state = JOB_FAILED
+                job.error = job.error or "Amal bajarilmadi"
+            else:
+                job.state = JOB_DONE
+                job.progress = 1.0
+        except JobCancelled:
+            job.state = JOB_CANCELLED
+        except Exception as e:
+            job.state = JOB_FAILED
+            job.error = str(e)
+            
+        self._finish(job)
+        
+    def _finish(self, job: Job):
+        """Vazifa tugadi - kuzatuvchilar va on_done ga xabar berish"""
+        job.finished = time.time()
+        self.notify(job)
+        if job.on_done is not None:
+            self._call(job.on_done, job)
+            
+    def cancel(self, job_id: int) -> bool:
+        """Vazifani bekor qilish
+        
+        Navbatdagi vazifa darhol bekor qilinadi. Bajarilayotgan vazifaga
+        bekor qilish signali beriladi - funksiya job.cancelled ni tekshirib
+        to'xtaydi.
+        """
+        job = self.get_job(job_id)
+        if job is None or job.is_finished:
+            return False
+            
+        job.cancel_event.set()
+        if job.state == JOB_QUEUED and job.future is not None and job.future.cancel():
+            job.state = JOB_CANCELLED
+            self._finish(job)
+        else:
+            job.message = "Bekor qilinmoqda..."
+            self.notify(job)
+        return True
+        
+    def get_job(self, job_id: int) -> Optional[Job]:
+        with self.lock:
+            return self.jobs.get(job_id)
+            
+    def get_jobs(self) -> List[Job]:
+        """Barcha vazifalar (yaratilish tartibida)"""
+        with self.lock:
+            return list(self.jobs.values())
+            
+    def active_count(self) -> int:
+        """Navbatdagi va bajarilayotgan vazifalar soni"""
+        return sum(1 for job in self.get_jobs() if not job.is_finished)
+        
+    def clear_finished(self):
+        """Tugagan vazifalarni ro'yxatdan o'chirish"""
+        with self.lock:
+            self.jobs = {job_id: job for job_id, job in self.jobs.items() if not job.is_finished}
+            
+    def add_listener(self, listener: Callable[[Job], None]):
+        """Vazifa holati o'zgarishini kuzatish (dispatch orqali chaqiriladi)"""
+        self.listeners.append(listener)
+        
+    def notify(self, job: Job):
+        """Kuzatuvchilarga xabar berish"""
+        for listener in list(self.listeners):
+            self._call(listener, job)
+            
+    def _call(self, callback: Callable, job: Job):
+        """Callbackni dispatch orqali (bo'lmasa shu threadda) chaqirish"""
+        def run():
+            try:
+                callback(job)
+            except Exception as e:
+                print(f"Vazifa callback xatoligi: {str(e)}")
+                
+        if self.dispatch is not None:
+            self.dispatch(run)
+        else:
+            run()
+            
+    def shutdown(self):
+        """Navbatdagi vazifalarni bekor qilish va threadlarni to'xtatish"""
+        for job in self.get_jobs():
+            if not job.is_finished:
+                job.cancel_event.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_bulk(job: Job, items: Dict[str, str], func: Callable[[str], bool],
+             max_workers: int = 4) -> Dict[str, bool]:
+    """Bir nechta element ustida amalni parallel bajarish
+    
+    items - element ID -> ko'rsatiladigan nom. func(item_id) ko'pi bilan
+    max_workers ta threadda chaqiriladi. Natija: nom -> muvaffaqiyat.
+    Vazifa bekor qilinsa hali boshlanmagan elementlar bajarilmaydi.
+    """
+    results: Dict[str, bool] = {}
+    total = len(items)
+    
+    def run(item_id):
+        if job.cancelled:
+            return None
+        try:
+            return bool(func(item_id))
+        except Exception as e:
+            print(f"Ommaviy amalda xatolik ({item_id}): {str(e)}")
+            return False
+            
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total or 1))) as executor:
+        futures = {executor.submit(run, item_id): name for item_id, name in items.items()}
+        for future in as_completed(futures):
+            success = future.result()
+            if success is None:
+                continue
+            results[futures[future]] = success
+            job.set_progress(len(results) / total, f"{len(results)}/{total}")
+            
+    job.message = f"{sum(results.values())}/{total} muvaffaqiyatli"
+    return results
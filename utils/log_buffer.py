@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Log Buffer - Konteyner loglari uchun o'lchami cheklangan halqa bufer
+
+Oqimdan kelgan baytlar qatorlarga bo'linib oxirgi max_lines ta qator
+saqlanadi, eskilari tashlab yuboriladi. Har bir qatorga tartib raqami
+beriladi - ko'rinish qaysi qatorlar yangi ekanini va qaysilari buferdan
+chiqib ketganini shu raqamlar orqali biladi. clear() dan keyin tozalangan
+qatorlar "tashlab yuborilgan" hisoblanmaydi.
+"""
+
+import codecs
+import re
+import threading
+from collections import deque
+from typing import List, Tuple
+
+# Buferda saqlanadigan qatorlar soni
+MAX_LOG_LINES = 10000
+# Juda uzun qator shu uzunlikda qirqiladi (Tk uzun qatorlarda sekinlashadi)
+MAX_LINE_LENGTH = 4096
+# Qidiruv natijalari soni chegarasi
+MAX_SEARCH_RESULTS = 1000
+
+
+class LogBuffer:
+    def __init__(self, max_lines: int = MAX_LOG_LINES):
+        self.lock = threading.Lock()
+        self.lines: deque = deque(maxlen=max(1, max_lines))
+        # Shu paytgacha qo'shilgan jami qatorlar (oxirgi qator raqami + 1)
+        self.total = 0
+        # Qator oxiri hali kelmagan qism
+        self.partial = ""
+        # clear() paytidagi total - undan oldingi qatorlar foydalanuvchi tozalagani
+        self.cleared = 0
+        # clear() yarim qatorda bo'lgan - qatorning qolgan qismi ham tashlanadi
+        self.skip_rest = False
+        # Bo'laklar chegarasida bo'lingan UTF-8 belgilar to'g'ri yig'iladi
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        
+    @property
+    def first(self) -> int:
+        """Buferdagi eng eski qator raqami (undan oldingilari tashlab yuborilgan)"""
+        return self.total - len(self.lines)
+        
+    @property
+    def dropped(self) -> int:
+        """Bufer to'lgani uchun tashlab yuborilgan qatorlar (tozalanganlar hisobga kirmaydi)"""
+        return self.first - self.cleared
+        
+    def append(self, data) -> int:
+        """Oqim bo'lagini qo'shish (bayt yoki matn), qo'shilgan to'liq qatorlar soni"""
+        text = self.decoder.decode(data) if isinstance(data, bytes) else data
+        with self.lock:
+            if self.skip_rest:
+                if '\n' not in text:
+                    return 0
+                text = text.split('\n', 1)[1]
+                self.skip_rest = False
+            parts = (self.partial + text).split('\n')
+            self.partial = parts.pop()
+            for line in parts:
+                self.lines.append(line.rstrip('\r')[:MAX_LINE_LENGTH])
+            self.total += len(parts)
+            return len(parts)
+            
+    def flush(self):
+        """Oqim tugadi - oxirgi to'liq bo'lmagan qatorni ham qo'shish"""
+        with self.lock:
+            if self.partial:
+                self.lines.append(self.partial[:MAX_LINE_LENGTH])
+                self.total += 1
+                self.partial = ""
+            self.skip_rest = False
+                
+    def clear(self):
+        """Buferni tozalash (qator raqamlari davom etadi)
+        
+        Yarim kelgan qator ham tozalanadi - uning davomi keyingi bo'lakdagi
+        qatorga qo'shilib ketmaydi.
+        """
+        with self.lock:
+            self.lines.clear()
+            self.skip_rest = bool(self.partial) or self.skip_rest
+            self.partial = ""
+            self.decoder.reset()
+            self.cleared = self.total
+            
+    def window(self, start: int, count: int) -> Tuple[int, List[str]]:
+        """start raqamli qatordan count ta qator - (haqiqiy boshlanish, qatorlar)
+        
+        start buferdan chiqib ketgan bo'lsa eng eski qatordan boshlanadi.
+        """
+        with self.lock:
+            first = self.total - len(self.lines)
+            start = min(max(start, first), max(self.total - count, first))
+            offset = start - first
+            return start, [self.lines[index] for index in range(offset, min(offset + count, len(self.lines)))]
+            
+    def search(self, pattern: str, regex: bool = False, ignore_case: bool = True,
+               limit: int = MAX_SEARCH_RESULTS) -> List[int]:
+        """Buferdagi qatorlardan qidirish - mos qatorlar raqamlari (eskidan yangiga)
+        
+        Noto'g'ri regex re.error chiqaradi.
+        """
+        if not pattern:
+            return []
+        flags = re.IGNORECASE if ignore_case else 0
+        matcher = re.compile(pattern if regex else re.escape(pattern), flags)
+        
+        with self.lock:
+            first = self.total - len(self.lines)
+            lines = list(self.lines)
+            
+        matches = []
+        for index, line in enumerate(lines):
+            if matcher.search(line):
+                matches.append(first + index)
+                if len(matches) >= limit:
+                    break
+        return matches
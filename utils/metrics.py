@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Metrics - Konteyner va VMlarning jonli resurs metrikalari
+
+Docker uchun har bir ishlayotgan konteynerga bitta oqimli stats ulanishi
+ochiladi (ko'pi bilan max_streams ta). VirtualBox uchun barcha VMlar bitta
+"metrics query", Hyper-V uchun bitta Get-VM/Measure-VM chaqiruvida
+o'qiladi. Namunalar har bir obyekt uchun o'lchami cheklangan halqa
+buferda saqlanadi, shuning uchun xotira obyektlar soniga chiziqli bog'liq.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Har bir obyekt uchun saqlanadigan namunalar soni
+METRIC_HISTORY = 60
+# Namuna olish oralig'i (soniya)
+SAMPLE_INTERVAL = 2
+# Bir vaqtda ochiq turadigan Docker stats oqimlari soni
+MAX_STATS_STREAMS = 8
+# So'rov vaqti oraliqning shu ulushidan oshsa oraliq kattalashtiriladi
+MAX_SAMPLING_LOAD = 0.2
+
+SPARKLINE_CHARS = "▁▂▃▄▅▆▇█"
+
+# Jami hisoblagich -> tezlik (bayt/s) maydoni
+COUNTER_FIELDS = (
+    ("net_rx_total", "net_rx"),
+    ("net_tx_total", "net_tx"),
+    ("block_read_total", "block_read"),
+    ("block_write_total", "block_write"),
+)
+
+
+class MetricsStore:
+    def __init__(self, capacity: int = METRIC_HISTORY):
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        # kalit -> namunalar halqa buferi
+        self.history: Dict[str, deque] = {}
+        # kalit -> (turi, nomi)
+        self.names: Dict[str, Tuple[str, str]] = {}
+        
+    def record(self, key: str, kind: str, name: str, sample: Dict):
+        """Namunani qo'shish - jami hisoblagichlardan tezlik hisoblanadi"""
+        sample = dict(sample, time=time.time())
+        with self.lock:
+            buffer = self.history.get(key)
+            if buffer is None:
+                buffer = self.history[key] = deque(maxlen=self.capacity)
+            self.names[key] = (kind, name)
+            
+            previous = buffer[-1] if buffer else None
+            if previous is not None:
+                elapsed = sample["time"] - previous["time"]
+                for total_field, rate_field in COUNTER_FIELDS:
+                    if total_field in sample and total_field in previous and elapsed > 0:
+                        # Hisoblagich nolga qaytsa (qayta ishga tushirish) tezlik 0
+                        delta = max(sample[total_field] - previous[total_field], 0)
+                        sample.setdefault(rate_field, delta / elapsed)
+            buffer.append(sample)
+            
+    def latest(self, key: str) -> Optional[Dict]:
+        """Oxirgi namuna"""
+        with self.lock:
+            buffer = self.history.get(key)
+            return buffer[-1] if buffer else None
+            
+    def series(self, key: str, field: str) -> List[float]:
+        """Maydon qiymatlari tarixi (eskidan yangiga)"""
+        with self.lock:
+            buffer = self.history.get(key) or ()
+            return [sample[field] for sample in buffer if sample.get(field) is not None]
+            
+    def entities(self) -> List[Tuple[str, str, str]]:
+        """(kalit, turi, nomi) ro'yxati"""
+        with self.lock:
+            return [(key, kind, name) for key, (kind, name) in self.names.items()]
+            
+    def retain(self, prefix: str, keys: Iterable[str]):
+        """prefix bilan boshlanuvchi, lekin keys da bo'lmagan obyektlarni o'chirish"""
+        keys = set(keys)
+        with self.lock:
+            for key in [key for key in self.history if key.startswith(prefix) and key not in keys]:
+                del self.history[key]
+                self.names.pop(key, None)
+
+
+class MetricsCollector:
+    def __init__(self, docker_manager, vbox_manager, hyperv_manager, inventory,
+                 store: Optional[MetricsStore] = None, interval: float = SAMPLE_INTERVAL,
+                 max_streams: int = MAX_STATS_STREAMS):
+        """Ishlayotgan obyektlar ro'yxati inventory snapshotlaridan olinadi"""
+        self.docker_manager = docker_manager
+        self.vbox_manager = vbox_manager
+        self.hyperv_manager = hyperv_manager
+        self.inventory = inventory
+        self.store = store or MetricsStore()
+        self.interval = interval
+        self.max_streams = max_streams
+        
+        # Har bir start() uchun yangi hodisa - eski threadlar qayta ishlamaydi
+        self.stop_event: Optional[threading.Event] = None
+        # konteyner ID -> oqimni to'xtatish hodisasi
+        self.streams: Dict[str, threading.Event] = {}
+        self.streams_lock = threading.Lock()
+        # metrics setup qaysi VMlar to'plami uchun bajarilgan
+        self.vbox_setup_for = None
+        
+    def is_running(self) -> bool:
+        return self.stop_event is not None and not self.stop_event.is_set()
+        
+    def start(self):
+        """Namuna olishni boshlash"""
+        if self.is_running():
+            return
+        self.stop_event = stop_event = threading.Event()
+        self.vbox_setup_for = None
+        threads = [
+            threading.Thread(target=self._docker_loop, args=(stop_event,), daemon=True),
+            threading.Thread(target=self._poll_loop, args=(
+                stop_event, "vbox:", "VirtualBox", self.vbox_manager, self.sample_vbox,
+                self.running_vbox_vms
+            ), daemon=True),
+            threading.Thread(target=self._poll_loop, args=(
+                stop_event, "hyperv:", "Hyper-V", self.hyperv_manager, self.hyperv_manager.measure_vms,
+                self.running_hyperv_vms
+            ), daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+            
+    def stop(self):
+        """Namuna olishni to'xtatish va barcha stats oqimlarini yopish"""
+        if self.stop_event is not None:
+            self.stop_event.set()
+        with self.streams_lock:
+            for stream_stop in self.streams.values():
+                stream_stop.set()
+            self.streams.clear()
+            
+    def running_containers(self) -> Dict[str, str]:
+        """Ishlayotgan konteynerlar: ID -> nom (boshqa hostdagilar "nom@host")"""
+        local_name = getattr(self.docker_manager, 'local_name', None)
+        return {
+            container['id']: (container.get('name', container['id'])
+                              if container.get('host', local_name) == local_name
+                              else f"{container.get('name', container['id'])}@{container['host']}")
+            for container in self.inventory.get_list("docker_containers")
+            if container.get('status') == 'running' and container.get('id')
+        }
+        
+    def running_vbox_vms(self) -> List[str]:
+        return [vm.get('name', '') for vm in self.inventory.get_list("vbox_vms")
+                if vm.get('state') == 'running']
+                
+    def running_hyperv_vms(self) -> List[str]:
+        # ConvertTo-Json enumni son (2) ko'rinishida beradi
+        return [vm.get('name', '') for vm in self.inventory.get_list("hyperv_vms")
+                if str(vm.get('state')) in ("Running", "2")]
+                
+    def _docker_loop(self, stop_event: threading.Event):
+        """Ishlayotgan konteynerlar uchun stats oqimlarini ochish/yopish"""
+        while not stop_event.is_set():
+            if self.docker_manager.is_available():
+                running = self.running_containers()
+                # Oqimlar soni cheklangan - sarf konteynerlar soniga qarab o'smaydi
+                wanted = dict(list(running.items())[:self.max_streams])
+                
+                with self.streams_lock:
+                    if stop_event.is_set():
+                        break
+                    for container_id, stream_stop in list(self.streams.items()):
+                        if container_id not in wanted:
+                            stream_stop.set()
+                            del self.streams[container_id]
+                    for container_id, name in wanted.items():
+                        if container_id not in self.streams:
+                            self.streams[container_id] = self._start_stream(container_id, name)
+                            
+                self.store.retain("docker:", (f"docker:{container_id}" for container_id in wanted))
+            stop_event.wait(self.interval)
+            
+    def _start_stream(self, container_id: str, name: str) -> threading.Event:
+        """Bitta konteyner uchun stats oqimi threadi"""
+        stream_stop = threading.Event()
+        key = f"docker:{container_id}"
+        last_record = [0.0]
+        
+        def on_sample(sample):
+            # Daemon har soniyada yuboradi - tarix oralig'i boshqa backendlar bilan bir xil
+            now = time.time()
+            if now - last_record[0] >= self.interval:
+                last_record[0] = now
+                self.store.record(key, "Docker", name, sample)
+                
+        def run():
+            self.docker_manager.stream_container_stats(container_id, on_sample, stream_stop)
+            with self.streams_lock:
+                # Oqim tugadi (konteyner to'xtadi) - keyingi tekshiruvda qayta ochiladi
+                if self.streams.get(container_id) is stream_stop:
+                    del self.streams[container_id]
+                    
+        threading.Thread(target=run, daemon=True).start()
+        return stream_stop
+        
+    def sample_vbox(self) -> Dict[str, Dict]:
+        """VirtualBox metrikalari - ishlayotgan VMlar o'zgarsa setup qayta bajariladi"""
+        running = frozenset(self.running_vbox_vms())
+        if running != self.vbox_setup_for:
+            self.vbox_manager.setup_metrics(period=max(1, int(self.interval)))
+            self.vbox_setup_for = running
+        return self.vbox_manager.query_metrics()
+        
+    def _poll_loop(self, stop_event: threading.Event, prefix: str, kind: str, manager,
+                   sample: Callable[[], Dict[str, Dict]], running: Callable[[], List[str]]):
+        """Barcha VMlar bitta chaqiruvda so'raladigan backend uchun sikl"""
+        while not stop_event.is_set():
+            delay = self.interval
+            names = running() if manager.is_available() else []
+            
+            if names:
+                started = time.time()
+                metrics = sample()
+                for name in names:
+                    if name in metrics:
+                        self.store.record(f"{prefix}{name}", kind, name, metrics[name])
+                # Sekin backend so'rovlari vaqtning kichik ulushini egallaydi
+                delay = max(self.interval, (time.time() - started) / MAX_SAMPLING_LOAD)
+                
+            self.store.retain(prefix, (f"{prefix}{name}" for name in names))
+            stop_event.wait(delay)
+
+
+def sparkline(values: List[float], maximum: float = None) -> str:
+    """Qiymatlarni "▁▂▃▅▇" ko'rinishidagi qatorga aylantirish"""
+    if not values:
+        return ""
+    top = maximum if maximum else max(values)
+    if top <= 0:
+        return SPARKLINE_CHARS[0] * len(values)
+    last = len(SPARKLINE_CHARS) - 1
+    return "".join(SPARKLINE_CHARS[min(last, max(0, int(value / top * last + 0.5)))] for value in values)
+
+
+def format_bytes(value: float) -> str:
+    """Baytlarni o'qiladigan ko'rinishga keltirish"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
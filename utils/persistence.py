@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistence - JSON fayllarni atomar va kechiktirilgan (write-behind) saqlash
+
+Fayl avval shu papkadagi vaqtinchalik faylga yoziladi, fsync qilinadi va
+os.replace bilan asl fayl o'rniga qo'yiladi - yozish o'rtasida dastur
+to'xtasa ham eski fayl butun qoladi. JsonWriteBehind o'zgarishlarni
+to'playdi va bir necha o'zgarishni bitta yozishga birlashtiradi. Bitta
+faylni bir nechta obyekt ishlatsa shared_store orqali ma'lumot va store
+umumiy bo'ladi.
+"""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Tuple
+
+# O'zgarishdan keyin fayl shuncha vaqt ichida yoziladi (soniya)
+FLUSH_DELAY = 1.0
+
+# Fayl yo'li (absolyut) -> (ma'lumot, JsonWriteBehind) - bitta faylga bitta yozuvchi
+_shared_stores: Dict[str, Tuple[Any, "JsonWriteBehind"]] = {}
+_shared_stores_lock = threading.Lock()
+
+
+def atomic_write_json(path: str, data: Any, indent: int = None) -> bool:
+    """JSON ni atomar yozish (vaqtinchalik fayl + fsync + os.replace)"""
+    return atomic_write_text(path, json.dumps(data, indent=indent, ensure_ascii=False))
+
+
+def atomic_write_text(path: str, text: str) -> bool:
+    """Matnni atomar yozish"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+        
+    fsync_directory(directory)
+    return True
+
+
+def fsync_directory(directory: str):
+    """Papka yozuvini (rename) diskka yozish - faqat POSIX tizimlarda"""
+    if os.name != 'posix':
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class JsonWriteBehind:
+    def __init__(self, path: str, snapshot: Callable[[], Any], indent: int = None,
+                 delay: float = FLUSH_DELAY):
+        """snapshot() - yoziladigan ma'lumot (lock ostida chaqiriladi)
+        
+        Ma'lumotni o'zgartiruvchi kod ham self.lock ni olishi kerak.
+        """
+        self.path = path
+        self.snapshot = snapshot
+        self.indent = indent
+        self.delay = delay
+        self.lock = threading.RLock()
+        self.dirty = False
+        self.batch_depth = 0
+        self.timer = None
+        atexit.register(self.flush)
+        
+    def mark_dirty(self):
+        """O'zgarish bo'ldi - fayl delay soniyadan keyin yoziladi
+        
+        Birinchi o'zgarish taymerni ishga tushiradi, keyingilari shu
+        yozishga qo'shiladi. batch() ichida taymer ishga tushmaydi.
+        """
+        with self.lock:
+            self.dirty = True
+            if self.batch_depth or self.timer is not None:
+                return
+            self.timer = threading.Timer(self.delay, self.flush_pending)
+            self.timer.daemon = True
+            self.timer.start()
+            
+    @contextmanager
+    def batch(self):
+        """Blok ichidagi barcha o'zgarishlar blok oxirida bitta yozishda saqlanadi"""
+        with self.lock:
+            self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.batch_depth -= 1
+                outermost = self.batch_depth == 0
+            if outermost:
+                self.flush()
+                
+    def flush_pending(self):
+        """Taymer chaqiradi - batch() davom etayotgan bo'lsa uning oxirida yoziladi"""
+        with self.lock:
+            if self.batch_depth:
+                self.timer = None
+                return
+            self.flush()
+            
+    def flush(self) -> bool:
+        """Yozilmagan o'zgarishlarni darhol saqlash"""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if not self.dirty:
+                return True
+            try:
+                atomic_write_json(self.path, self.snapshot(), self.indent)
+                self.dirty = False
+                return True
+            except Exception as e:
+                print(f"Faylni saqlashda xatolik ({self.path}): {str(e)}")
+                return False
+                
+    def save(self) -> bool:
+        """Darhol saqlash (o'zgarish bo'lmasa ham)"""
+        with self.lock:
+            self.dirty = True
+        return self.flush()
+
+
+def shared_store(path: str, load: Callable[[], Any], indent: int = None) -> Tuple[Any, JsonWriteBehind]:
+    """Fayl uchun umumiy (ma'lumot, store) juftligi
+    
+    Birinchi chaqiruv load() bilan ma'lumotni yuklaydi, keyingilari xuddi
+    shu obyektlarni qaytaradi. Shunday qilib bir faylni ishlatuvchi bir
+    nechta oyna bir-birining o'zgarishlari ustidan yozmaydi va atexit
+    har bir fayl uchun bir marta ro'yxatdan o'tadi. Ma'lumot joyida
+    o'zgartirilishi kerak (qayta tayinlanmaydi).
+    """
+    key = os.path.abspath(path)
+    with _shared_stores_lock:
+        if key not in _shared_stores:
+            data = load()
+            _shared_stores[key] = (data, JsonWriteBehind(path, lambda: data, indent=indent))
+        return _shared_stores[key]
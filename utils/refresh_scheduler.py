@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Refresh Scheduler - Avtomatik yangilash rejalashtiruvchisi
+
+"auto_refresh" va "refresh_interval" sozlamalari asosida har bir backend
+uchun keyingi yangilash vaqtini hisoblaydi:
+- backend sekin yoki mavjud bo'lmasa interval oshiriladi (backoff);
+- VM/konteyner holati o'zgarayotgan bo'lsa (starting, stopping, ...) tezroq
+  so'raladi;
+- oldingi so'rov tugamagan backend uchun navbatdagi tick o'tkazib yuboriladi.
+"""
+
+import time
+from typing import Dict, Iterable, List
+
+# Holat o'zgarayotganda ishlatiladigan interval (soniya)
+FAST_INTERVAL = 2
+# Backoff yuqori chegarasi (soniya)
+MAX_BACKOFF = 600
+# So'rov intervalning shuncha qismidan uzoq davom etsa backend sekin hisoblanadi
+SLOW_RATIO = 0.5
+MIN_INTERVAL = 5
+
+TRANSITIONAL_STATES = {
+    # Docker
+    "restarting", "removing",
+    # VirtualBox
+    "starting", "stopping", "saving", "restoring", "teleporting", "teleportingin",
+    "teleportingpausedvm", "livesnapshotting", "onlinesnapshotting", "offlinesnapshotting",
+    "restoringsnapshot", "deletingsnapshot", "deletingsnapshotlive",
+    "deletingsnapshotlivepaused", "settingup",
+    # Hyper-V
+    "pausing", "resuming", "reset", "merging", "fastsaving",
+}
+
+# Hyper-V VMState enum qiymatlari (ConvertTo-Json enumni son ko'rinishida beradi)
+HYPERV_STATE_NAMES = {
+    4: "stopping", 10: "starting", 11: "reset", 32773: "saving",
+    32776: "pausing", 32777: "resuming", 32780: "fastsaving",
+}
+
+
+def has_transitional_items(items) -> bool:
+    """Ro'yxatda holati o'zgarayotgan element borligini tekshirish"""
+    for item in items or []:
+        state = item.get('state') or item.get('status')
+        if isinstance(state, int):
+            state = HYPERV_STATE_NAMES.get(state)
+        elif isinstance(state, str) and state.isdigit():
+            state = HYPERV_STATE_NAMES.get(int(state))
+        if isinstance(state, str) and state.lower().replace(' ', '') in TRANSITIONAL_STATES:
+            return True
+    return False
+
+
+class BackendSchedule:
+    def __init__(self):
+        self.next_due = 0.0
+        self.in_flight = False
+        self.failures = 0
+        self.last_duration = 0.0
+
+
+class RefreshScheduler:
+    def __init__(self, config_manager, backends: Iterable[str]):
+        self.config_manager = config_manager
+        self.backends: Dict[str, BackendSchedule] = {key: BackendSchedule() for key in backends}
+        
+    def is_enabled(self) -> bool:
+        """Avtomatik yangilash yoqilganmi"""
+        return bool(self.config_manager.get("auto_refresh", True))
+        
+    def get_interval(self) -> float:
+        """Asosiy yangilash intervali (sozlamalardan har safar o'qiladi)"""
+        try:
+            interval = float(self.config_manager.get("refresh_interval", 30))
+        except (TypeError, ValueError):
+            interval = 30
+        return max(MIN_INTERVAL, interval)
+        
+    def due_backends(self, now: float = None) -> List[str]:
+        """Yangilash vaqti kelgan va hozir so'ralmayotgan backendlar"""
+        now = time.time() if now is None else now
+        return [key for key, schedule in self.backends.items()
+                if not schedule.in_flight and now >= schedule.next_due]
+                
+    def mark_started(self, key: str):
+        """Backend so'rovi boshlandi"""
+        if key in self.backends:
+            self.backends[key].in_flight = True
+            
+    def mark_finished(self, key: str, duration: float, ok: bool, data=None):
+        """Backend so'rovi tugadi - keyingi vaqtni hisoblash"""
+        schedule = self.backends.get(key)
+        if schedule is None:
+            return
+            
+        interval = self.get_interval()
+        schedule.in_flight = False
+        schedule.last_duration = duration
+        
+        if not ok:
+            # Mavjud emas yoki xatolik - eksponensial backoff
+            schedule.failures += 1
+            delay = min(interval * (2 ** schedule.failures), MAX_BACKOFF)
+        else:
+            schedule.failures = 0
+            delay = interval
+            if duration > interval * SLOW_RATIO:
+                # Sekin backendni so'rovning o'zi davom etganidan kamroq so'ramaymiz
+                delay = min(max(interval, duration / SLOW_RATIO), MAX_BACKOFF)
+            if has_transitional_items(data):
+                delay = FAST_INTERVAL
+                
+        schedule.next_due = time.time() + delay